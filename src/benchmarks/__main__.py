@@ -0,0 +1,68 @@
+"""
+Runs the benchmarks from the `src` directory:
+
+    python -m benchmarks [--output results.json] [--compare] [name ...]
+
+With `--compare`, exits with status 1 if any benchmark is slower than `benchmarks/baseline.json`
+by more than the threshold. Timings are absolute, so the committed baseline only applies to the machine that
+recorded it: regenerate it locally with `--output benchmarks/baseline.json` before changing the code,
+or compare with another file using `--baseline`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import sys
+
+from benchmarks import suite
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("names", nargs="*", metavar="name", help=f"one of {', '.join(suite.BENCHMARKS)}")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", action="store_true", help="compare with the stored baseline")
+    parser.add_argument("--baseline", help="compare with results written earlier with --output")
+    parser.add_argument("--threshold", type=float, default=suite.DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+    unknown = set(arguments.names) - suite.BENCHMARKS.keys()
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = suite.run(arguments.names or None, repeat=arguments.repeat)
+    for result in results:
+        print(f"{result.name:<20} {result.best * 1e3:12.4f} ms  (median {result.median * 1e3:.4f} ms)")
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(suite.dump(results), file, indent=2)
+            file.write("\n")
+
+    if arguments.baseline:
+        path = arguments.baseline
+    elif arguments.compare:
+        path = suite.BASELINE
+    else:
+        return 0
+    python, machine = suite.recorded_on(path)
+    if (python, machine) != (platform.python_version(), platform.machine()):
+        print(
+            f"WARNING {path} was recorded with Python {python} on {machine}, "
+            "regenerate it on this machine before comparing"
+        )
+    baseline = suite.load(path)
+    regressions = suite.compare(results, baseline, arguments.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression.name}: {regression.baseline * 1e3:.4f} ms -> {regression.current * 1e3:.4f} ms "
+            f"({regression.ratio:.2f}x)"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import math
+import pathlib
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import typing
+
+from simrail_sdk import contraction, export, geo, loaders, routing, sections, stations, synthetic
+
+logger = logging.getLogger(__name__)
+
+
+BENCHMARKS: dict[str, typing.Callable[[], typing.Callable[[], object]]] = {}
+"""
+Benchmark setups by name. A setup prepares the data and returns the function to be timed.
+"""
+
+BASELINE = pathlib.Path(__file__).parent / "baseline.json"
+"""
+Results stored for comparison, see `python -m benchmarks --help`. Timings are absolute and only meaningful
+on the machine that recorded them: regenerate the baseline locally from the unchanged code before comparing.
+"""
+
+SYNTHETIC_SIZE = 10_000
+"""
+Stations in the synthetic catalogue of the `synthetic_*` benchmarks
+"""
+
+LOADER_SIZE = 50_000
+"""
+Rows of the CSV file of the `csv_load` benchmark
+"""
+
+ROUTE_QUERIES = 100
+"""
+Origin-destination pairs of the `synthetic_*_routes` benchmarks
+"""
+
+DEFAULT_THRESHOLD = 0.25
+"""
+Relative slowdown against the baseline reported as a regression
+"""
+
+
+class Result(typing.NamedTuple):
+    name: str
+    best: float
+    """
+    Fastest run, in seconds per call
+    """
+    median: float
+    calls: int
+    """
+    Calls per run
+    """
+
+
+class Regression(typing.NamedTuple):
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def benchmark(name: str):
+    def decorator(setup: typing.Callable[[], typing.Callable[[], object]]):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+def _station_list() -> list[stations.Station]:
+    return sorted(stations.station_registry.all(), key=lambda station: station.name)
+
+
+@benchmark("cold_import")
+def _cold_import():
+    # Runs in a fresh interpreter, so that nothing is imported yet; only the import itself is timed
+    code = "import time; start = time.perf_counter(); import simrail_sdk.stations; print(time.perf_counter() - start)"
+
+    def run():
+        return float(subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout)
+
+    run.timed_inside = True
+    return run
+
+
+@benchmark("branch_off_points")
+def _branch_off_points():
+    station_list = _station_list()
+
+    def run():
+        for station in station_list:
+            station.branch_off_points
+
+    return run
+
+
+@benchmark("is_junction")
+def _is_junction():
+    station_list = _station_list()
+
+    def run():
+        for station in station_list:
+            station.is_junction
+
+    return run
+
+
+@benchmark("name_lookup")
+def _name_lookup():
+    names = [station.name for station in _station_list()]
+    registry = stations.station_registry
+
+    def run():
+        for name in names:
+            registry.filter(name=name)
+
+    return run
+
+
+@benchmark("geodistance")
+def _geodistance():
+    station_list = _station_list()[:100]
+
+    def run():
+        for a in station_list:
+            for b in station_list:
+                geo.distance(a, b)
+
+    return run
+
+
+@benchmark("distance_matrix_nearest")
+def _distance_matrix_nearest():
+    station_list = _station_list()
+    # The directory and the matrix stay open as long as the benchmark function
+    directory = tempfile.TemporaryDirectory()
+    matrix = geo.DistanceMatrix.open(station_list, directory.name)
+
+    def run():
+        for station in station_list[:100]:
+            matrix.nearest(station)
+
+    run.resources = (directory, matrix)
+    return run
+
+
+@benchmark("model_dump_json")
+def _model_dump_json():
+    station_list = _station_list()
+
+    def run():
+        for station in station_list:
+            station.model_dump_json()
+
+    return run
+
+
+@benchmark("export_json")
+def _export_json():
+    station_list = _station_list()
+
+    def run():
+        "".join(export.iter_json(station_list, stations.R307_ISSUERS))
+
+    return run
+
+
+@benchmark("synthetic_name_lookup")
+def _synthetic_name_lookup():
+    network = synthetic.generate(SYNTHETIC_SIZE)
+    registry = stations.new_registry("synthetic", check_type=False)
+    registry.register_many(network.station_list)
+    names = [station.name for station in network.station_list[::10]]
+
+    def run():
+        for name in names:
+            registry.filter(name=name)
+
+    return run
+
+
+@benchmark("synthetic_line_sections")
+def _synthetic_line_sections():
+    station_list = synthetic.generate(SYNTHETIC_SIZE).station_list
+
+    def run():
+        sections.LineSectionTable(station_list)
+
+    return run
+
+
+def _write_csv(station_list: list[stations.Station], path: pathlib.Path) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(
+            ["name", "abbreviation", "lat", "lon", "mileage", "radio_channels", "station_types", "belongs_to", "shp"]
+        )
+        for station in station_list:
+            writer.writerow(
+                [
+                    station.name,
+                    station.abbreviation or "",
+                    station.lat,
+                    station.lon,
+                    ";".join(f"{line}:{km}" for line, km in station.mileage.items()),
+                    ";".join(channel.value for channel in station.radio_channels),
+                    ";".join(station_type.value for station_type in station.station_types),
+                    station.belongs_to.name if station.belongs_to is not None else "",
+                    "true" if station.shp else "false",
+                ]
+            )
+
+
+@benchmark("csv_load")
+def _csv_load():
+    directory = tempfile.TemporaryDirectory()
+    path = pathlib.Path(directory.name) / "stations.csv"
+    _write_csv(synthetic.generate(LOADER_SIZE).station_list, path)
+    source = loaders.CsvSource(path)
+
+    def run():
+        registry = stations.new_registry("benchmark", check_type=False)
+        start = time.perf_counter()
+        loaders.load(source, registry)
+        return time.perf_counter() - start
+
+    # Timed inside, since timeit turns off the garbage collector, which takes a good part of a real load
+    run.timed_inside = True
+    run.resources = directory
+    return run
+
+
+def _route_queries() -> tuple[routing.Network, list[tuple[stations.Station, stations.Station]]]:
+    network = routing.Network(synthetic.generate(SYNTHETIC_SIZE).station_list)
+    rng = random.Random(0)
+    return network, [(rng.choice(network.stations), rng.choice(network.stations)) for _ in range(ROUTE_QUERIES)]
+
+
+@benchmark("synthetic_dijkstra_routes")
+def _synthetic_dijkstra_routes():
+    network, queries = _route_queries()
+
+    def run():
+        for origin, destination in queries:
+            network.distance(origin, destination)
+
+    return run
+
+
+@benchmark("synthetic_contraction_routes")
+def _synthetic_contraction_routes():
+    network, queries = _route_queries()
+    hierarchy = contraction.ContractionHierarchy.build(network)
+
+    def run():
+        for origin, destination in queries:
+            hierarchy.distance(origin, destination)
+
+    return run
+
+
+def run(names: typing.Iterable[str] | None = None, repeat: int = 5, min_time: float = 0.2) -> list[Result]:
+    """
+    Runs the benchmarks, all of them unless `names` are given.
+
+    Each benchmark is called in runs of at least `min_time` seconds, `repeat` times.
+    """
+    results = []
+    for name in names if names is not None else BENCHMARKS:
+        function = BENCHMARKS[name]()
+        if getattr(function, "timed_inside", False):
+            times = [function() for _ in range(repeat)]
+            calls = 1
+        else:
+            timer = timeit.Timer(function)
+            calls, _ = timer.autorange()
+            calls = max(calls, math.ceil(calls * min_time / 0.2))
+            times = [total / calls for total in timer.repeat(repeat, calls)]
+        results.append(Result(name, min(times), statistics.median(times), calls))
+        logger.info("%s: %.3g s", name, min(times))
+    return results
+
+
+def dump(results: list[Result]) -> dict:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {result.name: result._asdict() for result in results},
+    }
+
+
+def recorded_on(path: str | pathlib.Path) -> tuple[str, str]:
+    """
+    Returns the Python version and the machine the results were recorded with.
+    """
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    return data["python"], data["machine"]
+
+
+def load(path: str | pathlib.Path) -> dict[str, Result]:
+    with open(path, encoding="utf-8") as file:
+        return {name: Result(**result) for name, result in json.load(file)["results"].items()}
+
+
+def compare(
+    results: list[Result],
+    baseline: dict[str, Result],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """
+    Returns the benchmarks slower than the baseline by more than the threshold.
+    Best times are compared, as they are the least affected by other load on the machine.
+    """
+    return [
+        Regression(result.name, baseline[result.name].best, result.best)
+        for result in results
+        if result.name in baseline and result.best > baseline[result.name].best * (1 + threshold)
+    ]
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import typing
+
+from simrail_sdk import registry, sqlite, stations
+
+logger = logging.getLogger(__name__)
+
+
+def _freeze(value: typing.Any) -> typing.Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted(value.items()))
+    if isinstance(value, list):
+        return tuple(value)
+    if isinstance(value, stations.Station):
+        return value.name
+    return value
+
+
+def content_key(station: stations.Station) -> tuple:
+    """
+    Returns all fields of the station as a hashable tuple, with `belongs_to` given by name.
+    Two stations with the same content key hold the same data.
+    """
+    return tuple(_freeze(getattr(station, field)) for field in stations.Station.model_fields)
+
+
+_STRING_FIELDS = ("name", "abbreviation", "remotely_controlled_from", "short_name")
+
+
+def _interned(station: stations.Station) -> dict[str, str]:
+    # The string fields that aren't interned yet, so equal names in different versions share one string object
+    update = {}
+    for field in _STRING_FIELDS:
+        value = getattr(station, field)
+        if value is not None and sys.intern(value) is not value:
+            update[field] = sys.intern(value)
+    return update
+
+
+def _share(
+    station_list: typing.Iterable[stations.Station],
+    previous: Catalogue | None,
+) -> dict[int, stations.Station]:
+    """
+    Maps each new station (by id) to the station to be used in the catalogue.
+
+    A station equal to one in the previous catalogue is replaced by the previous object, as long as
+    its `belongs_to` is shared as well. Otherwise the new object is used, copied if its `belongs_to` had to be replaced
+    or its strings interned; the stations passed in are never changed.
+    """
+    previous_stations = previous.by_content_key if previous is not None else {}
+    shared: dict[int, stations.Station] = {}
+
+    def share(station: stations.Station) -> stations.Station:
+        if id(station) in shared:
+            return shared[id(station)]
+        parent = share(station.belongs_to) if station.belongs_to is not None else None
+        old = previous_stations.get(content_key(station))
+        if old is not None and old.belongs_to is parent:
+            result = old
+        else:
+            # The stations belong to the caller, e.g. the module-level ones: changes go to a copy
+            update = _interned(station)
+            if parent is not station.belongs_to:
+                update["belongs_to"] = parent
+            result = station.model_copy(update=update) if update else station
+        shared[id(station)] = result
+        return result
+
+    for station in station_list:
+        share(station)
+    return shared
+
+
+class Catalogue:
+    """
+    An immutable version of the station data: the stations, a registry indexing them and the R307 issuers.
+
+    Build a new catalogue instead of changing one that's in use.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        station_list: typing.Iterable[stations.Station],
+        r307_issuers: dict[stations.Station, list[list]],
+        label: str | None = None,
+    ):
+        self.version = version
+        # Free-form description of the data, e.g. the game version
+        self.label = label
+        self.stations: tuple[stations.Station, ...] = tuple(station_list)
+        self.r307_issuers = r307_issuers
+        self.by_content_key = {content_key(station): station for station in self.stations}
+        self.registry: registry.SnapshotRegistry = stations.new_registry(f"catalogue-{version}", check_type=False)
+        self.registry.register_many(self.stations)
+        self._branch_off_points: dict[int, list[stations.Station]] = {}
+        for station in self.stations:
+            if station.belongs_to is not None:
+                self._branch_off_points.setdefault(id(station.belongs_to), []).append(station)
+
+    @classmethod
+    def build(
+        cls,
+        station_list: typing.Iterable[stations.Station] | None = None,
+        r307_issuers: dict[stations.Station, list[list]] | None = None,
+        previous: Catalogue | None = None,
+        version: int | None = None,
+        label: str | None = None,
+    ) -> Catalogue:
+        """
+        Builds a catalogue, sharing the unchanged stations with the previous one.
+
+        The stations don't need to be registered; build them with `Station.model_construct`
+        or load them with `sqlite.load` to keep them out of `station_registry`.
+        """
+        if station_list is None:
+            station_list = stations.station_registry.all()
+        if r307_issuers is None:
+            r307_issuers = stations.R307_ISSUERS
+        if version is None:
+            version = previous.version + 1 if previous is not None else 1
+        station_list = list(station_list)
+
+        shared = _share(station_list, previous)
+        r307_issuers = {
+            shared.get(id(issuer), issuer): [
+                [first, last, shared.get(id(destination), destination)] for first, last, destination in issued
+            ]
+            for issuer, issued in r307_issuers.items()
+        }
+        return cls(version, [shared[id(station)] for station in station_list], r307_issuers, label)
+
+    @functools.cached_property
+    def by_key(self) -> dict[str, stations.Station]:
+        """
+        The stations by the keys of `stations.station_keys`: the name, with the lines of the station appended
+        to names used by more than one station, e.g. `Katowice Janów [171]` and `Katowice Janów [657]`.
+        """
+        keys = stations.station_keys(self.stations)
+        return {keys[id(station)]: station for station in self.stations}
+
+    @functools.cached_property
+    def content_hashes(self) -> dict[str, int]:
+        """
+        Hash of the content key of each station, by station key.
+        Only valid within a process, like any `hash()`.
+        """
+        return {key: hash(content_key(station)) for key, station in self.by_key.items()}
+
+    def shared_with(self, other: Catalogue) -> int:
+        """
+        Returns the number of `Station` objects used by both catalogues.
+        """
+        other_ids = {id(station) for station in other.stations}
+        return sum(id(station) in other_ids for station in self.stations)
+
+    def get(self, name: str) -> stations.Station:
+        return self.registry.get(name=name)
+
+    def branch_off_points(self, station: stations.Station) -> list[stations.Station]:
+        """
+        Same as `Station.branch_off_points`, but within this catalogue.
+        """
+        return list(self._branch_off_points.get(id(station), []))
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def __repr__(self) -> str:
+        return f"<Catalogue {self.version}{f' ({self.label})' if self.label else ''}: {len(self)} stations>"
+
+
+def _read(path: str | os.PathLike) -> tuple[list[stations.Station], dict[stations.Station, list[list]]]:
+    connection = sqlite3.connect(path)
+    try:
+        return sqlite.load(connection)
+    finally:
+        connection.close()
+
+
+def open_versions(
+    paths: typing.Mapping[str, str | os.PathLike],
+    max_workers: int | None = None,
+) -> dict[str, Catalogue]:
+    """
+    Opens several catalogue versions written by `sqlite.write`, labelled by the keys of `paths`.
+
+    The databases are read concurrently. The catalogues are then built in the given order, each sharing
+    the unchanged stations of the one before and all of them sharing interned strings.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        loaded = list(executor.map(_read, paths.values()))
+    catalogues: dict[str, Catalogue] = {}
+    previous = None
+    for label, (station_list, r307_issuers) in zip(paths, loaded):
+        previous = catalogues[label] = Catalogue.build(station_list, r307_issuers, previous=previous, label=label)
+    return catalogues
+
+
+class VersionedCatalogue:
+    """
+    Holds the current catalogue of a long-running process and replaces it with new versions.
+
+    Readers take `current` once per request and use it throughout; they never wait, even while a new version
+    is being built, and never see a partially built one. Publishing is serialized, so versions only go up.
+    """
+
+    def __init__(self, catalogue: Catalogue | None = None):
+        self._current = catalogue if catalogue is not None else Catalogue.build()
+        self._lock = threading.Lock()
+        self._executor_lock = threading.Lock()
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    @property
+    def current(self) -> Catalogue:
+        return self._current
+
+    def publish(
+        self,
+        station_list: typing.Iterable[stations.Station],
+        r307_issuers: dict[stations.Station, list[list]],
+        label: str | None = None,
+    ) -> Catalogue:
+        """
+        Builds the next version from the data and makes it current.
+        """
+        with self._lock:
+            previous = self._current
+            catalogue = Catalogue.build(station_list, r307_issuers, previous=previous, label=label)
+            # A single assignment, so readers get either the old or the new catalogue
+            self._current = catalogue
+        logger.info("Published %r, sharing %d stations with %r", catalogue, catalogue.shared_with(previous), previous)
+        return catalogue
+
+    def publish_in_background(
+        self,
+        station_list: typing.Iterable[stations.Station],
+        r307_issuers: dict[stations.Station, list[list]],
+        label: str | None = None,
+    ) -> concurrent.futures.Future[Catalogue]:
+        """
+        Same as `publish`, but builds the catalogue in a background thread.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalogue")
+        return self._executor.submit(self.publish, station_list, r307_issuers, label)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import decimal
+import logging
+import math
+import typing
+
+from simrail_sdk import stations
+
+logger = logging.getLogger(__name__)
+
+
+class ChainageBreak(typing.NamedTuple):
+    """
+    A point where the kilometrage of a line jumps, e.g. where two historical lines were joined.
+    At the break, the chainage changes from `km_back` to `km_ahead` without any distance travelled.
+    """
+
+    line: int
+    km_back: decimal.Decimal
+    km_ahead: decimal.Decimal
+
+
+KNOWN_BREAKS: tuple[ChainageBreak, ...] = (
+    # Lines 1 and 154 both place Łazy before Łazy Łc, 2.686 km apart;
+    # on line 160 the kilometrage goes back to that of line 1 at Łazy
+    ChainageBreak(160, decimal.Decimal("283.654"), decimal.Decimal("280.654")),
+)
+"""
+Breaks of the lines in the catalogue, in the order of the kilometrage of each line
+"""
+
+KNOWN_ASSIGNMENTS: dict[int, dict[str, int]] = {
+    160: {"Łazy": 0, "Łazy Łc": 1},
+}
+"""
+Segments of the stations at ambiguous kilometres of `KNOWN_BREAKS`, by line and station name
+"""
+
+
+class Segment(typing.NamedTuple):
+    start_km: float
+    """
+    First kilometre of the segment, -inf for the first one
+    """
+    end_km: float
+    """
+    Last kilometre of the segment, inf for the last one
+    """
+    offset: float
+    """
+    Added to the kilometre to get the true chainage
+    """
+
+    def __contains__(self, km: float) -> bool:
+        return self.start_km <= km <= self.end_km
+
+
+def _squared_distance(a: stations.Station, b: stations.Station) -> float:
+    # Good enough to compare distances between nearby stations
+    return (float(a.lat) - float(b.lat)) ** 2 + (
+        (float(a.lon) - float(b.lon)) * math.cos(math.radians(float(a.lat)))
+    ) ** 2
+
+
+def _has_coordinates(station: stations.Station) -> bool:
+    return bool(station.lat or station.lon)
+
+
+class LineChainage:
+    """
+    True chainage of a line: the distance along the line, continuous across its breaks.
+
+    A line with N breaks has N + 1 segments, each with its own offset.
+    Kilometres shared by two segments (after a break going back) are ambiguous;
+    stations there are assigned explicitly or to the segment of the geographically nearest station.
+    """
+
+    def __init__(self, line: int, breaks: typing.Sequence[ChainageBreak] = ()):
+        self.line = line
+        self.breaks = tuple(breaks)
+        segments = []
+        start, offset = -math.inf, 0.0
+        for line_break in self.breaks:
+            km_back, km_ahead = float(line_break.km_back), float(line_break.km_ahead)
+            if km_back < start:
+                raise ValueError(f"Breaks of line {line} are not in the order of its kilometrage")
+            segments.append(Segment(start, km_back, offset))
+            offset += km_back - km_ahead
+            start = km_ahead
+        segments.append(Segment(start, math.inf, offset))
+        self.segments: tuple[Segment, ...] = tuple(segments)
+        # Segments sorted by their first kilometre, with the furthest end reached by any of them so far,
+        # so the segments containing a kilometre are found with a binary search and a short scan back
+        self._by_start = sorted(range(len(segments)), key=lambda index: segments[index].start_km)
+        self._starts = [segments[index].start_km for index in self._by_start]
+        self._reach = []
+        reach = -math.inf
+        for index in self._by_start:
+            reach = max(reach, segments[index].end_km)
+            self._reach.append(reach)
+
+    def candidates(self, km: float) -> list[int]:
+        """
+        Returns the indexes of the segments containing the kilometre.
+        """
+        found = []
+        position = bisect.bisect_right(self._starts, km) - 1
+        while position >= 0 and self._reach[position] >= km:
+            index = self._by_start[position]
+            if km <= self.segments[index].end_km:
+                found.append(index)
+            position -= 1
+        return sorted(found)
+
+    def true_km(self, km: float | decimal.Decimal, segment: int | None = None) -> float:
+        """
+        Returns the true chainage of a kilometre of the line, in O(log n).
+        Pass the segment if the kilometre is ambiguous.
+        """
+        km = float(km)
+        if segment is None:
+            found = self.candidates(km)
+            if len(found) != 1:
+                raise ValueError(f"Km {km} of line {self.line} is in segments {found}, pass the segment")
+            segment = found[0]
+        return km + self.segments[segment].offset
+
+    def assign(
+        self,
+        on_line: typing.Sequence[stations.Station],
+        assignments: typing.Mapping[str, int] | None = None,
+    ) -> dict[int, int]:
+        """
+        Returns the segment of each station (by id).
+        """
+        assignments = assignments or {}
+        result: dict[int, int] = {}
+        ambiguous = []
+        for station in on_line:
+            if station.name in assignments:
+                result[id(station)] = assignments[station.name]
+                continue
+            found = self.candidates(float(station.mileage[self.line]))
+            if len(found) == 1:
+                result[id(station)] = found[0]
+            else:
+                ambiguous.append((station, found))
+
+        by_segment = collections.defaultdict(list)
+        for station in on_line:
+            if id(station) in result and _has_coordinates(station):
+                by_segment[result[id(station)]].append(station)
+        for station, found in ambiguous:
+            nearest = found[0]
+            if _has_coordinates(station):
+                distances = {
+                    segment: min((_squared_distance(station, other) for other in by_segment[segment]), default=math.inf)
+                    for segment in found
+                }
+                nearest = min(found, key=distances.__getitem__)
+            else:
+                logger.debug("%s has no coordinates, assigned to segment %d of line %d", station, nearest, self.line)
+            result[id(station)] = nearest
+        return result
+
+
+class Chainage:
+    """
+    True chainage of every station on every line of the catalogue.
+
+    The true chainage of the stations is computed once, so distances between stations take O(1)
+    and distances between arbitrary kilometres take O(log n) in the number of breaks of the line.
+    """
+
+    def __init__(
+        self,
+        station_list: typing.Iterable[stations.Station] | None = None,
+        breaks: typing.Iterable[ChainageBreak] = KNOWN_BREAKS,
+        assignments: typing.Mapping[int, typing.Mapping[str, int]] | None = None,
+    ):
+        """
+        `assignments` gives the segment of stations at ambiguous kilometres, by line and station name.
+        Defaults to `KNOWN_ASSIGNMENTS` when the breaks are the `KNOWN_BREAKS`.
+        """
+        if station_list is None:
+            station_list = stations.station_registry.all()
+        if assignments is None:
+            assignments = KNOWN_ASSIGNMENTS if breaks is KNOWN_BREAKS else {}
+
+        breaks_by_line = collections.defaultdict(list)
+        for line_break in breaks:
+            breaks_by_line[line_break.line].append(line_break)
+        by_line = collections.defaultdict(list)
+        for station in station_list:
+            for line in station.mileage:
+                by_line[line].append(station)
+
+        self.lines: dict[int, LineChainage] = {}
+        self._true_km: dict[tuple[int, int], float] = {}
+        for line, on_line in by_line.items():
+            line_chainage = self.lines[line] = LineChainage(line, breaks_by_line.get(line, ()))
+            segments = line_chainage.assign(on_line, assignments.get(line))
+            for station in on_line:
+                self._true_km[(id(station), line)] = line_chainage.true_km(station.mileage[line], segments[id(station)])
+
+    def true_km(self, station: stations.Station, line: int) -> float:
+        try:
+            return self._true_km[(id(station), line)]
+        except KeyError:
+            raise ValueError(f"{station.name} is not on line {line}") from None
+
+    def distance(self, line: int, a: stations.Station, b: stations.Station) -> float:
+        """
+        Returns the distance (km) between two stations along the line.
+        """
+        return abs(self.true_km(a, line) - self.true_km(b, line))
+
+    def distance_km(
+        self,
+        line: int,
+        km_a: float | decimal.Decimal,
+        km_b: float | decimal.Decimal,
+    ) -> float:
+        """
+        Returns the distance (km) between two kilometres of the line.
+        """
+        line_chainage = self.lines[line]
+        return abs(line_chainage.true_km(km_a) - line_chainage.true_km(km_b))
+
+    def distances(
+        self,
+        legs: typing.Iterable[tuple[int, stations.Station, stations.Station]],
+    ) -> list[float]:
+        """
+        Returns the distance of each (line, origin, destination) leg.
+
+        The batch form of `distance`: lookups are done in a single pass with no per-call overhead.
+        """
+        legs = list(legs)
+        true_km = self._true_km
+        try:
+            return [abs(true_km[(id(a), line)] - true_km[(id(b), line)]) for line, a, b in legs]
+        except KeyError:
+            # Find the offending leg for the error message
+            for line, a, b in legs:
+                self.distance(line, a, b)
+            raise
+
+    def distances_km(
+        self,
+        line: int,
+        pairs: typing.Iterable[tuple[float | decimal.Decimal, float | decimal.Decimal]],
+    ) -> list[float]:
+        """
+        Returns the distance between each pair of kilometres of the line.
+        """
+        line_chainage = self.lines[line]
+        if len(line_chainage.segments) == 1:
+            # No breaks, nothing to look up
+            return [abs(float(km_a) - float(km_b)) for km_a, km_b in pairs]
+        true_km = line_chainage.true_km
+        return [abs(true_km(km_a) - true_km(km_b)) for km_a, km_b in pairs]
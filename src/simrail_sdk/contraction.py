@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import array
+import collections
+import functools
+import hashlib
+import heapq
+import logging
+import math
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+import typing
+
+from simrail_sdk import geo, routing, stations
+
+logger = logging.getLogger(__name__)
+
+
+WITNESS_SETTLE_LIMIT = 100
+"""
+Nodes settled by a witness search before giving up and adding the shortcut; lower is faster to build, slower to query
+"""
+
+_MAGIC = b"SRCH"
+_VERSION = 1
+_HEADER = struct.Struct("<4sI16sII")
+"""
+Magic bytes, format version, hash of the network, number of nodes and of upward edges, followed by the arrays
+of `_ARRAYS` as little-endian values
+"""
+
+_ARRAYS = (("offsets", "I"), ("targets", "I"), ("weights", "d"), ("middles", "i"), ("lines", "i"))
+"""
+Upward edges of each node in compressed sparse row form: the edges of node `n` are `offsets[n]` to `offsets[n + 1]`.
+Shortcuts have the node they bypass as their middle and -1 as their line, original edges the other way round.
+"""
+
+
+def network_hash(network: routing.Network) -> bytes:
+    """
+    Returns a hash of everything the hierarchy depends on: the nodes and edges of the network.
+    The network is built in the same order in every process, so the hash names the same file in all of them.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for station, edges in zip(network.stations, network.adjacency):
+        digest.update(station.name.encode())
+        for neighbour, line, length in edges:
+            digest.update(f"\t{neighbour},{line},{length!r}".encode())
+        digest.update(b"\n")
+    return digest.digest()
+
+
+class _Contraction:
+    """
+    Contracts the nodes of a network in the order of their edge difference, updated lazily.
+    """
+
+    def __init__(self, network: routing.Network, settle_limit: int):
+        self.settle_limit = settle_limit
+        # The shortest edge to each neighbour: weight, middle and line
+        self.graph: list[dict[int, tuple[float, int, int]]] = [{} for _ in network.stations]
+        for node, edges in enumerate(network.adjacency):
+            for neighbour, line, length in edges:
+                if length < self.graph[node].get(neighbour, (math.inf,))[0]:
+                    self.graph[node][neighbour] = (length, -1, line)
+        self.contracted = [False] * len(self.graph)
+        self.contracted_neighbours = [0] * len(self.graph)
+        self.upward: list[list[tuple[int, float, int, int]]] = [[] for _ in self.graph]
+
+    def _witness_distances(self, source: int, bypassed: int, limit: float) -> dict[int, float]:
+        graph, contracted = self.graph, self.contracted
+        best = {source: 0.0}
+        queue = [(0.0, source)]
+        settled = 0
+        while queue and settled < self.settle_limit:
+            distance, node = heapq.heappop(queue)
+            if distance > best[node]:
+                continue
+            if distance > limit:
+                break
+            settled += 1
+            for neighbour, (weight, _, _) in graph[node].items():
+                if neighbour == bypassed or contracted[neighbour]:
+                    continue
+                candidate = distance + weight
+                if candidate < best.get(neighbour, math.inf):
+                    best[neighbour] = candidate
+                    heapq.heappush(queue, (candidate, neighbour))
+        return best
+
+    def shortcuts(self, node: int) -> list[tuple[int, int, float]]:
+        """
+        Returns the shortcuts needed between the neighbours of the node to contract it.
+        """
+        neighbours = [
+            (neighbour, weight)
+            for neighbour, (weight, _, _) in self.graph[node].items()
+            if not self.contracted[neighbour]
+        ]
+        if len(neighbours) < 2:
+            return []
+        longest = max(weight for _, weight in neighbours)
+        needed = []
+        for index, (a, weight_a) in enumerate(neighbours[:-1]):
+            witnesses = self._witness_distances(a, node, weight_a + longest)
+            for b, weight_b in neighbours[index + 1 :]:
+                if witnesses.get(b, math.inf) > weight_a + weight_b:
+                    needed.append((a, b, weight_a + weight_b))
+        return needed
+
+    def priority(self, node: int) -> int:
+        degree = sum(not self.contracted[neighbour] for neighbour in self.graph[node])
+        return len(self.shortcuts(node)) - degree + self.contracted_neighbours[node]
+
+    def contract(self, node: int) -> None:
+        for a, b, weight in self.shortcuts(node):
+            if weight < self.graph[a].get(b, (math.inf,))[0]:
+                self.graph[a][b] = self.graph[b][a] = (weight, node, -1)
+        self.contracted[node] = True
+        for neighbour, (weight, middle, line) in self.graph[node].items():
+            if not self.contracted[neighbour]:
+                self.upward[node].append((neighbour, weight, middle, line))
+                self.contracted_neighbours[neighbour] += 1
+
+    def run(self) -> list[list[tuple[int, float, int, int]]]:
+        queue = [(self.priority(node), node) for node in range(len(self.graph))]
+        heapq.heapify(queue)
+        while queue:
+            _, node = heapq.heappop(queue)
+            priority = self.priority(node)
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, node))
+                continue
+            self.contract(node)
+        return self.upward
+
+
+class ContractionHierarchy:
+    """
+    Shortest routes of a `routing.Network`, preprocessed for fast queries.
+
+    Preprocessing contracts the stations one by one, adding shortcuts that keep the distances between the remaining
+    ones. Queries then only search upwards in the order of contraction, from both ends, settling a few dozen stations
+    instead of the whole network. `table` answers many-to-many queries with one upward search per station.
+
+    The hierarchy is static: use `routing.Network` for routes around closed sections.
+    """
+
+    def __init__(
+        self,
+        network: routing.Network,
+        offsets: array.array,
+        targets: array.array,
+        weights: array.array,
+        middles: array.array,
+        lines: array.array,
+    ):
+        if len(offsets) != len(network.stations) + 1:
+            raise ValueError(f"Hierarchy of {len(offsets) - 1} nodes for a network of {len(network.stations)}")
+        self.network = network
+        self.offsets, self.targets, self.weights, self.middles, self.lines = offsets, targets, weights, middles, lines
+        # Lists of tuples are much faster to iterate than the arrays
+        self._upward: list[list[tuple[int, float]]] = [
+            list(zip(targets[offsets[node] : offsets[node + 1]], weights[offsets[node] : offsets[node + 1]]))
+            for node in range(len(network.stations))
+        ]
+
+    @classmethod
+    def build(
+        cls,
+        network: routing.Network | None = None,
+        settle_limit: int = WITNESS_SETTLE_LIMIT,
+    ) -> ContractionHierarchy:
+        if network is None:
+            network = routing.Network()
+        upward = _Contraction(network, settle_limit).run()
+        offsets = array.array("I", [0])
+        targets, weights, middles, lines = array.array("I"), array.array("d"), array.array("i"), array.array("i")
+        for edges in upward:
+            for target, weight, middle, line in edges:
+                targets.append(target)
+                weights.append(weight)
+                middles.append(middle)
+                lines.append(line)
+            offsets.append(len(targets))
+        logger.info(
+            "Contracted %d stations with %d shortcuts",
+            len(network.stations),
+            sum(middle >= 0 for middle in middles),
+        )
+        return cls(network, offsets, targets, weights, middles, lines)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Writes the hierarchy to the file, atomically.
+        """
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                nodes, edges = len(self.network.stations), len(self.targets)
+                file.write(_HEADER.pack(_MAGIC, _VERSION, network_hash(self.network), nodes, edges))
+                for name, _ in _ARRAYS:
+                    values = getattr(self, name)
+                    if sys.byteorder != "little":
+                        values = array.array(values.typecode, values)
+                        values.byteswap()
+                    values.tofile(file)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path: str | os.PathLike, network: routing.Network | None = None) -> ContractionHierarchy:
+        """
+        Reads a hierarchy written by `save`, which must have been built from the same network.
+        """
+        if network is None:
+            network = routing.Network()
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"{path} is not a contraction hierarchy")
+            magic, version, hashed, nodes, edges = _HEADER.unpack(header)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"{path} is not a contraction hierarchy")
+            expected = _HEADER.size + sum(
+                array.array(typecode).itemsize * (nodes + 1 if name == "offsets" else edges)
+                for name, typecode in _ARRAYS
+            )
+            if os.fstat(file.fileno()).st_size != expected:
+                raise ValueError(f"{path} is truncated or corrupt: expected {expected} bytes")
+            if hashed != network_hash(network):
+                raise ValueError(f"{path} was built from a different network")
+            values = {}
+            for name, typecode in _ARRAYS:
+                values[name] = array.array(typecode)
+                values[name].fromfile(file, nodes + 1 if name == "offsets" else edges)
+                if sys.byteorder != "little":
+                    values[name].byteswap()
+        return cls(network, **values)
+
+    @classmethod
+    def open(
+        cls,
+        network: routing.Network | None = None,
+        directory: str | os.PathLike | None = None,
+    ) -> ContractionHierarchy:
+        """
+        Loads the hierarchy of the network, building and saving it first if it's not in the directory yet.
+        """
+        if network is None:
+            network = routing.Network()
+        directory = pathlib.Path(directory) if directory is not None else geo.default_directory()
+        path = directory / f"contraction-{network_hash(network).hex()}.ch"
+        if path.exists():
+            return cls.load(path, network)
+        logger.info("Building the contraction hierarchy of %d stations into %s", len(network.stations), path)
+        hierarchy = cls.build(network)
+        hierarchy.save(path)
+        return hierarchy
+
+    def _search(self, source: int, target: int) -> tuple[float, int, list[dict[int, int]]]:
+        """
+        Bidirectional upward search. Returns the distance, the node where both searches met
+        and the predecessors of both searches.
+        """
+        upward = self._upward
+        best = ({source: 0.0}, {target: 0.0})
+        previous: list[dict[int, int]] = [{}, {}]
+        queues = [[(0.0, source)], [(0.0, target)]]
+        shortest, meeting = (0.0, source) if source == target else (math.inf, -1)
+        while queues[0] or queues[1]:
+            for side in (0, 1):
+                queue = queues[side]
+                if not queue:
+                    continue
+                distance, node = heapq.heappop(queue)
+                if distance >= shortest:
+                    # Nothing shorter can be found from this side
+                    queue.clear()
+                    continue
+                own = best[side]
+                if distance > own[node]:
+                    continue
+                other = best[1 - side].get(node)
+                if other is not None and distance + other < shortest:
+                    shortest, meeting = distance + other, node
+                for neighbour, weight in upward[node]:
+                    candidate = distance + weight
+                    if candidate < own.get(neighbour, math.inf):
+                        own[neighbour] = candidate
+                        previous[side][neighbour] = node
+                        heapq.heappush(queue, (candidate, neighbour))
+        return shortest, meeting, previous
+
+    def distance(self, origin: stations.Station, destination: stations.Station) -> float:
+        """
+        Returns the length of the shortest route, or inf if there's none.
+        """
+        return self._search(self.network.node(origin), self.network.node(destination))[0]
+
+    @functools.cached_property
+    def _edges(self) -> dict[tuple[int, int], int]:
+        # Index of the upward edge between two nodes, lower node first; only needed to unpack routes
+        return {
+            (node, self.targets[index]): index
+            for node in range(len(self.offsets) - 1)
+            for index in range(self.offsets[node], self.offsets[node + 1])
+        }
+
+    def _unpack(self, a: int, b: int, nodes: list[int], lines: list[int], lengths: list[float]) -> None:
+        """
+        Appends the original edges of the upward edge between the nodes, from `a` to `b`.
+        """
+        stack = [(a, b)]
+        while stack:
+            a, b = stack.pop()
+            index = self._edges.get((a, b))
+            if index is None:
+                index = self._edges[(b, a)]
+            middle = self.middles[index]
+            if middle >= 0:
+                stack.append((middle, b))
+                stack.append((a, middle))
+            else:
+                nodes.append(b)
+                lines.append(self.lines[index])
+                lengths.append(self.weights[index])
+
+    def route(self, origin: stations.Station, destination: stations.Station) -> routing.Route | None:
+        """
+        Returns the shortest route, or None if there's none.
+        """
+        source, target = self.network.node(origin), self.network.node(destination)
+        distance, meeting, previous = self._search(source, target)
+        if meeting < 0:
+            return None
+        up = [meeting]
+        while up[-1] != source:
+            up.append(previous[0][up[-1]])
+        down = [meeting]
+        while down[-1] != target:
+            down.append(previous[1][down[-1]])
+        nodes, lines, lengths = [source], [], []
+        hops = list(reversed(up)) + down[1:]
+        for a, b in zip(hops, hops[1:]):
+            self._unpack(a, b, nodes, lines, lengths)
+        return routing.Route(distance, tuple(self.network.stations[node] for node in nodes), tuple(lines))
+
+    def _upward_distances(self, source: int) -> dict[int, float]:
+        upward = self._upward
+        best = {source: 0.0}
+        queue = [(0.0, source)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if distance > best[node]:
+                continue
+            for neighbour, weight in upward[node]:
+                candidate = distance + weight
+                if candidate < best.get(neighbour, math.inf):
+                    best[neighbour] = candidate
+                    heapq.heappush(queue, (candidate, neighbour))
+        return best
+
+    def table(
+        self,
+        origins: typing.Sequence[stations.Station],
+        destinations: typing.Sequence[stations.Station],
+    ) -> list[list[float]]:
+        """
+        Returns the lengths of the shortest routes from each origin to each destination, inf where there's none.
+
+        The upward search space of each destination is stored in buckets by node, then the upward search
+        of each origin looks up the buckets it reaches; the cost grows with the number of stations, not of pairs.
+        """
+        buckets: dict[int, list[tuple[int, float]]] = collections.defaultdict(list)
+        for column, destination in enumerate(destinations):
+            for node, distance in self._upward_distances(self.network.node(destination)).items():
+                buckets[node].append((column, distance))
+        rows = []
+        for origin in origins:
+            row = [math.inf] * len(destinations)
+            for node, distance in self._upward_distances(self.network.node(origin)).items():
+                for column, remaining in buckets.get(node, ()):
+                    if distance + remaining < row[column]:
+                        row[column] = distance + remaining
+            rows.append(row)
+        return rows
+
+    def __len__(self) -> int:
+        return len(self.network.stations)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+import typing
+
+from simrail_sdk import base, stations
+
+logger = logging.getLogger(__name__)
+
+
+class ControlArea(base.BasePydanticModel):
+    controller: stations.Station
+    """
+    The station with remote control facilities
+    """
+
+    remotely_controlled: list[stations.Station] = []
+    """
+    Stations controlled only from the controller
+    """
+
+    with_optional_local_control: list[stations.Station] = []
+    """
+    Stations controlled from the controller, which can be controlled locally as well when needed
+    """
+
+    @property
+    def members(self) -> list[stations.Station]:
+        """
+        All stations dispatched from the controller, including the controller itself.
+        """
+        return [self.controller, *self.remotely_controlled, *self.with_optional_local_control]
+
+    @property
+    def workload(self) -> int:
+        """
+        Number of stations the dispatcher at the controller is responsible for.
+        """
+        return 1 + len(self.remotely_controlled) + len(self.with_optional_local_control)
+
+
+class ControlIndex:
+    """
+    Bidirectional index between controllers and the stations they control remotely.
+
+    Built once in O(n) from the catalogue, after which every lookup is O(1).
+    Controllers are keyed by their abbreviation, as in `Station.remotely_controlled_from`.
+    """
+
+    def __init__(self, station_list: typing.Iterable[stations.Station] | None = None):
+        if station_list is None:
+            station_list = stations.station_registry.all()
+        station_list = sorted(station_list, key=lambda station: station.name)
+
+        self.controllers: dict[str, stations.Station] = {}
+        for station in station_list:
+            if station.abbreviation:
+                self.controllers[station.abbreviation] = station
+
+        self.areas: dict[str, ControlArea] = {}
+        self._controller_of: dict[str, stations.Station] = {}
+        for station in station_list:
+            abbreviation = station.remotely_controlled_from
+            if not abbreviation:
+                continue
+            controller = self.controllers.get(abbreviation)
+            if controller is None:
+                logger.warning("%s is controlled from unknown station %r", station.name, abbreviation)
+                continue
+            area = self.areas.get(abbreviation)
+            if area is None:
+                area = self.areas[abbreviation] = ControlArea(controller=controller)
+            if station.remote_control_with_optional_local_control:
+                area.with_optional_local_control.append(station)
+            else:
+                area.remotely_controlled.append(station)
+            self._controller_of[station.name] = controller
+
+    def controller_of(self, station: stations.Station) -> stations.Station | None:
+        """
+        Returns the station controlling the given one, or None if it's controlled locally.
+        """
+        return self._controller_of.get(station.name)
+
+    def area_of(self, station: stations.Station) -> ControlArea | None:
+        """
+        Returns the control area the station belongs to, either as a controller or as a controlled station.
+        """
+        controller = self._controller_of.get(station.name, station)
+        if controller.abbreviation is None:
+            return None
+        return self.areas.get(controller.abbreviation)
+
+    def workloads(self) -> dict[str, int]:
+        """
+        Returns the workload of each controller keyed by its abbreviation.
+        """
+        return {abbreviation: area.workload for abbreviation, area in self.areas.items()}
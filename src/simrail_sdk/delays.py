@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import datetime
+import enum
+import itertools
+import logging
+import math
+import typing
+
+from simrail_sdk import stations, timetable
+
+logger = logging.getLogger(__name__)
+
+
+class EventKind(enum.Enum):
+    ARRIVAL = "arrival"
+    DEPARTURE = "departure"
+
+
+class StationEvent(typing.NamedTuple):
+    """
+    A train arrived at or departed from a station.
+    """
+
+    train: str
+    station: stations.Station
+    time: datetime.datetime
+    kind: EventKind = EventKind.ARRIVAL
+
+
+class PositionEvent(typing.NamedTuple):
+    """
+    A train was seen at a position between stations.
+    """
+
+    train: str
+    line: int
+    km: float
+    time: datetime.datetime
+
+
+Event = StationEvent | PositionEvent
+
+
+@dataclasses.dataclass
+class RunningStatistics:
+    """
+    Count, mean, variance and extremes of a series of values, updated in O(1) without keeping the samples.
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        difference = value - self.mean
+        self.mean += difference / self.count
+        self.m2 += difference * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class DelayUpdate(typing.NamedTuple):
+    train: str
+    delay: datetime.timedelta
+    line: int
+    station: stations.Station | None
+    """
+    None for position events
+    """
+    line_statistics: RunningStatistics
+    station_statistics: RunningStatistics | None
+
+
+class _Leg(typing.NamedTuple):
+    line: int
+    low_km: float
+    high_km: float
+    from_km: float
+    to_km: float
+    departure: datetime.datetime
+    arrival: datetime.datetime
+
+
+class _PlannedRun:
+    def __init__(self, run: timetable.TrainRun):
+        self.stops = {stop.station.name: stop for stop in run.stops}
+        self.last_station = run.stops[-1].station.name
+        self.legs = []
+        # Leg starting at each station, and the legs overlapping each kilometre of each line,
+        # so events are matched with their leg directly
+        self.leg_from: dict[str, int] = {}
+        self.legs_at: dict[tuple[int, int], list[int]] = collections.defaultdict(list)
+        for stop, following in itertools.pairwise(run.stops):
+            if stop.departure is None or following.arrival is None:
+                continue
+            from_km, to_km = float(stop.km), float(following.station.mileage[stop.line])
+            low_km, high_km = sorted((from_km, to_km))
+            self.leg_from.setdefault(stop.station.name, len(self.legs))
+            for km in range(math.floor(low_km), math.floor(high_km) + 1):
+                self.legs_at[(stop.line, km)].append(len(self.legs))
+            self.legs.append(_Leg(stop.line, low_km, high_km, from_km, to_km, stop.departure, following.arrival))
+        self.cursor = 0
+        self.delay: datetime.timedelta | None = None
+
+    def passed(self, station: str) -> None:
+        """
+        Moves the cursor forward to the leg starting at the station.
+        """
+        self.cursor = max(self.cursor, self.leg_from.get(station, self.cursor))
+
+    def _leg_at(self, line: int, km: float) -> int | None:
+        # Trains only move forward, so the last matched leg and the next one are tried first
+        for index in (self.cursor, self.cursor + 1):
+            if index < len(self.legs):
+                leg = self.legs[index]
+                if leg.line == line and leg.low_km <= km <= leg.high_km:
+                    return index
+        found = None
+        for index in self.legs_at.get((line, math.floor(km)), ()):
+            leg = self.legs[index]
+            if leg.low_km <= km <= leg.high_km:
+                if index >= self.cursor:
+                    return index
+                found = index
+        return found
+
+    def planned_at(self, line: int, km: float) -> datetime.datetime | None:
+        """
+        Planned time at the position, interpolated within the leg.
+        """
+        index = self._leg_at(line, km)
+        if index is None:
+            return None
+        # A late event from a leg already left behind doesn't move the cursor back
+        self.cursor = max(self.cursor, index)
+        leg = self.legs[index]
+        length = leg.to_km - leg.from_km
+        share = (km - leg.from_km) / length if length else 0.0
+        return leg.departure + (leg.arrival - leg.departure) * share
+
+
+class DelayTracker:
+    """
+    Delay of each train against its planned timetable, updated with O(1) work per event.
+
+    Only the current delay of trains still running is kept.
+    Delays are aggregated into running statistics per station and per line,
+    so memory doesn't grow with the number of events.
+    """
+
+    def __init__(self, runs: typing.Iterable[timetable.TrainRun]):
+        self._planned = {run.number: _PlannedRun(run) for run in runs}
+        self.station_statistics: dict[str, RunningStatistics] = {}
+        self.line_statistics: dict[int, RunningStatistics] = {}
+
+    def delay_of(self, train: str) -> datetime.timedelta | None:
+        """
+        Returns the last known delay of the train, None if it wasn't seen yet or has finished its run.
+        """
+        planned = self._planned.get(train)
+        return planned.delay if planned else None
+
+    def process(self, event: Event) -> DelayUpdate | None:
+        """
+        Updates the delay of the train. Returns None for events which can't be matched with the timetable.
+        """
+        planned = self._planned.get(event.train)
+        if planned is None:
+            return None
+
+        station = None
+        station_statistics = None
+        if isinstance(event, StationEvent):
+            stop = planned.stops.get(event.station.name)
+            if stop is None:
+                return None
+            scheduled = stop.arrival if event.kind == EventKind.ARRIVAL else stop.departure
+            scheduled = scheduled or stop.arrival or stop.departure
+            station, line = event.station, stop.line
+            planned.passed(event.station.name)
+        else:
+            scheduled = planned.planned_at(event.line, float(event.km))
+            line = event.line
+        if scheduled is None:
+            return None
+
+        delay = event.time - scheduled
+        seconds = delay.total_seconds()
+        planned.delay = delay
+        line_statistics = self.line_statistics.setdefault(line, RunningStatistics())
+        line_statistics.add(seconds)
+        if station is not None:
+            station_statistics = self.station_statistics.setdefault(station.name, RunningStatistics())
+            station_statistics.add(seconds)
+            if station.name == planned.last_station and event.kind == EventKind.ARRIVAL:
+                del self._planned[event.train]
+        return DelayUpdate(event.train, delay, line, station, line_statistics, station_statistics)
+
+    async def stream(self, events: typing.AsyncIterable[Event]) -> typing.AsyncIterator[DelayUpdate]:
+        """
+        Pipeline stage: consumes events and yields a delay update for each one matched with the timetable.
+        """
+        async for event in events:
+            update = self.process(event)
+            if update is not None:
+                yield update
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import logging
+import typing
+
+from simrail_sdk import catalogue, stations
+
+logger = logging.getLogger(__name__)
+
+
+class FieldChange(typing.NamedTuple):
+    field: str
+    old: typing.Any
+    new: typing.Any
+
+
+class StationChange(typing.NamedTuple):
+    key: str
+    """
+    Station key, see `Catalogue.by_key`
+    """
+    changes: tuple[FieldChange, ...]
+
+
+class R307Change(typing.NamedTuple):
+    issuer: str
+    first: int
+    last: int
+    old_destination: str | None
+    """
+    None if the range was added
+    """
+    new_destination: str | None
+    """
+    None if the range was removed
+    """
+
+
+class CatalogueDiff(typing.NamedTuple):
+    added: list[str]
+    removed: list[str]
+    changed: list[StationChange]
+    r307_changes: list[R307Change]
+
+    @property
+    def empty(self) -> bool:
+        return not (self.added or self.removed or self.changed or self.r307_changes)
+
+
+def _value(station: stations.Station, field: str) -> typing.Any:
+    value = getattr(station, field)
+    if isinstance(value, stations.Station):
+        return value.name
+    return value
+
+
+def field_changes(old: stations.Station, new: stations.Station) -> tuple[FieldChange, ...]:
+    """
+    Returns the fields with different values in the two stations. `belongs_to` is compared by name.
+    """
+    return tuple(
+        FieldChange(field, _value(old, field), _value(new, field))
+        for field in stations.Station.model_fields
+        if _value(old, field) != _value(new, field)
+    )
+
+
+def _r307_ranges(r307_issuers: dict[stations.Station, list[list]]) -> dict[tuple[str, int, int], str]:
+    ranges = {}
+    for issuer, issued in r307_issuers.items():
+        for first, last, destination in issued:
+            key = (issuer.name, first, last)
+            if key in ranges:
+                raise ValueError(f"{issuer.name} issues the train numbers {first}-{last} more than once")
+            ranges[key] = destination.name
+    return ranges
+
+
+def r307_changes(
+    old: dict[stations.Station, list[list]],
+    new: dict[stations.Station, list[list]],
+) -> list[R307Change]:
+    """
+    Returns the added, removed and redirected train number ranges, ordered by issuer and range.
+    Raises ValueError if an issuer issues the same range twice, as the changes would be ambiguous.
+    """
+    old_ranges, new_ranges = _r307_ranges(old), _r307_ranges(new)
+    changes = []
+    for key in sorted(old_ranges.keys() | new_ranges.keys()):
+        old_destination, new_destination = old_ranges.get(key), new_ranges.get(key)
+        if old_destination != new_destination:
+            changes.append(R307Change(*key, old_destination, new_destination))
+    return changes
+
+
+def diff(old: catalogue.Catalogue, new: catalogue.Catalogue) -> CatalogueDiff:
+    """
+    Compares two catalogue versions.
+
+    Stations are matched by key and compared field by field only if their content hashes differ,
+    which is never the case for stations shared between the versions.
+    """
+    old_hashes, new_hashes = old.content_hashes, new.content_hashes
+    changed = []
+    for key in sorted(old_hashes.keys() & new_hashes.keys()):
+        old_station, new_station = old.by_key[key], new.by_key[key]
+        if old_station is new_station or old_hashes[key] == new_hashes[key]:
+            continue
+        changed.append(StationChange(key, field_changes(old_station, new_station)))
+    return CatalogueDiff(
+        added=sorted(new_hashes.keys() - old_hashes.keys()),
+        removed=sorted(old_hashes.keys() - new_hashes.keys()),
+        changed=changed,
+        r307_changes=r307_changes(old.r307_issuers, new.r307_issuers),
+    )
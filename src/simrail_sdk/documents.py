@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import concurrent.futures
+import functools
+import logging
+import typing
+
+import jinja2
+import markupsafe
+
+from simrail_sdk import i18n, stations, timetable
+
+logger = logging.getLogger(__name__)
+
+
+WORKING_TIMETABLE_TEMPLATE = "working_timetable.html"
+STATION_TEMPLATE = "station.html"
+
+
+class Row(typing.NamedTuple):
+    stop: timetable.Stop
+    station: markupsafe.Markup
+    """
+    Pre-rendered station cells, shared by all timetables
+    """
+
+
+@functools.cache
+def environment() -> jinja2.Environment:
+    """
+    The template environment of the current process. Compiled templates are cached by it.
+    """
+    return jinja2.Environment(
+        loader=jinja2.PackageLoader("simrail_sdk", "templates"),
+        autoescape=jinja2.select_autoescape(["html"]),
+        auto_reload=False,
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _station_fragment(station: stations.Station, line: int, printable_name: str) -> markupsafe.Markup:
+    return markupsafe.Markup(
+        environment().get_template(STATION_TEMPLATE).render(
+            station=station, km=station.mileage[line], printable_name=printable_name
+        )
+    )
+
+
+def station_fragment(station: stations.Station, line: int) -> markupsafe.Markup:
+    """
+    Renders the station cells of a timetable row, which are the same in every timetable passing the station.
+
+    Fragments are cached by the printable name as well, so they follow changes of `short_name`
+    and of `stations.DEFAULT_SHORT_NAME_REPLACEMENTS`.
+    """
+    return _station_fragment(station, line, station.printable_name)
+
+
+def render(
+    run: timetable.TrainRun,
+    template: str = WORKING_TIMETABLE_TEMPLATE,
+    locale: str = i18n.DEFAULT_LOCALE,
+) -> str:
+    """
+    Renders the working timetable of the run as HTML, ready to be printed or converted to PDF.
+
+    Stations marked as `skippable` are left out.
+    """
+    rows = [
+        Row(stop, station_fragment(stop.station, stop.line)) for stop in run.stops if not stop.station.skippable
+    ]
+    translated = i18n.messages(locale)
+    return environment().get_template(template).render(
+        run=run,
+        rows=rows,
+        locale=locale,
+        _=lambda message_id: translated.get(message_id, message_id),
+    )
+
+
+def render_many(
+    runs: typing.Iterable[timetable.TrainRun],
+    template: str = WORKING_TIMETABLE_TEMPLATE,
+    locale: str = i18n.DEFAULT_LOCALE,
+    max_workers: int | None = None,
+    chunksize: int = 64,
+) -> list[str]:
+    """
+    Renders many working timetables in a process pool, in the order of the runs.
+
+    Each worker process keeps its own template and fragment caches for the whole batch.
+    Pass `max_workers=1` to render in the current process instead.
+    """
+    if max_workers == 1:
+        return [render(run, template, locale) for run in runs]
+    render_run = functools.partial(render, template=template, locale=locale)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(render_run, runs, chunksize=chunksize))
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import datetime
+import itertools
+import logging
+import typing
+
+from simrail_sdk import delays, enums, stations, timetable
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SPEED = 80.0
+"""
+Speed (km/h) assumed on segments without any history
+"""
+
+MINIMUM_CURRENT_SPEED = 5.0
+"""
+Below this speed (km/h) the current speed of a train says nothing about its ETA, e.g. when standing at a signal
+"""
+
+
+class TrainState(typing.NamedTuple):
+    train: str
+    line: int
+    km: float
+    speed: float
+    """
+    Current speed, km/h
+    """
+    time: datetime.datetime
+
+
+class Eta(typing.NamedTuple):
+    station: stations.Station
+    eta: datetime.datetime
+
+
+class _Route:
+    """
+    Per-run arrays precomputed once, so that a prediction is a single pass over the upcoming stops.
+    """
+
+    def __init__(self, run: timetable.TrainRun, dwell_times: dict[enums.StopType, datetime.timedelta]):
+        self.stops = [stop.station for stop in run.stops]
+        self.segments = [
+            (stop.station.name, following.station.name) for stop, following in itertools.pairwise(run.stops)
+        ]
+        self.lines = [stop.line for stop in run.stops[:-1]]
+        self.from_km = [float(stop.km) for stop in run.stops[:-1]]
+        self.to_km = [
+            float(following.station.mileage[stop.line]) for stop, following in itertools.pairwise(run.stops)
+        ]
+        self.lengths = [abs(to_km - from_km) for from_km, to_km in zip(self.from_km, self.to_km)]
+        self.dwell_seconds = [
+            dwell_times.get(stop.stop_type, datetime.timedelta()).total_seconds() for stop in run.stops
+        ]
+        self.cursor = 0
+        self.last_seen: tuple[int, float, datetime.datetime] | None = None
+
+    def locate(self, line: int, km: float) -> int | None:
+        """
+        Index of the segment the train is on. Trains only move forward, so the search starts at the last match.
+        """
+        for index in range(self.cursor, len(self.segments)):
+            low_km, high_km = sorted((self.from_km[index], self.to_km[index]))
+            if self.lines[index] == line and low_km <= km <= high_km:
+                self.cursor = index
+                return index
+        return None
+
+
+class EtaEngine:
+    """
+    ETAs from the current position of each train to every upcoming stop of its run.
+
+    Segment speeds between consecutive stops are learned from successive positions of all trains
+    and kept as running statistics, shared by every run using the segment.
+    """
+
+    def __init__(
+        self,
+        runs: typing.Iterable[timetable.TrainRun],
+        dwell_times: dict[enums.StopType, datetime.timedelta] | None = None,
+        default_speed: float = DEFAULT_SPEED,
+    ):
+        if dwell_times is None:
+            dwell_times = timetable.DEFAULT_DWELL_TIMES
+        self.default_speed = default_speed
+        self._routes = {run.number: _Route(run, dwell_times) for run in runs}
+        self.segment_speeds: dict[tuple[str, str], delays.RunningStatistics] = {}
+
+    def observe_segment_speed(self, segment: tuple[str, str], speed: float) -> None:
+        """
+        Records a speed (km/h) achieved between two consecutive stops, given by station names.
+        """
+        self.segment_speeds.setdefault(segment, delays.RunningStatistics()).add(speed)
+
+    def _segment_speed(self, segment: tuple[str, str]) -> float:
+        statistics = self.segment_speeds.get(segment)
+        if statistics is None or not statistics.count or statistics.mean <= 0:
+            return self.default_speed
+        return statistics.mean
+
+    def predict(self, state: TrainState) -> list[Eta]:
+        """
+        Returns the ETA at each upcoming stop of the train, empty if it can't be placed on its route.
+        """
+        route = self._routes.get(state.train)
+        if route is None:
+            return []
+        index = route.locate(state.line, float(state.km))
+        if index is None:
+            return []
+
+        if route.last_seen is not None and route.last_seen[0] == index:
+            _, last_km, last_time = route.last_seen
+            hours = (state.time - last_time).total_seconds() / 3600
+            if hours > 0:
+                self.observe_segment_speed(route.segments[index], abs(float(state.km) - last_km) / hours)
+        route.last_seen = (index, float(state.km), state.time)
+
+        speed = state.speed if state.speed >= MINIMUM_CURRENT_SPEED else self._segment_speed(route.segments[index])
+        seconds = abs(route.to_km[index] - float(state.km)) / speed * 3600
+        etas = [Eta(route.stops[index + 1], state.time + datetime.timedelta(seconds=seconds))]
+        for following in range(index + 1, len(route.segments)):
+            seconds += route.dwell_seconds[following]
+            seconds += route.lengths[following] / self._segment_speed(route.segments[following]) * 3600
+            etas.append(Eta(route.stops[following + 1], state.time + datetime.timedelta(seconds=seconds)))
+        return etas
+
+    def predict_all(self, states: typing.Iterable[TrainState]) -> dict[str, list[Eta]]:
+        """
+        Recomputes the ETAs of every train of a server in one pass, e.g. after each poll.
+        """
+        return {state.train: self.predict(state) for state in states}
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import collections
+import functools
+import gzip
+import hashlib
+import json
+import logging
+import typing
+
+from simrail_sdk import stations
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PRECISION = 6
+"""
+Decimal places of coordinates; 6 places is about 10 cm
+"""
+
+MILEAGE_PRECISION = 3
+"""
+Decimal places of mileage, i.e. metres
+"""
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def station_record(
+    station: stations.Station,
+    precision: int = DEFAULT_PRECISION,
+    keys: dict[int, str] | None = None,
+) -> dict:
+    """
+    Returns a compact JSON-ready representation of the station.
+    Fields with default values are left out, the same way `model_dump(exclude_defaults=True)` would.
+
+    With the `keys` of `stations.station_keys`, the record gets an `id`
+    and `belongs_to` refers to the key of the station instead of its name, which is not unique.
+    """
+    record = {
+        "name": station.name,
+        "lat": round(float(station.lat), precision),
+        "lon": round(float(station.lon), precision),
+        "mileage": {str(line): round(float(km), MILEAGE_PRECISION) for line, km in station.mileage.items()},
+        "radio_channels": [channel.value for channel in station.radio_channels],
+        "station_types": [station_type.value for station_type in station.station_types],
+    }
+    for field in ("abbreviation", "remotely_controlled_from", "short_name"):
+        value = getattr(station, field)
+        if value is not None:
+            record[field] = value
+    for field, default in (
+        ("remote_control_facilities", False),
+        ("remote_control_with_optional_local_control", False),
+        ("shp", True),
+        ("radio_recording", True),
+        ("skippable", False),
+    ):
+        value = getattr(station, field)
+        if value != default:
+            record[field] = value
+    if keys is not None:
+        record = {"id": keys[id(station)], **record}
+    if station.belongs_to is not None:
+        record["belongs_to"] = _key(station.belongs_to, keys)
+    return record
+
+
+def _key(station: stations.Station, keys: dict[int, str] | None) -> str:
+    # Stations outside of the exported ones are referred to by name
+    return keys.get(id(station), station.name) if keys is not None else station.name
+
+
+def _sorted(station_list: typing.Iterable[stations.Station]) -> list[stations.Station]:
+    return sorted(station_list, key=stations.sort_key)
+
+
+def lines(station_list: typing.Iterable[stations.Station]) -> dict[str, list[str]]:
+    """
+    Returns the keys (see `stations.station_keys`) of the stations on each line, ordered by mileage.
+    """
+    station_list = list(station_list)
+    keys = stations.station_keys(station_list)
+    by_line = collections.defaultdict(list)
+    for station in station_list:
+        for line, km in station.mileage.items():
+            by_line[line].append((km, keys[id(station)]))
+    return {str(line): [key for _, key in sorted(on_line)] for line, on_line in sorted(by_line.items())}
+
+
+def branch_off_points(station_list: typing.Iterable[stations.Station]) -> dict[str, list[str]]:
+    """
+    Returns the keys of the branch off points belonging to each station, by the key of the station.
+    """
+    station_list = _sorted(station_list)
+    keys = stations.station_keys(station_list)
+    branches = collections.defaultdict(list)
+    for station in station_list:
+        if station.belongs_to is not None:
+            branches[_key(station.belongs_to, keys)].append(keys[id(station)])
+    return dict(sorted(branches.items()))
+
+
+def r307_ranges(
+    r307_issuers: dict[stations.Station, list[list]],
+    keys: dict[int, str] | None = None,
+) -> list[dict]:
+    return [
+        {"issuer": _key(issuer, keys), "first": first, "last": last, "destination": _key(destination, keys)}
+        for issuer, issued in sorted(r307_issuers.items(), key=lambda item: stations.sort_key(item[0]))
+        for first, last, destination in issued
+    ]
+
+
+def iter_json(
+    station_list: typing.Iterable[stations.Station],
+    r307_issuers: dict[stations.Station, list[list]],
+    precision: int = DEFAULT_PRECISION,
+) -> typing.Iterator[str]:
+    """
+    Streams the catalogue as a single JSON document, one station per chunk.
+    """
+    station_list = _sorted(station_list)
+    keys = stations.station_keys(station_list)
+    yield '{"stations":['
+    for index, station in enumerate(station_list):
+        yield ("," if index else "") + _encoder.encode(station_record(station, precision, keys))
+    yield '],"lines":' + _encoder.encode(lines(station_list))
+    yield ',"branch_off_points":' + _encoder.encode(branch_off_points(station_list))
+    yield ',"r307_issuers":' + _encoder.encode(r307_ranges(r307_issuers, keys))
+    yield "}"
+
+
+def iter_geojson(
+    station_list: typing.Iterable[stations.Station],
+    precision: int = DEFAULT_PRECISION,
+) -> typing.Iterator[str]:
+    """
+    Streams the stations as a GeoJSON FeatureCollection of points, one feature per chunk.
+    Features are identified by the keys of `stations.station_keys`.
+    Stations with placeholder (0, 0) coordinates get a null geometry.
+    """
+    station_list = _sorted(station_list)
+    keys = stations.station_keys(station_list)
+    yield '{"type":"FeatureCollection","features":['
+    for index, station in enumerate(station_list):
+        properties = station_record(station, precision, keys)
+        key, lat, lon = properties.pop("id"), properties.pop("lat"), properties.pop("lon")
+        geometry = {"type": "Point", "coordinates": [lon, lat]} if lat or lon else None
+        feature = {"type": "Feature", "id": key, "geometry": geometry, "properties": properties}
+        yield ("," if index else "") + _encoder.encode(feature)
+    yield "]}"
+
+
+class Export:
+    """
+    A serialized document ready to be served over HTTP, plain and gzipped, with a precomputed strong ETag.
+    """
+
+    def __init__(self, chunks: typing.Iterable[str], media_type: str):
+        self.media_type = media_type
+        self.body = "".join(chunks).encode()
+        self.etag = '"' + hashlib.blake2b(self.body, digest_size=16).hexdigest() + '"'
+
+    @functools.cached_property
+    def gzipped(self) -> bytes:
+        # mtime=0 keeps the compressed body identical between builds
+        return gzip.compress(self.body, compresslevel=9, mtime=0)
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+
+class CatalogueExport:
+    """
+    JSON and GeoJSON exports of the catalogue, each serialized once on first access.
+    """
+
+    def __init__(
+        self,
+        station_list: typing.Iterable[stations.Station] | None = None,
+        r307_issuers: dict[stations.Station, list[list]] | None = None,
+        precision: int = DEFAULT_PRECISION,
+    ):
+        if station_list is None:
+            station_list = stations.station_registry.all()
+        if r307_issuers is None:
+            r307_issuers = stations.R307_ISSUERS
+        self.stations = _sorted(station_list)
+        self.r307_issuers = r307_issuers
+        self.precision = precision
+
+    @functools.cached_property
+    def json(self) -> Export:
+        return Export(iter_json(self.stations, self.r307_issuers, self.precision), "application/json")
+
+    @functools.cached_property
+    def geojson(self) -> Export:
+        return Export(iter_geojson(self.stations, self.precision), "application/geo+json")
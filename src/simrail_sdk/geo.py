@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import array
+import hashlib
+import heapq
+import logging
+import math
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+import typing
+
+from simrail_sdk import stations
+
+logger = logging.getLogger(__name__)
+
+
+EARTH_RADIUS = 6371.0088
+"""
+Mean radius of the Earth, in km
+"""
+
+_MAGIC = b"SRDM"
+_HEADER = struct.Struct("<4sI")
+"""
+Magic bytes and the number of stations, followed by the matrix as little-endian float32, row by row
+"""
+
+
+def haversine(lat_a: float, lon_a: float, lat_b: float, lon_b: float) -> float:
+    """
+    Returns the great-circle distance (km) between two points given in degrees.
+    """
+    lat_a, lon_a, lat_b, lon_b = map(math.radians, (lat_a, lon_a, lat_b, lon_b))
+    h = math.sin((lat_b - lat_a) / 2) ** 2 + math.cos(lat_a) * math.cos(lat_b) * math.sin((lon_b - lon_a) / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(h))
+
+
+def distance(a: stations.Station, b: stations.Station) -> float:
+    """
+    Returns the great-circle distance (km) between two stations.
+    """
+    return haversine(float(a.lat), float(a.lon), float(b.lat), float(b.lon))
+
+
+def _ordered(station_list: typing.Iterable[stations.Station]) -> list[stations.Station]:
+    return sorted(station_list, key=lambda station: (station.name, station.lat, station.lon))
+
+
+def content_hash(station_list: typing.Iterable[stations.Station]) -> str:
+    """
+    Returns a hash of everything the distance matrix depends on: the names and coordinates of the stations.
+    Unlike `hash()`, it's the same in every process.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for station in _ordered(station_list):
+        digest.update(f"{station.name}\t{station.lat}\t{station.lon}\n".encode())
+    return digest.hexdigest()
+
+
+def default_directory() -> pathlib.Path:
+    return pathlib.Path(os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache")) / "simrail_sdk"
+
+
+def _rows(station_list: list[stations.Station]) -> typing.Iterator[array.array]:
+    # Coordinates are converted once, each row is computed in a single comprehension
+    lats = [math.radians(float(station.lat)) for station in station_list]
+    lons = [math.radians(float(station.lon)) for station in station_list]
+    cos_lats = [math.cos(lat) for lat in lats]
+    placeholders = [not (station.lat or station.lon) for station in station_list]
+    sin, asin, sqrt, nan, diameter = math.sin, math.asin, math.sqrt, math.nan, 2 * EARTH_RADIUS
+    for lat_a, lon_a, cos_a, placeholder in zip(lats, lons, cos_lats, placeholders):
+        if placeholder:
+            yield array.array("f", [nan]) * len(station_list)
+            continue
+        yield array.array(
+            "f",
+            [
+                nan
+                if other_placeholder
+                else diameter
+                * asin(sqrt(sin((lat_b - lat_a) / 2) ** 2 + cos_a * cos_b * sin((lon_b - lon_a) / 2) ** 2))
+                for lat_b, lon_b, cos_b, other_placeholder in zip(lats, lons, cos_lats, placeholders)
+            ],
+        )
+
+
+def write(path: str | os.PathLike, station_list: list[stations.Station]) -> None:
+    """
+    Computes the matrix of the stations, in the given order, and writes it to the file.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, len(station_list)))
+            for row in _rows(station_list):
+                if sys.byteorder != "little":
+                    row.byteswap()
+                row.tofile(file)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class DistanceMatrix:
+    """
+    Great-circle distances (km) between all pairs of stations, as a float32 matrix in a memory-mapped file.
+
+    The file is named after the content hash of the stations, so it's computed by the first process
+    and opened instantly by later ones; only the rows that are read are loaded from disk.
+    Distances from and to stations with placeholder (0, 0) coordinates are NaN.
+    On big-endian machines the file is read into memory and byteswapped instead.
+    """
+
+    def __init__(self, path: str | os.PathLike, station_list: typing.Iterable[stations.Station]):
+        self.path = pathlib.Path(path)
+        self.stations = _ordered(station_list)
+        self._index = {id(station): index for index, station in enumerate(self.stations)}
+        with open(self.path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            size = len(self.stations)
+            if len(self._mmap) != _HEADER.size + size * size * 4:
+                raise ValueError(f"{self.path} is not a distance matrix of {size} stations")
+            magic, stored_size = _HEADER.unpack_from(self._mmap)
+            if magic != _MAGIC or stored_size != size:
+                raise ValueError(f"{self.path} is not a distance matrix of {size} stations")
+            if sys.byteorder == "little":
+                self._values = memoryview(self._mmap)[_HEADER.size :].cast("f")
+            else:
+                # The file is little-endian: read it into a native array instead of mapping it
+                values = array.array("f")
+                values.frombytes(self._mmap[_HEADER.size :])
+                values.byteswap()
+                self._values = memoryview(values)
+        except BaseException:
+            self._mmap.close()
+            raise
+
+    @classmethod
+    def open(
+        cls,
+        station_list: typing.Iterable[stations.Station] | None = None,
+        directory: str | os.PathLike | None = None,
+    ) -> DistanceMatrix:
+        """
+        Opens the matrix of the stations, computing it first if it's not in the directory yet.
+        """
+        if station_list is None:
+            station_list = stations.station_registry.all()
+        station_list = _ordered(station_list)
+        directory = pathlib.Path(directory) if directory is not None else default_directory()
+        path = directory / f"distances-{content_hash(station_list)}.f32"
+        if not path.exists():
+            logger.info("Computing the distance matrix of %d stations into %s", len(station_list), path)
+            write(path, station_list)
+        return cls(path, station_list)
+
+    def index(self, station: stations.Station) -> int:
+        try:
+            return self._index[id(station)]
+        except KeyError:
+            raise ValueError(f"{station.name} is not in the distance matrix") from None
+
+    def row(self, station: stations.Station) -> memoryview:
+        """
+        Returns the distances from the station to all stations, in the order of `stations`. No data is copied,
+        so release the row (or drop all references to it) before closing the matrix.
+        """
+        size = len(self.stations)
+        start = self.index(station) * size
+        return self._values[start : start + size]
+
+    def distance(self, a: stations.Station, b: stations.Station) -> float:
+        return self._values[self.index(a) * len(self.stations) + self.index(b)]
+
+    def nearest(self, station: stations.Station, count: int = 5) -> list[tuple[float, stations.Station]]:
+        """
+        Returns the nearest other stations with their distances, nearest first.
+        """
+        own = self.index(station)
+        with self.row(station) as row:
+            nearest = heapq.nsmallest(
+                count,
+                (
+                    (distance, index)
+                    for index, distance in enumerate(row)
+                    if index != own and not math.isnan(distance)
+                ),
+            )
+        return [(distance, self.stations[index]) for distance, index in nearest]
+
+    def close(self) -> None:
+        self._values.release()
+        self._mmap.close()
+
+    def __enter__(self) -> DistanceMatrix:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.stations)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import datetime
+import enum
+import heapq
+import itertools
+import logging
+import typing
+
+from simrail_sdk import sections, stations, timetable
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_HEADWAY = datetime.timedelta(minutes=3)
+
+
+class ConflictKind(enum.Enum):
+    HEADWAY = "headway"
+    """
+    Two trains leave a station onto the same line in the same direction less than the headway apart
+    """
+
+    OCCUPANCY = "occupancy"
+    """
+    Two trains travelling in the same direction are in the same line section at the same time
+    """
+
+
+class Conflict(typing.NamedTuple):
+    kind: ConflictKind
+    location: stations.Station | sections.LineSection
+    trains: tuple[str, str]
+    start: datetime.datetime
+    """
+    Start of the overlap
+    """
+    end: datetime.datetime
+    """
+    End of the overlap
+    """
+
+
+class _Interval(typing.NamedTuple):
+    start: datetime.datetime
+    end: datetime.datetime
+    train: str
+
+
+_Key = tuple
+
+
+class HeadwayChecker:
+    """
+    Headway and line section occupancy conflicts between train runs.
+
+    Time intervals are kept in arrays sorted by start, one per location and direction of travel.
+    A full check sweeps each array once, in O((n + k) log n) for n intervals and k conflicts.
+    Replacing a single run only re-checks the intervals of that run,
+    with binary searches bounded by the longest interval stored for the location.
+
+    Trains travelling in opposite directions are never in conflict,
+    as the catalogue doesn't record which lines are single track.
+    """
+
+    def __init__(
+        self,
+        section_table: sections.LineSectionTable | None = None,
+        headway: datetime.timedelta = DEFAULT_HEADWAY,
+    ):
+        if section_table is None:
+            section_table = sections.LineSectionTable()
+        self.section_table = section_table
+        self.headway = headway
+        self._intervals: dict[_Key, list[_Interval]] = collections.defaultdict(list)
+        self._longest: dict[_Key, datetime.timedelta] = collections.defaultdict(datetime.timedelta)
+        self._locations: dict[_Key, stations.Station | sections.LineSection] = {}
+        self._keys_of_train: dict[str, list[tuple[_Key, _Interval]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys_of_train)
+
+    def _entries(self, run: timetable.TrainRun) -> list[tuple[_Key, _Interval]]:
+        entries = []
+        # Occupancy entries of the previous leg, extended while the train stays in the same section
+        previous_leg = {}
+        for stop, following in itertools.pairwise(run.stops):
+            direction = 1 if following.station.mileage[stop.line] >= stop.km else -1
+            if stop.departure is not None:
+                key = (ConflictKind.HEADWAY, stop.station.name, stop.line, direction)
+                self._locations[key] = stop.station
+                entries.append((key, _Interval(stop.departure, stop.departure + self.headway, run.number)))
+            if stop.departure is None or following.arrival is None:
+                previous_leg = {}
+                continue
+            current_leg = {}
+            for section in self.section_table.sections_between(
+                stop.line, stop.km, following.station.mileage[stop.line]
+            ):
+                key = (ConflictKind.OCCUPANCY, section.line, section.start.name, section.end.name, direction)
+                self._locations[key] = section
+                if key in previous_leg:
+                    index = previous_leg[key]
+                    entries[index] = (key, entries[index][1]._replace(end=following.arrival))
+                else:
+                    index = len(entries)
+                    entries.append((key, _Interval(stop.departure, following.arrival, run.number)))
+                current_leg[key] = index
+            previous_leg = current_leg
+        return entries
+
+    def add(self, run: timetable.TrainRun) -> None:
+        """
+        Adds the run, replacing a previous run with the same number.
+        """
+        self.remove(run.number)
+        entries = self._entries(run)
+        for key, interval in entries:
+            bisect.insort(self._intervals[key], interval)
+            self._longest[key] = max(self._longest[key], interval.end - interval.start)
+        self._keys_of_train[run.number] = entries
+
+    def add_many(self, runs: typing.Iterable[timetable.TrainRun]) -> None:
+        for run in runs:
+            self.add(run)
+
+    def remove(self, number: str) -> None:
+        """
+        Removes the run with the given number. Unknown numbers are ignored.
+        """
+        for key, interval in self._keys_of_train.pop(number, []):
+            intervals = self._intervals[key]
+            del intervals[bisect.bisect_left(intervals, interval)]
+
+    def _conflict(self, key: _Key, first: _Interval, second: _Interval) -> Conflict:
+        return Conflict(
+            key[0],
+            self._locations[key],
+            (first.train, second.train),
+            max(first.start, second.start),
+            min(first.end, second.end),
+        )
+
+    def conflicts(self) -> list[Conflict]:
+        """
+        Returns all conflicts between the runs.
+        """
+        found = []
+        for key, intervals in self._intervals.items():
+            active = []
+            for interval in intervals:
+                while active and active[0][0] <= interval.start:
+                    heapq.heappop(active)
+                for _, other in active:
+                    if other.train != interval.train:
+                        found.append(self._conflict(key, other, interval))
+                heapq.heappush(active, (interval.end, interval))
+        return found
+
+    def update(self, run: timetable.TrainRun) -> list[Conflict]:
+        """
+        Replaces the run and returns only the conflicts it's involved in.
+        """
+        self.add(run)
+        found = []
+        for key, interval in self._keys_of_train[run.number]:
+            intervals = self._intervals[key]
+            # Nothing starting earlier than this can still overlap the interval
+            first = bisect.bisect_left(intervals, (interval.start - self._longest[key],))
+            last = bisect.bisect_left(intervals, (interval.end,))
+            for other in intervals[first:last]:
+                if other.train != run.number and other.end > interval.start:
+                    ordered = (other, interval) if other < interval else (interval, other)
+                    found.append(self._conflict(key, *ordered))
+        return found
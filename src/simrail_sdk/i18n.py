@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import enum
+import functools
+import logging
+import pathlib
+
+import babel.support
+
+from simrail_sdk import enums
+
+logger = logging.getLogger(__name__)
+
+
+TRANSLATIONS_DIRECTORY = pathlib.Path(__file__).parent / "translations"
+"""
+Compiled catalogs, laid out as expected by flask-babel.
+Add it to `BABEL_TRANSLATION_DIRECTORIES` to use the catalogs in a Flask app.
+"""
+
+DOMAIN = "messages"
+
+DEFAULT_LOCALE = "pl"
+
+LABELS: dict[enum.Enum, str] = {
+    enums.StationType.BRANCH_OFF_POINT: "Branch off point",
+    enums.StationType.BLOCK_POST: "Block post",
+    enums.StationType.FREIGHT_GROUP: "Freight group",
+    enums.StationType.HALT: "Halt",
+    enums.StationType.JUNCTION: "Junction",
+    enums.StationType.LINES_MERGING: "Lines merging point",
+    enums.StationType.PASSING_LOOP: "Passing loop",
+    enums.StationType.STATION: "Station",
+    enums.StationType.TECHNICAL_STATION: "Technical station",
+    enums.StopType.PH: "Commercial stop",
+    enums.StopType.PT: "Technical stop",
+    **{channel: f"Radio channel {channel.value}" for channel in enums.RadioChannel},
+}
+"""
+Untranslated (English) labels of the enum members, used as message ids
+"""
+
+UI_MESSAGES: tuple[str, ...] = ("km", "Station", "Arr.", "Dep.", "Stop")
+"""
+Message ids used by the document templates
+"""
+
+
+@functools.cache
+def messages(locale: str) -> dict[str, str]:
+    """
+    Returns all messages of the SDK translated to the locale.
+
+    The catalog is read once per process and locale; unknown locales fall back to the untranslated messages.
+    """
+    translations = babel.support.Translations.load(TRANSLATIONS_DIRECTORY, [locale], DOMAIN)
+    message_ids = {*LABELS.values(), *UI_MESSAGES}
+    return {message_id: translations.gettext(message_id) for message_id in message_ids}
+
+
+@functools.cache
+def labels(locale: str) -> dict[enum.Enum, str]:
+    """
+    Returns the translated label of each enum member.
+    """
+    translated = messages(locale)
+    return {member: translated[message_id] for member, message_id in LABELS.items()}
+
+
+def label(member: enum.Enum, locale: str = DEFAULT_LOCALE) -> str:
+    """
+    Returns the translated label of a `StationType`, `RadioChannel` or `StopType`.
+    """
+    return labels(locale)[member]
+
+
+def gettext(message_id: str, locale: str = DEFAULT_LOCALE) -> str:
+    """
+    Returns the translated message, or the message itself if it's not in the catalogs.
+    """
+    return messages(locale).get(message_id, message_id)
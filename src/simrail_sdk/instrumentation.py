@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import bisect
+import functools
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+import time
+import typing
+
+from simrail_sdk import stations
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BUCKETS: tuple[float, ...] = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 1.0)
+"""
+Upper bounds of the latency histogram buckets, in seconds
+"""
+
+
+class HistogramSnapshot(typing.NamedTuple):
+    bounds: tuple[float, ...]
+    counts: tuple[int, ...]
+    """
+    Calls per bucket, not cumulative; the last bucket counts the calls slower than all bounds
+    """
+    total: float
+    """
+    Sum of all latencies, in seconds
+    """
+
+    @property
+    def calls(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """
+        Returns (upper bound, calls) pairs the way Prometheus expects them, ending with +Inf.
+        """
+        pairs = []
+        calls = 0
+        for bound, count in zip((*self.bounds, float("inf")), self.counts):
+            calls += count
+            pairs.append((bound, calls))
+        return pairs
+
+
+class CacheStatistics(typing.NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MetricsSnapshot(typing.NamedTuple):
+    histograms: dict[tuple[str, str], HistogramSnapshot]
+    """
+    Latency histograms by function and label, e.g. ("station_registry.filter", "name")
+    """
+    caches: dict[str, CacheStatistics]
+
+
+class Histogram:
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        index = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += seconds
+
+    def snapshot(self) -> HistogramSnapshot:
+        with self._lock:
+            return HistogramSnapshot(self.bounds, tuple(self.counts), self.total)
+
+
+class Sink(typing.Protocol):
+    def emit(self, snapshot: MetricsSnapshot) -> None: ...
+
+
+class MemorySink:
+    """
+    Keeps every snapshot, e.g. for tests or for a metrics endpoint of the application.
+    """
+
+    def __init__(self):
+        self.snapshots: list[MetricsSnapshot] = []
+
+    @property
+    def last(self) -> MetricsSnapshot | None:
+        return self.snapshots[-1] if self.snapshots else None
+
+    def emit(self, snapshot: MetricsSnapshot) -> None:
+        self.snapshots.append(snapshot)
+
+
+class LoggingSink:
+    """
+    Logs one line per function and cache.
+    """
+
+    def __init__(self, target: logging.Logger | None = None, level: int = logging.INFO):
+        self.target = target if target is not None else logger
+        self.level = level
+
+    def emit(self, snapshot: MetricsSnapshot) -> None:
+        for (function, label), histogram in sorted(snapshot.histograms.items()):
+            self.target.log(
+                self.level,
+                "%s%s: %d calls, %.3f ms total, %.2f µs mean",
+                function,
+                f"({label})" if label else "",
+                histogram.calls,
+                histogram.total * 1e3,
+                histogram.mean * 1e6,
+            )
+        for cache, statistics in sorted(snapshot.caches.items()):
+            self.target.log(
+                self.level,
+                "%s cache: %d hits, %d misses, %.1f%% hit ratio",
+                cache,
+                statistics.hits,
+                statistics.misses,
+                statistics.hit_ratio * 100,
+            )
+
+
+def _metric_name(function: str) -> str:
+    return function.replace(".", "_")
+
+
+def prometheus_text(snapshot: MetricsSnapshot) -> str:
+    """
+    Formats the snapshot in the Prometheus text exposition format.
+    """
+    lines = [
+        "# HELP simrail_sdk_call_duration_seconds Latency of instrumented SDK functions.",
+        "# TYPE simrail_sdk_call_duration_seconds histogram",
+    ]
+    for (function, label), histogram in sorted(snapshot.histograms.items()):
+        labels = f'function="{_metric_name(function)}",fields="{label}"'
+        for bound, calls in histogram.cumulative():
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'simrail_sdk_call_duration_seconds_bucket{{{labels},le="{le}"}} {calls}')
+        lines.append(f"simrail_sdk_call_duration_seconds_sum{{{labels}}} {histogram.total!r}")
+        lines.append(f"simrail_sdk_call_duration_seconds_count{{{labels}}} {histogram.calls}")
+    for kind in ("hits", "misses"):
+        lines.append(f"# HELP simrail_sdk_cache_{kind}_total Cache {kind} of SDK caches.")
+        lines.append(f"# TYPE simrail_sdk_cache_{kind}_total counter")
+        for cache, statistics in sorted(snapshot.caches.items()):
+            lines.append(f'simrail_sdk_cache_{kind}_total{{cache="{cache}"}} {getattr(statistics, kind)}')
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusFileSink:
+    """
+    Writes the metrics in the Prometheus text format, e.g. for the textfile collector of node_exporter.
+    The file is replaced atomically, so the collector never reads a partial file.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = pathlib.Path(path)
+
+    def emit(self, snapshot: MetricsSnapshot) -> None:
+        descriptor, temporary = tempfile.mkstemp(suffix=".prom", dir=self.path.parent)
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                file.write(prometheus_text(snapshot))
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+CACHES: dict[str, typing.Callable[[], typing.Any]] = {
+    "printable_name": stations.short_name_cache_info,
+}
+"""
+Functions returning the `functools.lru_cache` statistics of caches reported with their hit ratios,
+e.g. `some_cached_function.cache_info`. Add other caches of the application as needed.
+"""
+
+
+class Instrumentation:
+    """
+    Measures `station_registry.filter`, `Station.branch_off_points` and `Station.printable_name`.
+
+    While disabled, the functions are the original ones, so there's no overhead at all.
+    Enabling wraps them with timers recording into the latency histograms; only one instance can be enabled at a time.
+    Histograms of `filter` are labelled with the fields filtered by, to tell index lookups from scans.
+    Call `flush` to send the current metrics to the sinks, e.g. from a periodic task.
+    """
+
+    _enabled: typing.ClassVar[Instrumentation | None] = None
+
+    def __init__(self, sinks: typing.Iterable[Sink] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.sinks = list(sinks)
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+        self._histograms_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return Instrumentation._enabled is self
+
+    def _histogram(self, function: str, label: str = "") -> Histogram:
+        key = (function, label)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._histograms_lock:
+                histogram = self._histograms.setdefault(key, Histogram(self.buckets))
+        return histogram
+
+    def _timed_filter(self, filter_: typing.Callable) -> typing.Callable:
+        clock = time.perf_counter
+
+        @functools.wraps(filter_)
+        def timed(**fields_and_values):
+            start = clock()
+            try:
+                return filter_(**fields_and_values)
+            finally:
+                self._histogram("station_registry.filter", ",".join(sorted(fields_and_values))).observe(
+                    clock() - start
+                )
+
+        return timed
+
+    def _timed_property(self, name: str, original: property) -> property:
+        histogram = self._histogram(f"Station.{name}")
+        getter = original.fget
+        clock = time.perf_counter
+
+        @functools.wraps(getter)
+        def timed(station):
+            start = clock()
+            try:
+                return getter(station)
+            finally:
+                histogram.observe(clock() - start)
+
+        return property(timed, doc=original.__doc__)
+
+    def enable(self) -> Instrumentation:
+        if Instrumentation._enabled is not None:
+            raise RuntimeError("Instrumentation is already enabled")
+        Instrumentation._enabled = self
+        registry = stations.station_registry
+        # An instance attribute takes precedence over the method; deleting it restores the method
+        registry.filter = self._timed_filter(registry.filter)
+        for name in ("branch_off_points", "printable_name"):
+            setattr(stations.Station, name, self._timed_property(name, getattr(stations.Station, name)))
+        return self
+
+    def disable(self) -> None:
+        if not self.enabled:
+            return
+        del stations.station_registry.filter
+        for name in ("branch_off_points", "printable_name"):
+            delattr(stations.Station, name)
+        Instrumentation._enabled = None
+
+    def __enter__(self) -> Instrumentation:
+        return self.enable()
+
+    def __exit__(self, *exc_info) -> None:
+        self.disable()
+
+    def snapshot(self) -> MetricsSnapshot:
+        return MetricsSnapshot(
+            histograms={key: histogram.snapshot() for key, histogram in list(self._histograms.items())},
+            caches={
+                name: CacheStatistics(info.hits, info.misses, info.currsize)
+                for name, info in ((name, cache_info()) for name, cache_info in CACHES.items())
+            },
+        )
+
+    def flush(self) -> MetricsSnapshot:
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink.emit(snapshot)
+        return snapshot
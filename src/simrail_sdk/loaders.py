@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import csv
+import decimal
+import functools
+import logging
+import os
+import typing
+
+from simrail_sdk import enums, registry, stations
+
+logger = logging.getLogger(__name__)
+
+
+class LoaderError(ValueError):
+    pass
+
+
+class DataSource(typing.Protocol):
+    """
+    Anything producing station rows, one mapping of field names to raw values per station.
+    """
+
+    def rows(self) -> typing.Iterator[typing.Mapping[str, typing.Any]]: ...
+
+
+class CsvSource:
+    """
+    Stations in a CSV file with a header row, read one row at a time.
+
+    Column names are the `Station` field names. List fields are separated with `;`
+    and mileage is written as `line:km` pairs, e.g. `62:13.755;8:267.778`.
+    `belongs_to` holds the name of the station. Empty cells mean the default value.
+    """
+
+    def __init__(self, path: str | os.PathLike, delimiter: str = ","):
+        self.path = path
+        self.delimiter = delimiter
+
+    def rows(self) -> typing.Iterator[dict[str, str]]:
+        with open(self.path, newline="", encoding="utf-8") as file:
+            yield from csv.DictReader(file, delimiter=self.delimiter)
+
+
+class YamlSource:
+    """
+    Stations in a YAML file, either as a single list or as one document per station.
+    Mappings and lists are written as such, `belongs_to` holds the name of the station.
+
+    Requires PyYAML, which is not a dependency of the SDK.
+    Documents are read one at a time, so a file with one document per station is streamed.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = path
+
+    def rows(self) -> typing.Iterator[dict[str, typing.Any]]:
+        try:
+            import yaml
+        except ImportError as error:
+            raise LoaderError("Loading YAML requires PyYAML: pip install pyyaml") from error
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(self.path, encoding="utf-8") as file:
+            for document in yaml.load_all(file, Loader=loader):
+                if document is None:
+                    continue
+                if isinstance(document, list):
+                    yield from document
+                else:
+                    yield document
+
+
+_BOOLEANS = {"1": True, "true": True, "yes": True, "0": False, "false": False, "no": False}
+
+
+def _boolean(value: typing.Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    # Most cells are spelled exactly like a key, the lookup on the raw text spares the normalisation
+    result = _BOOLEANS.get(value) if isinstance(value, str) else None
+    if result is not None:
+        return result
+    try:
+        return _BOOLEANS[str(value).strip().lower()]
+    except KeyError:
+        raise ValueError(f"Not a boolean: {value!r}") from None
+
+
+def _split(value: typing.Any) -> list:
+    if isinstance(value, list):
+        return value
+    return [item.strip() for item in str(value).split(";") if item.strip()]
+
+
+def _enum_list(enum: type) -> typing.Callable[[typing.Any], list]:
+    # The same few combinations repeat across rows, so parsed values are cached by their raw text
+    @functools.lru_cache(maxsize=1024)
+    def parse(value: str) -> tuple:
+        return tuple(enum(item) for item in _split(value))
+
+    def convert(value: typing.Any) -> list:
+        if isinstance(value, list):
+            return [enum(item) for item in value]
+        return list(parse(value))
+
+    return convert
+
+
+def _decimal(value: typing.Any) -> decimal.Decimal:
+    # Decimal() ignores surrounding whitespace itself.
+    # Floats from YAML go through str() so that 50.1 doesn't become 50.10000000000000142...
+    return decimal.Decimal(value if isinstance(value, str) else str(value))
+
+
+def _mileage(value: typing.Any) -> dict[int, decimal.Decimal]:
+    if isinstance(value, dict):
+        return {int(line): _decimal(km) for line, km in value.items()}
+    # Unlike channels and station types, mileage is different for every station, so it's parsed without a cache
+    mileage = {}
+    for item in value.split(";"):
+        if item:
+            line, km = item.split(":", 1)
+            mileage[int(line)] = decimal.Decimal(km)
+    return mileage
+
+
+_CONVERTERS: dict[str, typing.Callable[[typing.Any], typing.Any]] = {
+    "name": str,
+    "abbreviation": str,
+    "lat": _decimal,
+    "lon": _decimal,
+    "mileage": _mileage,
+    "radio_channels": _enum_list(enums.RadioChannel),
+    "station_types": _enum_list(enums.StationType),
+    "remote_control_facilities": _boolean,
+    "remotely_controlled_from": str,
+    "remote_control_with_optional_local_control": _boolean,
+    "shp": _boolean,
+    "radio_recording": _boolean,
+    "belongs_to": str,
+    "skippable": _boolean,
+    "short_name": str,
+}
+
+_REQUIRED = ("name", "lat", "lon", "mileage")
+
+
+def _defaults() -> dict[str, typing.Any]:
+    return {
+        name: field.get_default(call_default_factory=True)
+        for name, field in stations.Station.model_fields.items()
+        if not field.is_required()
+    }
+
+
+@functools.lru_cache(maxsize=64)
+def _converters(keys: tuple[str, ...]) -> tuple[tuple[str, typing.Callable[[typing.Any], typing.Any]], ...]:
+    # Rows of one source share their keys, so each set of columns is looked up once, not each field of each row
+    unknown = [key for key in keys if key not in _CONVERTERS]
+    if unknown:
+        raise ValueError(f"Unknown field {unknown[0]!r}")
+    return tuple((key, _CONVERTERS[key]) for key in keys)
+
+
+def _convert(row: typing.Mapping[str, typing.Any], defaults: dict[str, typing.Any]) -> dict[str, typing.Any]:
+    fields = dict(defaults)
+    for key, converter in _converters(tuple(row)):
+        value = row[key]
+        if value is None or value == "":
+            continue
+        fields[key] = converter(value)
+    missing = [key for key in _REQUIRED if key not in fields]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}")
+    # Mutable defaults must not be shared between stations
+    if "radio_channels" not in fields:
+        fields["radio_channels"] = []
+    if fields["station_types"] is defaults["station_types"]:
+        fields["station_types"] = list(defaults["station_types"])
+    return fields
+
+
+def _load(source: DataSource, target_registry: registry.SnapshotRegistry) -> list[stations.Station]:
+    defaults = _defaults()
+    # Every field is set by _convert, so copies of this station hold nothing of it.
+    # A copy is cheaper than model_construct, which walks the fields of the model for each station
+    template = stations.Station.model_construct(
+        set(stations.Station.model_fields),
+        **{**defaults, "belongs_to": None},
+        name="",
+        lat=decimal.Decimal(0),
+        lon=decimal.Decimal(0),
+        mileage={},
+        radio_channels=[],
+    )
+    existing = {station.name for station in target_registry.all()}
+    loaded: list[stations.Station] = []
+    parents: list[tuple[stations.Station, str]] = []
+    by_name: dict[str, stations.Station] = {}
+    for number, row in enumerate(source.rows(), start=1):
+        try:
+            fields = _convert(row, defaults)
+        except (ValueError, decimal.InvalidOperation) as error:
+            raise LoaderError(f"Row {number}: {error}") from error
+        parent, fields["belongs_to"] = fields["belongs_to"], None
+        # Rows are checked by the converters above, so the (slow) pydantic validation is skipped
+        station = template.model_copy(update=fields)
+        if station.name in by_name or station.name in existing:
+            raise LoaderError(f"Row {number}: station {station.name!r} already exists")
+        by_name[station.name] = station
+        loaded.append(station)
+        if parent is not None:
+            parents.append((station, parent))
+
+    for station, parent in parents:
+        resolved = by_name.get(parent)
+        if resolved is None:
+            matches = list(target_registry.filter(name=parent))
+            if len(matches) != 1:
+                raise LoaderError(f"{station.name} belongs to {parent!r}, which matches {len(matches)} stations")
+            resolved = matches[0]
+        station.belongs_to = resolved
+    return loaded
+
+
+def load(
+    source: DataSource,
+    target_registry: registry.SnapshotRegistry | None = None,
+) -> list[stations.Station]:
+    """
+    Loads stations from the source and registers them, in `station_registry` by default.
+
+    Rows are converted one at a time as they are read. `belongs_to` is resolved in a second pass,
+    against the loaded stations first and the registry second, so rows may refer to stations further down the file.
+    Stations are added to the registry at once, after the whole source has been read,
+    so a failing file leaves the registry untouched.
+    """
+    if target_registry is None:
+        target_registry = stations.station_registry
+
+    loaded = _load(source, target_registry)
+    target_registry.register_many(loaded)
+    logger.info("Loaded %d stations", len(loaded))
+    return loaded
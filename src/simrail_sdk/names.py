@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import functools
+import logging
+import typing
+
+from simrail_sdk import stations
+
+logger = logging.getLogger(__name__)
+
+
+SHORT_NAME_REPLACEMENTS: tuple[tuple[str, str], ...] = (
+    ("Dąbrowa Górnicza", "Dąbr. G."),
+    ("Dąbrowa Górn.", "Dąbr. G."),
+    ("Warszawa", "Wwa"),
+    ("Katowice", "Kat."),
+    ("KATOWICE", "Kat."),
+    ("Sosnowiec", "Sosn."),
+    ("Główny", "Gł."),
+    ("Główna", "Gł."),
+    ("Towarowa", "Tow."),
+    ("Towarowy", "Tow."),
+    ("Południowe", "Płd."),
+    ("Południowy", "Płd."),
+    ("Południowa", "Płd."),
+    ("Północ", "Płn."),
+    ("Północny", "Płn."),
+    ("Północna", "Płn."),
+    ("Wschodnia", "Wsch."),
+    ("Wschodni", "Wsch."),
+    ("Zachodnia", "Zach."),
+    ("Zachodni", "Zach."),
+    ("Mazowiecki", "Maz."),
+    ("Grodzisk", "Grodz."),
+    ("Ząbkowice", "Ząbk."),
+    ("Strzemieszyce", "Strzem."),
+    ("Muchowiec", "Much."),
+    ("MUCHOWIEC", "Much."),
+    ("Szopienice", "Szop."),
+    ("Niedźwiadek", "Niedź."),
+    ("Miasto", "M."),
+)
+"""
+Replacements applied one by one, in this order, until the name fits.
+Keys are whole words or sequences of words.
+"""
+
+
+class Measure(typing.Protocol):
+    def __call__(self, text: str) -> float: ...
+
+
+def characters(text: str) -> float:
+    """
+    Width of the text in characters.
+    """
+    return len(text)
+
+
+class Points:
+    """
+    Width of the text in points, for a font with the given average glyph widths (in em) and size.
+
+    Instances are hashable, so that they can be part of the memoization key.
+    """
+
+    def __init__(self, font_size: float, widths: dict[str, float] | None = None, default_width: float = 0.55):
+        self.font_size = font_size
+        self.widths = dict(widths or {})
+        self.default_width = default_width
+        self._key = (font_size, tuple(sorted(self.widths.items())), default_width)
+
+    def __call__(self, text: str) -> float:
+        widths, default = self.widths, self.default_width
+        return sum(widths.get(char, default) for char in text) * self.font_size
+
+    def __hash__(self) -> int:
+        return hash(self._key)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Points) and self._key == other._key
+
+
+def _replace(name: str, phrase: str, replacement: str) -> str:
+    words = name.split()
+    phrase_words = phrase.split()
+    size = len(phrase_words)
+    index = 0
+    while index <= len(words) - size:
+        if words[index : index + size] == phrase_words:
+            words[index : index + size] = [replacement]
+        index += 1
+    return " ".join(words)
+
+
+def _truncate(name: str, width: float, measure: Measure) -> str:
+    while name and measure(name + ".") > width:
+        name = name[:-1].rstrip(" .")
+    return name + "." if name else ""
+
+
+@functools.lru_cache(maxsize=8192)
+def fit(station: stations.Station, width: float, measure: Measure = characters) -> str:
+    """
+    Returns the name of the station shortened to fit the width.
+
+    Starts with the full name, then the hand-written `short_name` if there is one,
+    then applies `SHORT_NAME_REPLACEMENTS` one at a time. If nothing fits, the shortest name is truncated.
+    Results are memoized per (station, width, measure), evicting the least recently used ones.
+    """
+    if measure(station.name) <= width:
+        return station.name
+    if station.short_name and measure(station.short_name) <= width:
+        return station.short_name
+
+    name = station.name
+    for phrase, replacement in SHORT_NAME_REPLACEMENTS:
+        shortened = _replace(name, phrase, replacement)
+        if shortened == name:
+            continue
+        name = shortened
+        if measure(name) <= width:
+            return name
+
+    if station.short_name and measure(station.short_name) < measure(name):
+        name = station.short_name
+    logger.debug("%s doesn't fit in %s even when shortened, truncating", station.name, width)
+    return _truncate(name, width, measure)
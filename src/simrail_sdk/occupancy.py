@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import heapq
+import logging
+import typing
+
+from simrail_sdk import enums, sections, stations
+
+logger = logging.getLogger(__name__)
+
+
+class TrainPosition(typing.NamedTuple):
+    """
+    Position of a train reported by a server.
+    If `rear_km` is given, the train occupies everything between `rear_km` and `km`.
+    """
+
+    server: str
+    train: str
+    line: int
+    km: float
+    rear_km: float | None = None
+
+
+class Block(typing.NamedTuple):
+    """
+    Part of a line section between two consecutive block posts (or the section boundaries).
+    """
+
+    line: int
+    index: int
+    start: stations.Station
+    end: stations.Station
+    section: sections.LineSection
+
+
+class Conflict(typing.NamedTuple):
+    server: str
+    block: Block
+    trains: tuple[str, str]
+
+
+class BlockTable:
+    """
+    Blocks of each line, sorted by mileage.
+    """
+
+    def __init__(self, section_table: sections.LineSectionTable):
+        self.blocks: dict[int, list[Block]] = {}
+        self._starts: dict[int, list[float]] = {}
+        self._ends: dict[int, list[float]] = {}
+        for line, line_sections in section_table.sections.items():
+            blocks = []
+            for section in line_sections:
+                posts = [
+                    section.start,
+                    *(
+                        station
+                        for station in section.intermediate
+                        if enums.StationType.BLOCK_POST in station.station_types
+                    ),
+                    section.end,
+                ]
+                for start, end in zip(posts, posts[1:]):
+                    blocks.append(Block(line, len(blocks), start, end, section))
+            self.blocks[line] = blocks
+            self._starts[line] = [float(block.start.mileage[line]) for block in blocks]
+            self._ends[line] = [float(block.end.mileage[line]) for block in blocks]
+
+    def block_index(self, line: int, km: float) -> int | None:
+        starts = self._starts.get(line)
+        if not starts:
+            return None
+        index = bisect.bisect_right(starts, km) - 1
+        if index < 0 or km > self._ends[line][index]:
+            return None
+        return index
+
+    def block_at(self, line: int, km: float) -> Block | None:
+        index = self.block_index(line, km)
+        return None if index is None else self.blocks[line][index]
+
+
+class _Occupancy(typing.NamedTuple):
+    low_km: float
+    train: str
+    high_km: float
+    first_block: int | None
+    last_block: int | None
+
+
+class OccupancyTracker:
+    """
+    Occupancy of blocks and line sections by trains, across any number of servers.
+
+    Each server keeps, per line, the trains sorted by their lowest km.
+    A position update moves a single entry within that sorted list,
+    and conflicts are found with a sweep over it instead of comparing every pair of trains.
+    Trains standing outside all blocks (e.g. beyond the last station of a line) are tracked but never conflict.
+    """
+
+    def __init__(self, section_table: sections.LineSectionTable | None = None):
+        if section_table is None:
+            section_table = sections.LineSectionTable()
+        self.block_table = BlockTable(section_table)
+        self._by_line: dict[str, dict[int, list[_Occupancy]]] = collections.defaultdict(dict)
+        self._positions: dict[tuple[str, str], tuple[int, _Occupancy]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def update(self, position: TrainPosition) -> None:
+        """
+        Records the latest position of a train, replacing the previous one.
+        """
+        self.remove(position.server, position.train)
+        low, high = sorted((float(position.km), float(position.km if position.rear_km is None else position.rear_km)))
+        occupancy = _Occupancy(
+            low,
+            position.train,
+            high,
+            self.block_table.block_index(position.line, low),
+            self.block_table.block_index(position.line, high),
+        )
+        on_line = self._by_line[position.server].setdefault(position.line, [])
+        bisect.insort(on_line, occupancy)
+        self._positions[(position.server, position.train)] = (position.line, occupancy)
+
+    def update_many(self, positions: typing.Iterable[TrainPosition]) -> None:
+        for position in positions:
+            self.update(position)
+
+    def remove(self, server: str, train: str) -> None:
+        """
+        Forgets the train, e.g. when it leaves the server. Unknown trains are ignored.
+        """
+        previous = self._positions.pop((server, train), None)
+        if previous is None:
+            return
+        line, occupancy = previous
+        on_line = self._by_line[server][line]
+        del on_line[bisect.bisect_left(on_line, occupancy)]
+
+    def _blocks_of(self, line: int, occupancy: _Occupancy) -> list[Block]:
+        if occupancy.first_block is None or occupancy.last_block is None:
+            block = occupancy.first_block if occupancy.last_block is None else occupancy.last_block
+            return [] if block is None else [self.block_table.blocks[line][block]]
+        return self.block_table.blocks[line][occupancy.first_block : occupancy.last_block + 1]
+
+    def occupied_blocks(self, server: str) -> dict[Block, set[str]]:
+        """
+        Returns the trains in each occupied block of the server.
+        """
+        occupied = collections.defaultdict(set)
+        for line, on_line in self._by_line.get(server, {}).items():
+            for occupancy in on_line:
+                for block in self._blocks_of(line, occupancy):
+                    occupied[block].add(occupancy.train)
+        return dict(occupied)
+
+    def occupied_sections(self, server: str) -> dict[sections.LineSection, set[str]]:
+        """
+        Returns the trains in each occupied line section of the server.
+        """
+        occupied = collections.defaultdict(set)
+        for block, trains in self.occupied_blocks(server).items():
+            occupied[block.section].update(trains)
+        return dict(occupied)
+
+    def conflicts(self, server: str | None = None) -> list[Conflict]:
+        """
+        Returns every pair of trains sharing a block, on one server or on all servers.
+
+        Runs in O(n log n + k) per line for n trains and k conflicts:
+        trains are swept in mileage order, keeping a heap of those still inside the current block range.
+        """
+        servers = [server] if server is not None else list(self._by_line)
+        found = []
+        for current_server in servers:
+            for line, on_line in self._by_line.get(current_server, {}).items():
+                blocks = self.block_table.blocks.get(line, [])
+                active = []
+                for occupancy in on_line:
+                    first = occupancy.first_block if occupancy.first_block is not None else occupancy.last_block
+                    last = occupancy.last_block if occupancy.last_block is not None else occupancy.first_block
+                    if first is None:
+                        continue
+                    while active and active[0][0] < first:
+                        heapq.heappop(active)
+                    for _, other in active:
+                        found.append(Conflict(current_server, blocks[first], (other, occupancy.train)))
+                    heapq.heappush(active, (last, occupancy.train))
+        return found
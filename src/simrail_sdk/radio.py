@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import decimal
+import functools
+import logging
+import typing
+
+from simrail_sdk import enums, stations
+
+logger = logging.getLogger(__name__)
+
+
+class ChannelInterval(typing.NamedTuple):
+    """
+    A stretch of a line worked on a single radio channel,
+    from the first to the last station using it.
+    """
+
+    line: int
+    start_km: float
+    end_km: float
+    channel: enums.RadioChannel
+    first: stations.Station
+    last: stations.Station
+
+
+class RouteLeg(typing.NamedTuple):
+    """
+    Part of a route travelled along a single line, from `start_km` to `end_km`.
+    `end_km` lower than `start_km` means travelling against the mileage.
+    """
+
+    line: int
+    start_km: float
+    end_km: float
+
+    @classmethod
+    def between(cls, line: int, origin: stations.Station, destination: stations.Station) -> RouteLeg:
+        return cls(line, float(origin.mileage[line]), float(destination.mileage[line]))
+
+
+class ChannelChange(typing.NamedTuple):
+    """
+    The point where the driver has to switch to `channel`.
+    The first change of a route is the channel to use at departure.
+    """
+
+    line: int
+    km: float
+    channel: enums.RadioChannel
+    station: stations.Station | None
+    """
+    The first station using the channel in the direction of travel,
+    or None if the route starts in the middle of the interval, past that station
+    """
+
+
+class RadioChannelMap:
+    """
+    Radio channels along each line, derived once from the stations' `radio_channels`.
+
+    Consecutive stations along a line are merged into one interval for as long as they share a channel.
+    Stations without radio channels (halts etc.) don't affect the map.
+    Changes along a route are cached per route.
+    """
+
+    def __init__(
+        self,
+        station_list: typing.Iterable[stations.Station] | None = None,
+        cache_size: int | None = 1024,
+    ):
+        if station_list is None:
+            station_list = stations.station_registry.all()
+
+        by_line = collections.defaultdict(list)
+        for station in station_list:
+            if not station.radio_channels:
+                continue
+            for line, km in station.mileage.items():
+                by_line[line].append((float(km), station.name, station))
+
+        self.intervals: dict[int, list[ChannelInterval]] = {}
+        self._starts: dict[int, list[float]] = {}
+        for line, on_line in sorted(by_line.items()):
+            on_line.sort(key=lambda item: (item[0], item[1]))
+            self.intervals[line] = self._merge(line, on_line)
+            self._starts[line] = [interval.start_km for interval in self.intervals[line]]
+
+        self._cached_channel_changes = functools.lru_cache(maxsize=cache_size)(self._channel_changes)
+
+    @staticmethod
+    def _merge(line: int, on_line: list[tuple[float, str, stations.Station]]) -> list[ChannelInterval]:
+        intervals = []
+        start_km, _, first = on_line[0]
+        shared = set(first.radio_channels)
+        last = first
+        end_km = start_km
+        for km, _, station in on_line[1:]:
+            remaining = shared.intersection(station.radio_channels)
+            if remaining:
+                shared, last, end_km = remaining, station, km
+                continue
+            intervals.append(ChannelInterval(line, start_km, end_km, min(shared, key=lambda c: c.value), first, last))
+            start_km, end_km, first, last = km, km, station, station
+            shared = set(station.radio_channels)
+        intervals.append(ChannelInterval(line, start_km, end_km, min(shared, key=lambda c: c.value), first, last))
+        return intervals
+
+    def channel_at(self, line: int, km: float | decimal.Decimal) -> enums.RadioChannel | None:
+        """
+        Returns the channel used at the position.
+        Between two intervals either channel may be in use, so None is returned.
+        """
+        starts = self._starts.get(line)
+        if not starts:
+            return None
+        km = float(km)
+        index = bisect.bisect_right(starts, km) - 1
+        if index < 0:
+            return None
+        interval = self.intervals[line][index]
+        return interval.channel if km <= interval.end_km else None
+
+    def _channel_changes(self, route: tuple[RouteLeg, ...]) -> tuple[ChannelChange, ...]:
+        changes = []
+        current = None
+        for leg in route:
+            intervals = self.intervals.get(leg.line, [])
+            low, high = sorted((leg.start_km, leg.end_km))
+            # Only intervals overlapping the leg, found with a binary search on both ends
+            first = max(bisect.bisect_right(self._starts.get(leg.line, []), low) - 1, 0)
+            last = bisect.bisect_right(self._starts.get(leg.line, []), high)
+            on_leg = [interval for interval in intervals[first:last] if interval.end_km >= low]
+            forward = leg.end_km >= leg.start_km
+            if not forward:
+                on_leg.reverse()
+            for interval in on_leg:
+                if interval.channel == current:
+                    continue
+                current = interval.channel
+                # A leg starting inside the interval has already passed its first station
+                if forward:
+                    km = max(interval.start_km, low)
+                    station = interval.first if km == interval.start_km else None
+                else:
+                    km = min(interval.end_km, high)
+                    station = interval.last if km == interval.end_km else None
+                changes.append(ChannelChange(leg.line, km, current, station))
+        return tuple(changes)
+
+    def channel_changes(self, route: typing.Iterable[RouteLeg]) -> tuple[ChannelChange, ...]:
+        """
+        Returns the channel changes along the route, in the order of travel, computed in one pass over the legs.
+
+        The change to a channel is placed at the first station using it in the direction of travel.
+        The first change is the channel used at departure, placed at the start of the route without a station
+        if the route starts in the middle of an interval.
+        """
+        return self._cached_channel_changes(tuple(route))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+import typing
+
+import simpleregistry
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot(typing.NamedTuple):
+    members: frozenset
+    indexes: dict[str, dict[typing.Any, frozenset]]
+    """
+    Members by indexed value, by index
+    """
+
+
+class SnapshotRegistry(simpleregistry.Registry):
+    """
+    A registry safe to read from any number of threads while members are being registered.
+
+    Members and indexes are kept in an immutable snapshot. Publishing builds a new snapshot next to the current one
+    and replaces it with a single assignment, so readers always see a consistent registry.
+    Single registrations are queued and published together by the next read or `register_many`,
+    so defining stations one by one builds one snapshot, not one per station.
+    Writers are serialized by a lock, readers only take it to publish queued members.
+    Only single-field indexes are supported.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        check_type: bool = True,
+        allow_subclasses: bool = True,
+        allow_polymorphism: bool = False,
+        indexes: set[simpleregistry.Index] | None = None,
+    ):
+        self._write_lock = threading.Lock()
+        self._pending: list = []
+        self._snapshot = Snapshot(frozenset(), {})
+        super().__init__(name, check_type, allow_subclasses, allow_polymorphism, indexes)
+        for index in self.indexes.values():
+            if len(index.fields) != 1:
+                raise ValueError(f"Only single-field indexes are supported, got {index}")
+        self._snapshot = Snapshot(frozenset(), {pk: {} for pk in self.indexes})
+
+    @property
+    def snapshot(self) -> Snapshot:
+        if self._pending:
+            with self._write_lock:
+                self._publish()
+        return self._snapshot
+
+    @property
+    def members(self) -> frozenset:
+        return self.snapshot.members
+
+    @members.setter
+    def members(self, members: typing.Iterable) -> None:
+        # Used by Registry.__init__ and Registry.clear
+        with self._write_lock:
+            self._pending = []
+            self._snapshot = Snapshot(frozenset(), {pk: {} for pk in self._snapshot.indexes})
+        self.register_many(members)
+
+    def _check_types(self, members: list) -> None:
+        if self.check_type:
+            allowed = tuple(self.types_registered)
+            for member in members:
+                if not isinstance(member, allowed):
+                    raise simpleregistry.exceptions.TypeNotAllowed(
+                        f"{type(member).__name__} is not registered with {self.name} registry."
+                    )
+
+    def _publish(self) -> None:
+        # Called with the write lock held
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        current = self._snapshot
+        added = [member for member in dict.fromkeys(pending) if member not in current.members]
+        if not added:
+            return
+        indexes = {}
+        for pk, values in current.indexes.items():
+            (field,) = self.indexes[pk].fields
+            groups = collections.defaultdict(list)
+            for member in added:
+                groups[getattr(member, field)].append(member)
+            # Unchanged buckets are shared with the previous snapshot
+            values = dict(values)
+            for value, group in groups.items():
+                values[value] = values.get(value, frozenset()).union(group)
+            indexes[pk] = values
+        self._snapshot = Snapshot(current.members.union(added), indexes)
+
+    def register(self, member) -> None:
+        """
+        Queues the member, it's published by the next read.
+        """
+        self._check_types([member])
+        with self._write_lock:
+            self._pending.append(member)
+
+    def register_many(self, members: typing.Iterable) -> None:
+        """
+        Registers all the members at once, with a single new snapshot.
+        """
+        members = list(members)
+        self._check_types(members)
+        with self._write_lock:
+            self._pending.extend(members)
+            self._publish()
+
+    def all(self) -> set:
+        return set(self.members)
+
+    def _filter_from_index(self, fields_and_values: dict[str, typing.Any]) -> frozenset:
+        ((field, value),) = fields_and_values.items()
+        return self.snapshot.indexes[field].get(value, frozenset())
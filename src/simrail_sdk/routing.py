@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import collections
+import heapq
+import itertools
+import logging
+import math
+import typing
+
+from simrail_sdk import chainage, sections, stations
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TREE_CACHE_SIZE = 256
+"""
+Shortest-path trees kept by a `Network`, one per destination and set of closures
+"""
+
+EdgeKey = tuple[int, int, int]
+"""
+Both ends of an edge (lowest node first) and its line
+"""
+
+
+class Route(typing.NamedTuple):
+    length: float
+    """
+    Total length, in km
+    """
+    stations: tuple[stations.Station, ...]
+    lines: tuple[int, ...]
+    """
+    Line of each leg
+    """
+
+
+class _Path(typing.NamedTuple):
+    length: float
+    nodes: tuple[int, ...]
+    lines: tuple[int, ...]
+    lengths: tuple[float, ...]
+    """
+    Length of each leg
+    """
+
+
+class _Tree(typing.NamedTuple):
+    """
+    Shortest paths from every node to one destination.
+    """
+
+    distances: dict[int, float]
+    next_hops: dict[int, tuple[int, int, float]]
+    """
+    Next node, line and leg length towards the destination
+    """
+
+
+def _edge_key(a: int, b: int, line: int) -> EdgeKey:
+    return (a, b, line) if a < b else (b, a, line)
+
+
+class Network:
+    """
+    The railway network of the catalogue: stations connected along each line in the order of their true chainage.
+    Branch off points are part of their stations, so routes don't detour through them and are loopless by station.
+
+    Shortest-path trees towards a destination are computed once per set of closed sections and reused by
+    all queries to that destination, both directly and as the heuristic guiding the searches of Yen's algorithm.
+    """
+
+    def __init__(
+        self,
+        station_list: typing.Iterable[stations.Station] | None = None,
+        chainage_model: chainage.Chainage | None = None,
+        tree_cache_size: int = DEFAULT_TREE_CACHE_SIZE,
+    ):
+        if station_list is None:
+            station_list = stations.station_registry.all()
+        # Sets of stations iterate in an order that changes between processes, so node ids, the order of the edges
+        # and with them the ties between routes of the same length are fixed by sorting
+        station_list = sorted(station_list, key=stations.sort_key)
+        if chainage_model is None:
+            chainage_model = chainage.Chainage(station_list)
+        self.stations: list[stations.Station] = [station for station in station_list if station.belongs_to is None]
+        self._nodes = {id(station): node for node, station in enumerate(self.stations)}
+        for station in station_list:
+            owner = station
+            while owner.belongs_to is not None:
+                owner = owner.belongs_to
+            if id(owner) in self._nodes:
+                self._nodes[id(station)] = self._nodes[id(owner)]
+        self.adjacency: list[list[tuple[int, int, float]]] = [[] for _ in self.stations]
+        """
+        Neighbours of each node, with the line and the length of the edge
+        """
+
+        by_line = collections.defaultdict(list)
+        for station in station_list:
+            if id(station) not in self._nodes:
+                continue
+            for line in station.mileage:
+                by_line[line].append((chainage_model.true_km(station, line), self._nodes[id(station)]))
+        for line, on_line in sorted(by_line.items()):
+            on_line.sort()
+            for (km_a, a), (km_b, b) in itertools.pairwise(on_line):
+                if a != b:
+                    self._connect(a, b, line, km_b - km_a)
+        for edges in self.adjacency:
+            edges.sort()
+
+        self._trees: collections.OrderedDict[tuple[int, frozenset[EdgeKey]], _Tree] = collections.OrderedDict()
+        self._tree_cache_size = tree_cache_size
+
+    def _connect(self, a: int, b: int, line: int, length: float) -> None:
+        self.adjacency[a].append((b, line, length))
+        self.adjacency[b].append((a, line, length))
+
+    def node(self, station: stations.Station) -> int:
+        try:
+            return self._nodes[id(station)]
+        except KeyError:
+            raise ValueError(f"{station.name} is not in the network") from None
+
+    def closed_edges(
+        self,
+        closed: typing.Iterable[sections.LineSection | tuple[int, stations.Station, stations.Station]],
+    ) -> frozenset[EdgeKey]:
+        """
+        Returns the edges of the closed line sections, or of (line, station, station) pairs of adjacent stations.
+        """
+        edges = set()
+        for closure in closed:
+            if isinstance(closure, sections.LineSection):
+                line = closure.line
+                members = {self.node(station) for station in [closure.start, *closure.intermediate, closure.end]}
+            else:
+                line, a, b = closure
+                members = {self.node(a), self.node(b)}
+            for node in members:
+                for neighbour, edge_line, _ in self.adjacency[node]:
+                    if edge_line == line and neighbour in members:
+                        edges.add(_edge_key(node, neighbour, line))
+        return frozenset(edges)
+
+    def _tree(self, destination: int, closed: frozenset[EdgeKey]) -> _Tree:
+        key = (destination, closed)
+        tree = self._trees.get(key)
+        if tree is not None:
+            self._trees.move_to_end(key)
+            return tree
+
+        distances = {destination: 0.0}
+        next_hops: dict[int, tuple[int, int, float]] = {}
+        queue = [(0.0, destination)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if distance > distances[node]:
+                continue
+            for neighbour, line, length in self.adjacency[node]:
+                if closed and _edge_key(node, neighbour, line) in closed:
+                    continue
+                candidate = distance + length
+                if candidate < distances.get(neighbour, math.inf):
+                    distances[neighbour] = candidate
+                    next_hops[neighbour] = (node, line, length)
+                    heapq.heappush(queue, (candidate, neighbour))
+
+        tree = self._trees[key] = _Tree(distances, next_hops)
+        if len(self._trees) > self._tree_cache_size:
+            self._trees.popitem(last=False)
+        return tree
+
+    @staticmethod
+    def _tree_path(
+        tree: _Tree,
+        source: int,
+        blocked_nodes: typing.Container[int] = (),
+        blocked_edges: typing.Container[EdgeKey] = (),
+    ) -> _Path | None:
+        """
+        Follows the tree from the source, or returns None if that runs into a blocked node or edge.
+        """
+        if source not in tree.distances:
+            return None
+        nodes, lines, lengths = [source], [], []
+        node = source
+        while node in tree.next_hops:
+            following, line, length = tree.next_hops[node]
+            if following in blocked_nodes or _edge_key(node, following, line) in blocked_edges:
+                return None
+            nodes.append(following)
+            lines.append(line)
+            lengths.append(length)
+            node = following
+        return _Path(tree.distances[source], tuple(nodes), tuple(lines), tuple(lengths))
+
+    def _search(
+        self,
+        tree: _Tree,
+        source: int,
+        destination: int,
+        blocked_nodes: typing.Container[int],
+        blocked_edges: typing.Container[EdgeKey],
+    ) -> _Path | None:
+        """
+        A* search using the distances of the tree as the heuristic.
+        They are exact without the blocked nodes and edges, so they can only underestimate with them.
+        """
+        heuristic = tree.distances
+        if source not in heuristic:
+            return None
+        best = {source: 0.0}
+        previous: dict[int, tuple[int, int, float]] = {}
+        queue = [(heuristic[source], 0.0, source)]
+        while queue:
+            _, distance, node = heapq.heappop(queue)
+            if node == destination:
+                break
+            if distance > best[node]:
+                continue
+            for neighbour, line, length in self.adjacency[node]:
+                if (
+                    neighbour in blocked_nodes
+                    or neighbour not in heuristic
+                    or _edge_key(node, neighbour, line) in blocked_edges
+                ):
+                    continue
+                candidate = distance + length
+                if candidate < best.get(neighbour, math.inf):
+                    best[neighbour] = candidate
+                    previous[neighbour] = (node, line, length)
+                    heapq.heappush(queue, (candidate + heuristic[neighbour], candidate, neighbour))
+        else:
+            return None
+
+        nodes, lines, lengths = [destination], [], []
+        node = destination
+        while node != source:
+            node, line, length = previous[node]
+            nodes.append(node)
+            lines.append(line)
+            lengths.append(length)
+        return _Path(best[destination], tuple(reversed(nodes)), tuple(reversed(lines)), tuple(reversed(lengths)))
+
+    def _route(self, path: _Path) -> Route:
+        return Route(path.length, tuple(self.stations[node] for node in path.nodes), path.lines)
+
+    def shortest_route(
+        self,
+        origin: stations.Station,
+        destination: stations.Station,
+        closed: typing.Iterable[sections.LineSection | tuple[int, stations.Station, stations.Station]] = (),
+    ) -> Route | None:
+        """
+        Returns the shortest route avoiding the closed sections, or None if there's none.
+        """
+        tree = self._tree(self.node(destination), self.closed_edges(closed))
+        path = self._tree_path(tree, self.node(origin))
+        return self._route(path) if path is not None else None
+
+    def distance(self, origin: stations.Station, destination: stations.Station) -> float:
+        """
+        Returns the length of the shortest route, or inf if there's none.
+
+        A plain Dijkstra search stopping at the destination, without closures or caching;
+        see `contraction.ContractionHierarchy` for bulk queries.
+        """
+        source, target = self.node(origin), self.node(destination)
+        best = {source: 0.0}
+        queue = [(0.0, source)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if node == target:
+                return distance
+            if distance > best[node]:
+                continue
+            for neighbour, _, length in self.adjacency[node]:
+                candidate = distance + length
+                if candidate < best.get(neighbour, math.inf):
+                    best[neighbour] = candidate
+                    heapq.heappush(queue, (candidate, neighbour))
+        return math.inf
+
+    def k_shortest_routes(
+        self,
+        origin: stations.Station,
+        destination: stations.Station,
+        k: int = 3,
+        closed: typing.Iterable[sections.LineSection | tuple[int, stations.Station, stations.Station]] = (),
+    ) -> list[Route]:
+        """
+        Returns up to `k` shortest loopless routes avoiding the closed sections, shortest first (Yen's algorithm).
+        """
+        closed_edges = self.closed_edges(closed)
+        source, target = self.node(origin), self.node(destination)
+        tree = self._tree(target, closed_edges)
+        first = self._tree_path(tree, source)
+        if first is None:
+            return []
+
+        found = [first]
+        seen = {(first.nodes, first.lines)}
+        candidates: list[tuple[float, int, _Path]] = []
+        counter = itertools.count()
+        while len(found) < k:
+            last = found[-1]
+            root_length = 0.0
+            for index in range(len(last.nodes) - 1):
+                spur = last.nodes[index]
+                root_nodes, root_lines = last.nodes[: index + 1], last.lines[:index]
+                blocked_edges = set(closed_edges)
+                for path in found:
+                    if path.nodes[: index + 1] == root_nodes and path.lines[:index] == root_lines:
+                        blocked_edges.add(_edge_key(path.nodes[index], path.nodes[index + 1], path.lines[index]))
+                blocked_nodes = set(root_nodes[:-1])
+
+                spur_path = self._tree_path(tree, spur, blocked_nodes, blocked_edges)
+                if spur_path is None:
+                    spur_path = self._search(tree, spur, target, blocked_nodes, blocked_edges)
+                if spur_path is not None:
+                    path = _Path(
+                        root_length + spur_path.length,
+                        root_nodes[:-1] + spur_path.nodes,
+                        root_lines + spur_path.lines,
+                        last.lengths[:index] + spur_path.lengths,
+                    )
+                    if (path.nodes, path.lines) not in seen:
+                        seen.add((path.nodes, path.lines))
+                        heapq.heappush(candidates, (path.length, next(counter), path))
+                root_length += last.lengths[index]
+            if not candidates:
+                break
+            found.append(heapq.heappop(candidates)[2])
+        return [self._route(path) for path in found]
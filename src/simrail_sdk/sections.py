@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import decimal
+import logging
+import typing
+
+from simrail_sdk import base, enums, stations
+
+logger = logging.getLogger(__name__)
+
+
+class LineSection(base.BasePydanticModel):
+    line: int
+    """
+    Line number
+    """
+
+    start: stations.Station
+    """
+    Line section boundary with the lower mileage
+    """
+
+    end: stations.Station
+    """
+    Line section boundary with the higher mileage
+    """
+
+    intermediate: list[stations.Station] = []
+    """
+    Block posts, halts etc. between the boundaries, ordered by mileage
+    """
+
+    class Config:
+        pk_fields = ["line", "start_km", "end_km"]
+
+    @property
+    def start_km(self) -> decimal.Decimal:
+        return self.start.mileage[self.line]
+
+    @property
+    def end_km(self) -> decimal.Decimal:
+        return self.end.mileage[self.line]
+
+    @property
+    def length(self) -> decimal.Decimal:
+        return self.end_km - self.start_km
+
+    @property
+    def block_posts(self) -> list[stations.Station]:
+        """
+        Block posts dividing the section into block sections.
+        """
+        return [station for station in self.intermediate if enums.StationType.BLOCK_POST in station.station_types]
+
+    def __str__(self) -> str:
+        return f"{self.line}: {self.start.name} - {self.end.name}"
+
+
+class LineSectionTable:
+    """
+    All line sections of the catalogue, built once from line membership and mileage.
+
+    Sections of each line are kept sorted by mileage,
+    so the section at a given position is found with a binary search.
+    """
+
+    def __init__(self, station_list: typing.Iterable[stations.Station] | None = None):
+        if station_list is None:
+            station_list = stations.station_registry.all()
+
+        by_line = collections.defaultdict(list)
+        for station in station_list:
+            for line, km in station.mileage.items():
+                by_line[line].append((km, station.name, station))
+
+        self.sections: dict[int, list[LineSection]] = {}
+        self._starts: dict[int, list[float]] = {}
+        self._ends: dict[int, list[float]] = {}
+        for line, on_line in sorted(by_line.items()):
+            on_line.sort(key=lambda item: (item[0], item[1]))
+            sections = []
+            start = None
+            intermediate = []
+            for _, _, station in on_line:
+                if not station.is_line_section_boundary:
+                    if start is not None:
+                        intermediate.append(station)
+                    continue
+                if start is not None:
+                    sections.append(LineSection(line=line, start=start, end=station, intermediate=intermediate))
+                start = station
+                intermediate = []
+            if not sections:
+                logger.debug("Line %d has no complete line sections", line)
+                continue
+            self.sections[line] = sections
+            self._starts[line] = [float(section.start_km) for section in sections]
+            self._ends[line] = [float(section.end_km) for section in sections]
+
+    def __iter__(self) -> typing.Iterator[LineSection]:
+        for sections in self.sections.values():
+            yield from sections
+
+    def __len__(self) -> int:
+        return sum(len(sections) for sections in self.sections.values())
+
+    def section_at(self, line: int, km: float | decimal.Decimal) -> LineSection | None:
+        """
+        Returns the line section containing the position, or None if it's outside all sections of the line.
+
+        A position exactly at a boundary belongs to the section starting there,
+        except for the end of the last section of the line.
+        """
+        starts = self._starts.get(line)
+        if not starts:
+            return None
+        km = float(km)
+        index = bisect.bisect_right(starts, km) - 1
+        if index < 0 or km > self._ends[line][index]:
+            return None
+        return self.sections[line][index]
+
+    def sections_between(
+        self, line: int, km_a: float | decimal.Decimal, km_b: float | decimal.Decimal
+    ) -> list[LineSection]:
+        """
+        Returns the sections of the line overlapping the stretch between the two positions, ordered by mileage.
+        """
+        starts = self._starts.get(line)
+        if not starts:
+            return []
+        low, high = sorted((float(km_a), float(km_b)))
+        if low == high:
+            section = self.section_at(line, low)
+            return [section] if section else []
+        first = max(bisect.bisect_right(starts, low) - 1, 0)
+        last = bisect.bisect_left(starts, high)
+        ends = self._ends[line]
+        return [self.sections[line][index] for index in range(first, last) if ends[index] > low]
+
+    def sections_of(self, station: stations.Station) -> list[LineSection]:
+        """
+        Returns the sections the station lies on, either as a boundary or as an intermediate station.
+        """
+        found = []
+        for line, km in station.mileage.items():
+            sections = self.sections.get(line, [])
+            index = bisect.bisect_left(self._ends.get(line, []), float(km))
+            while index < len(sections) and float(sections[index].start_km) <= km:
+                section = sections[index]
+                if station in (section.start, section.end) or station in section.intermediate:
+                    found.append(section)
+                index += 1
+        return found
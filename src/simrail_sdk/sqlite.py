@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import decimal
+import logging
+import os
+import pathlib
+import sqlite3
+import tempfile
+import typing
+
+from simrail_sdk import enums, stations
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE stations (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    abbreviation TEXT,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    remote_control_facilities INTEGER NOT NULL,
+    remotely_controlled_from TEXT,
+    remote_control_with_optional_local_control INTEGER NOT NULL,
+    shp INTEGER NOT NULL,
+    radio_recording INTEGER NOT NULL,
+    belongs_to INTEGER REFERENCES stations (id),
+    skippable INTEGER NOT NULL,
+    short_name TEXT
+);
+CREATE INDEX stations_name ON stations (name);
+CREATE INDEX stations_abbreviation ON stations (abbreviation);
+CREATE INDEX stations_belongs_to ON stations (belongs_to);
+
+CREATE TABLE mileage (
+    station_id INTEGER NOT NULL REFERENCES stations (id),
+    line INTEGER NOT NULL,
+    km REAL NOT NULL,
+    PRIMARY KEY (station_id, line)
+) WITHOUT ROWID;
+CREATE INDEX mileage_line_km ON mileage (line, km);
+
+CREATE TABLE station_types (
+    station_id INTEGER NOT NULL REFERENCES stations (id),
+    position INTEGER NOT NULL,
+    station_type TEXT NOT NULL,
+    PRIMARY KEY (station_id, position)
+) WITHOUT ROWID;
+
+CREATE TABLE radio_channels (
+    station_id INTEGER NOT NULL REFERENCES stations (id),
+    position INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    PRIMARY KEY (station_id, position)
+) WITHOUT ROWID;
+
+CREATE VIEW branch_off_points AS
+    SELECT belongs_to AS station_id, id AS branch_off_point_id FROM stations WHERE belongs_to IS NOT NULL;
+
+CREATE TABLE r307_ranges (
+    issuer_id INTEGER NOT NULL REFERENCES stations (id),
+    first INTEGER NOT NULL,
+    last INTEGER NOT NULL,
+    destination_id INTEGER NOT NULL REFERENCES stations (id)
+);
+CREATE INDEX r307_ranges_first ON r307_ranges (first, last);
+
+CREATE VIRTUAL TABLE stations_rtree USING rtree (id, min_lat, max_lat, min_lon, max_lon);
+
+CREATE VIRTUAL TABLE stations_fts USING fts5 (
+    name, short_name, content = 'stations', content_rowid = 'id', tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+"""
+Stations without real coordinates (0, 0 placeholders) are left out of `stations_rtree`.
+"""
+
+
+def _write(
+    connection: sqlite3.Connection,
+    station_list: list[stations.Station],
+    r307_issuers: dict[stations.Station, list[list]],
+) -> None:
+    # Station names are not guaranteed to be unique, so stations are keyed by identity
+    ids = {id(station): number for number, station in enumerate(station_list, start=1)}
+
+    def station_id(station: stations.Station) -> int:
+        try:
+            return ids[id(station)]
+        except KeyError:
+            raise ValueError(f"{station.name} is referenced, but not in the exported stations") from None
+
+    # executescript() would commit on its own, so the transaction is opened explicitly
+    connection.executescript("BEGIN;" + SCHEMA)
+    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    connection.executemany(
+        "INSERT INTO stations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                ids[id(station)],
+                station.name,
+                station.abbreviation,
+                float(station.lat),
+                float(station.lon),
+                station.remote_control_facilities,
+                station.remotely_controlled_from,
+                station.remote_control_with_optional_local_control,
+                station.shp,
+                station.radio_recording,
+                station_id(station.belongs_to) if station.belongs_to is not None else None,
+                station.skippable,
+                station.short_name,
+            )
+            for station in station_list
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO mileage VALUES (?, ?, ?)",
+        (
+            (ids[id(station)], line, float(km))
+            for station in station_list
+            for line, km in station.mileage.items()
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO station_types VALUES (?, ?, ?)",
+        (
+            (ids[id(station)], position, station_type.value)
+            for station in station_list
+            for position, station_type in enumerate(station.station_types)
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO radio_channels VALUES (?, ?, ?)",
+        (
+            (ids[id(station)], position, channel.value)
+            for station in station_list
+            for position, channel in enumerate(station.radio_channels)
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO r307_ranges VALUES (?, ?, ?, ?)",
+        (
+            (station_id(issuer), first, last, station_id(destination))
+            for issuer, issued in r307_issuers.items()
+            for first, last, destination in issued
+        ),
+    )
+    connection.execute(
+        "INSERT INTO stations_rtree SELECT id, lat, lat, lon, lon FROM stations WHERE lat != 0 OR lon != 0"
+    )
+    connection.execute("INSERT INTO stations_fts (stations_fts) VALUES ('rebuild')")
+
+
+def write(
+    path: str | os.PathLike,
+    station_list: typing.Iterable[stations.Station] | None = None,
+    r307_issuers: dict[stations.Station, list[list]] | None = None,
+) -> None:
+    """
+    Writes the catalogue into a new SQLite database in a single transaction.
+
+    The database is built next to `path` and moved into place when complete,
+    so readers of an existing database never see a partial one.
+    """
+    if station_list is None:
+        station_list = stations.station_registry.all()
+    if r307_issuers is None:
+        r307_issuers = stations.R307_ISSUERS
+    station_list = sorted(station_list, key=lambda station: station.name)
+
+    path = pathlib.Path(path)
+    descriptor, temporary = tempfile.mkstemp(suffix=".sqlite3", dir=path.parent)
+    os.close(descriptor)
+    try:
+        connection = sqlite3.connect(temporary)
+        try:
+            with connection:
+                _write(connection, station_list, r307_issuers)
+        finally:
+            connection.close()
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def _decimal(value: float) -> decimal.Decimal:
+    return decimal.Decimal(repr(value))
+
+
+def load(
+    connection: sqlite3.Connection,
+    register: bool = False,
+) -> tuple[list[stations.Station], dict[stations.Station, list[list]]]:
+    """
+    Rebuilds the stations and R307 issuers stored by `write`.
+
+    Stations are not added to `station_registry` unless `register` is True.
+    """
+    version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported schema version {version}, expected {SCHEMA_VERSION}")
+
+    mileage = {}
+    for station_id, line, km in connection.execute(
+        "SELECT station_id, line, km FROM mileage ORDER BY station_id, line"
+    ):
+        mileage.setdefault(station_id, {})[line] = _decimal(km)
+    station_types = {}
+    for station_id, value in connection.execute(
+        "SELECT station_id, station_type FROM station_types ORDER BY station_id, position"
+    ):
+        station_types.setdefault(station_id, []).append(enums.StationType(value))
+    radio_channels = {}
+    for station_id, value in connection.execute(
+        "SELECT station_id, channel FROM radio_channels ORDER BY station_id, position"
+    ):
+        radio_channels.setdefault(station_id, []).append(enums.RadioChannel(value))
+
+    rows = {row[0]: row for row in connection.execute("SELECT * FROM stations ORDER BY id")}
+    built: dict[int, stations.Station] = {}
+
+    def build(station_id: int) -> stations.Station:
+        if station_id in built:
+            return built[station_id]
+        (
+            _,
+            name,
+            abbreviation,
+            lat,
+            lon,
+            remote_control_facilities,
+            remotely_controlled_from,
+            remote_control_with_optional_local_control,
+            shp,
+            radio_recording,
+            belongs_to,
+            skippable,
+            short_name,
+        ) = rows[station_id]
+        fields = dict(
+            name=name,
+            abbreviation=abbreviation,
+            lat=_decimal(lat),
+            lon=_decimal(lon),
+            mileage=mileage.get(station_id, {}),
+            radio_channels=radio_channels.get(station_id, []),
+            station_types=station_types.get(station_id, []),
+            remote_control_facilities=bool(remote_control_facilities),
+            remotely_controlled_from=remotely_controlled_from,
+            remote_control_with_optional_local_control=bool(remote_control_with_optional_local_control),
+            shp=bool(shp),
+            radio_recording=bool(radio_recording),
+            belongs_to=build(belongs_to) if belongs_to is not None else None,
+            skippable=bool(skippable),
+            short_name=short_name,
+        )
+        station = stations.Station(**fields) if register else stations.Station.model_construct(**fields)
+        built[station_id] = station
+        return station
+
+    station_list = [build(station_id) for station_id in rows]
+    r307_issuers = {}
+    for issuer_id, first, last, destination_id in connection.execute(
+        "SELECT issuer_id, first, last, destination_id FROM r307_ranges ORDER BY rowid"
+    ):
+        r307_issuers.setdefault(built[issuer_id], []).append([first, last, built[destination_id]])
+    return station_list, r307_issuers
+
+
+def _match_expression(query: str) -> str:
+    # Each word is an FTS5 string, so periods and hyphens in names aren't read as query syntax,
+    # and a prefix, so abbreviated words like "Gł." match as well
+    return " ".join('"{}"*'.format(word.replace('"', '""')) for word in query.split())
+
+
+def search(connection: sqlite3.Connection, query: str, limit: int = 20) -> list[str]:
+    """
+    Full-text search of station names, ignoring diacritics, best matches first.
+    Every word of the query has to start a word of the name, e.g. `Dąbr. G.` or `Katowice-Janów`.
+    """
+    expression = _match_expression(query)
+    if not expression:
+        return []
+    return [
+        name
+        for (name,) in connection.execute(
+            "SELECT name FROM stations_fts WHERE stations_fts MATCH ? ORDER BY rank LIMIT ?", (expression, limit)
+        )
+    ]
+
+
+def within(
+    connection: sqlite3.Connection, min_lat: float, max_lat: float, min_lon: float, max_lon: float
+) -> list[str]:
+    """
+    Names of the stations inside the bounding box, using the R*Tree index.
+    """
+    return [
+        name
+        for (name,) in connection.execute(
+            "SELECT stations.name FROM stations_rtree JOIN stations USING (id) "
+            "WHERE min_lat >= ? AND max_lat <= ? AND min_lon >= ? AND max_lon <= ? ORDER BY stations.name",
+            (min_lat, max_lat, min_lon, max_lon),
+        )
+    ]
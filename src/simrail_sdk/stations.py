@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import collections
 import decimal
+import functools
 import logging
+import typing
 
 import simpleregistry
 
-from simrail_sdk import enums, base
+from simrail_sdk import enums, base, registry
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +18,71 @@ DEFAULT_SHORT_NAME_REPLACEMENTS = {
 }
 
 
-station_registry = simpleregistry.Registry("stations", {simpleregistry.Index(["name"])})
+@functools.lru_cache(maxsize=4096)
+def _replace_words(name: str, replacements: tuple[tuple[str, str], ...]) -> str:
+    # The replacements are part of the cache key, so changing DEFAULT_SHORT_NAME_REPLACEMENTS takes effect at once
+    table = dict(replacements)
+    return " ".join(table.get(word, word) for word in name.split())
+
+
+def short_name_cache_info() -> functools._CacheInfo:
+    """
+    Returns the hits and misses of the cache of shortened station names.
+    """
+    return _replace_words.cache_info()
+
+
+def sort_key(station: Station) -> tuple:
+    """
+    Orders stations by name, then by their mileage, so that stations sharing a name
+    come in the same order in every process, unlike in sets of stations such as `station_registry.all()`.
+    """
+    return station.name, tuple(sorted(station.mileage.items()))
+
+
+def station_keys(station_list: typing.Iterable[Station]) -> dict[int, str]:
+    """
+    Returns a unique key for each station, by `id()` of the station: its name, or for a name used by more than
+    one station, the name followed by its lines, e.g. `Katowice Janów [171]`, or by its mileage if the lines
+    are shared too.
+    """
+    station_list = list(station_list)
+
+    def lines(station: Station) -> str:
+        return f"{station.name} [{','.join(str(line) for line in sorted(station.mileage))}]"
+
+    def mileage(station: Station) -> str:
+        return f"{station.name} [{','.join(f'{line}:{km}' for line, km in sorted(station.mileage.items()))}]"
+
+    names = collections.Counter(station.name for station in station_list)
+    with_lines = collections.Counter(lines(station) for station in station_list if names[station.name] > 1)
+    keys = {}
+    for station in station_list:
+        if names[station.name] == 1:
+            keys[id(station)] = station.name
+        elif with_lines[lines(station)] == 1:
+            keys[id(station)] = lines(station)
+        else:
+            keys[id(station)] = mileage(station)
+    return keys
+
+
+def new_registry(name: str = "stations", check_type: bool = True) -> registry.SnapshotRegistry:
+    """
+    Returns an empty registry with the station indexes.
+    """
+    return registry.SnapshotRegistry(
+        name,
+        check_type=check_type,
+        indexes={
+            simpleregistry.Index(["name"]),
+            simpleregistry.Index(["abbreviation"]),
+            simpleregistry.Index(["remotely_controlled_from"]),
+        },
+    )
+
+
+station_registry = new_registry()
 
 
 @simpleregistry.register(station_registry)
@@ -25,6 +92,12 @@ class Station(base.BasePydanticModel):
     Full name of the station
     """
 
+    abbreviation: str | None = None
+    """
+    Official abbreviation of the station,
+    referred to by `remotely_controlled_from` of the stations it controls
+    """
+
     lat: decimal.Decimal
     """
     The latitude
@@ -67,8 +140,7 @@ class Station(base.BasePydanticModel):
     remote_control_with_optional_local_control: bool = False
     """
     If the station is remotely controlled,
-    but can be controlled locally as well when needed,
-    the abbreviation of the station controlling it
+    but can be controlled locally as well when needed
     """
 
     shp: bool = True
@@ -110,9 +182,7 @@ class Station(base.BasePydanticModel):
         """
         if self.short_name:
             return self.short_name
-        words = self.name.split()
-        words_with_replacements = [DEFAULT_SHORT_NAME_REPLACEMENTS.get(w, w) for w in words]
-        return " ".join(words_with_replacements)
+        return _replace_words(self.name, tuple(DEFAULT_SHORT_NAME_REPLACEMENTS.items()))
 
     @property
     def branch_off_points(self) -> set[Station]:
@@ -121,6 +191,25 @@ class Station(base.BasePydanticModel):
         """
         return station_registry.filter(belongs_to=self)
 
+    @property
+    def remote_controller(self) -> Station | None:
+        """
+        If the station is remotely controlled, return the station controlling it.
+        """
+        if not self.remotely_controlled_from:
+            return None
+        controllers = station_registry.filter(abbreviation=self.remotely_controlled_from)
+        return next(iter(controllers), None)
+
+    @property
+    def remotely_controlled_stations(self) -> set[Station]:
+        """
+        If the station controls other stations remotely, return them.
+        """
+        if not self.abbreviation:
+            return set()
+        return set(station_registry.filter(remotely_controlled_from=self.abbreviation))
+
     @property
     def is_junction(self) -> bool:
         """
@@ -1997,6 +2086,7 @@ Jezowka = Station(
 )
 Wolbrom = Station(
     name="Wolbrom",
+    abbreviation="Wb",
     lat=50.375983,
     lon=19.77229,
     mileage={62: 22.296},
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import decimal
+import logging
+import math
+import random
+import typing
+
+from simrail_sdk import enums, stations
+
+logger = logging.getLogger(__name__)
+
+
+STATIONS_PER_LINE = 200
+"""
+Average number of stations on a generated line
+"""
+
+FIRST_TRAIN_NUMBER = 10000
+TRAIN_NUMBERS_PER_RANGE = 50
+
+_STATION_TYPES = (
+    ((enums.StationType.STATION,), 0.2),
+    ((enums.StationType.HALT,), 0.45),
+    ((enums.StationType.PASSING_LOOP,), 0.1),
+    ((enums.StationType.BLOCK_POST,), 0.15),
+    ((enums.StationType.HALT, enums.StationType.BLOCK_POST), 0.1),
+)
+
+_LAT = (49.0, 54.8)
+_LON = (14.1, 24.1)
+_KM_PER_DEGREE_OF_LATITUDE = 111.2
+_KM = decimal.Decimal("0.001")
+_COORDINATE = decimal.Decimal("0.000001")
+
+
+class Network(typing.NamedTuple):
+    station_list: list[stations.Station]
+    r307_issuers: dict[stations.Station, list[list]]
+    lines: dict[int, list[stations.Station]]
+    """
+    The stations of each line in mileage order, without branch off points
+    """
+
+
+def _abbreviation(number: int) -> str:
+    letters = []
+    while True:
+        number, letter = divmod(number, 26)
+        letters.append(chr(ord("A") + letter))
+        if not number:
+            return "".join(reversed(letters))
+        number -= 1
+
+
+def _coordinate(value: float) -> decimal.Decimal:
+    return decimal.Decimal(value).quantize(_COORDINATE)
+
+
+def _station(**fields: typing.Any) -> stations.Station:
+    # model_construct keeps the stations out of station_registry
+    return stations.Station.model_construct(
+        **{
+            "abbreviation": None,
+            "remote_control_facilities": False,
+            "remotely_controlled_from": None,
+            "remote_control_with_optional_local_control": False,
+            "shp": True,
+            "radio_recording": True,
+            "belongs_to": None,
+            "skippable": False,
+            "short_name": None,
+            **fields,
+        }
+    )
+
+
+def generate(
+    size: int,
+    seed: int = 0,
+    stations_per_line: int = STATIONS_PER_LINE,
+) -> Network:
+    """
+    Generates a synthetic catalogue of about `size` stations (branch off points included).
+
+    Every line after the first starts at a station of an earlier line, which becomes a junction with a branch off point
+    on the new line. Mileage grows monotonically along each line, the radio channel changes every few dozen
+    kilometres, passing loops and block posts are controlled remotely from the previous station on the line,
+    and each station issues a train number range for R307 to a station further down the network.
+    The same `seed` always gives the same catalogue.
+    """
+    rng = random.Random(seed)
+    channels = list(enums.RadioChannel)
+    station_types = [types for types, _ in _STATION_TYPES]
+    weights = [weight for _, weight in _STATION_TYPES]
+
+    station_list: list[stations.Station] = []
+    lines: dict[int, list[stations.Station]] = {}
+    issuers: list[stations.Station] = []
+    line = 0
+    while len(station_list) < size:
+        line += 1
+        length = max(2, min(size - len(station_list), rng.randint(stations_per_line // 2, stations_per_line * 3 // 2)))
+        if line == 1:
+            lat, lon = rng.uniform(*_LAT), rng.uniform(*_LON)
+            on_line = []
+        else:
+            junction = rng.choice(station_list)
+            while junction.belongs_to is not None:
+                junction = junction.belongs_to
+            lat, lon = float(junction.lat), float(junction.lon)
+            junction.mileage[line] = decimal.Decimal(0).quantize(_KM)
+            if enums.StationType.JUNCTION not in junction.station_types:
+                junction.station_types.append(enums.StationType.JUNCTION)
+            branch_off_point = _station(
+                name=f"{junction.name} R{line}",
+                lat=_coordinate(lat + 0.001),
+                lon=_coordinate(lon + 0.001),
+                mileage={line: decimal.Decimal("0.300")},
+                radio_channels=list(junction.radio_channels),
+                station_types=[enums.StationType.BRANCH_OFF_POINT],
+                belongs_to=junction,
+            )
+            station_list.append(branch_off_point)
+            on_line = [junction]
+            length -= 1
+
+        bearing = rng.uniform(0, 2 * math.pi)
+        km = 0.0 if line == 1 else 0.3
+        channel = rng.randrange(len(channels))
+        controller = on_line[0] if on_line and on_line[0].abbreviation else None
+        for index in range(length):
+            step = rng.uniform(1.0, 6.0)
+            km += step
+            bearing += rng.uniform(-0.3, 0.3)
+            if not (_LAT[0] < lat < _LAT[1] and _LON[0] < lon < _LON[1]):
+                # Turn back towards the map
+                bearing += math.pi
+            lat += step * math.cos(bearing) / _KM_PER_DEGREE_OF_LATITUDE
+            lon += step * math.sin(bearing) / (_KM_PER_DEGREE_OF_LATITUDE * math.cos(math.radians(lat)))
+            if rng.random() < step / 30:
+                channel = (channel + 1) % len(channels)
+            types = list(rng.choices(station_types, weights)[0])
+            station = _station(
+                name=f"Synthetic {line}-{index + 1}",
+                lat=_coordinate(lat),
+                lon=_coordinate(lon),
+                mileage={line: decimal.Decimal(km).quantize(_KM)},
+                radio_channels=[channels[channel]],
+                station_types=types,
+            )
+            if enums.StationType.STATION in types:
+                station.abbreviation = _abbreviation(len(issuers))
+                station.remote_control_facilities = True
+                issuers.append(station)
+                controller = station
+            elif controller is not None and types[-1] in (
+                enums.StationType.PASSING_LOOP,
+                enums.StationType.BLOCK_POST,
+            ):
+                station.remotely_controlled_from = controller.abbreviation
+            station_list.append(station)
+            on_line.append(station)
+        lines[line] = on_line
+
+    r307_issuers = {}
+    for number, issuer in enumerate(issuers):
+        first = FIRST_TRAIN_NUMBER + number * TRAIN_NUMBERS_PER_RANGE
+        destination = issuers[(number + rng.randint(1, 20)) % len(issuers)]
+        r307_issuers[issuer] = [[first, first + TRAIN_NUMBERS_PER_RANGE - 1, destination]]
+    logger.info("Generated %d stations on %d lines", len(station_list), len(lines))
+    return Network(station_list, r307_issuers, lines)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import bisect
+import datetime
+import decimal
+import itertools
+import logging
+import typing
+
+from simrail_sdk import base, chainage, enums, stations
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DWELL_TIMES = {
+    enums.StopType.PH: datetime.timedelta(minutes=1),
+    enums.StopType.PT: datetime.timedelta(minutes=1),
+}
+
+
+class Stop(base.BasePydanticModel):
+    station: stations.Station
+    """
+    The station the train stops at or passes through
+    """
+
+    line: int
+    """
+    The line the train leaves the station on.
+    For the last stop, the line the train arrives on.
+    """
+
+    stop_type: enums.StopType | None = None
+    """
+    Type of the stop, None if the train passes through without stopping
+    """
+
+    arrival: datetime.datetime | None = None
+    """
+    Arrival time, None for the first stop
+    """
+
+    departure: datetime.datetime | None = None
+    """
+    Departure time, None for the last stop
+    """
+
+    @property
+    def km(self) -> decimal.Decimal:
+        """
+        Mileage of the station on the line the train leaves on.
+        """
+        return self.station.mileage[self.line]
+
+    @property
+    def dwell_time(self) -> datetime.timedelta:
+        if self.arrival is None or self.departure is None:
+            return datetime.timedelta()
+        return self.departure - self.arrival
+
+
+class SpeedProfile:
+    """
+    Piecewise constant speed along the run.
+
+    Each point is a distance from the start of the run (km) and the speed (km/h) from that distance onwards.
+    """
+
+    def __init__(self, points: typing.Iterable[tuple[float, float]]):
+        points = sorted((float(distance), float(speed)) for distance, speed in points)
+        if not points or points[0][0] > 0:
+            raise ValueError("Speed profile must start at distance 0")
+        if any(speed <= 0 for _, speed in points):
+            raise ValueError("Speeds must be positive")
+        self.distances = [distance for distance, _ in points]
+        self.speeds = [speed for _, speed in points]
+        # Time (in hours) needed to reach each point of the profile
+        self.hours = [0.0]
+        for (distance, speed), (next_distance, _) in itertools.pairwise(points):
+            self.hours.append(self.hours[-1] + (next_distance - distance) / speed)
+
+    @classmethod
+    def constant(cls, speed: float) -> SpeedProfile:
+        return cls([(0, speed)])
+
+    def hours_at(self, distances: typing.Sequence[float]) -> list[float]:
+        """
+        Returns the running time in hours from the start of the run to each distance.
+
+        Distances must be sorted, as they are for consecutive stops,
+        which lets the whole batch be computed in a single merge pass over the profile.
+        """
+        result = []
+        index = 0
+        last = len(self.distances) - 1
+        profile_distances, speeds, hours = self.distances, self.speeds, self.hours
+        for distance in distances:
+            while index < last and profile_distances[index + 1] <= distance:
+                index += 1
+            result.append(hours[index] + (distance - profile_distances[index]) / speeds[index])
+        return result
+
+    def hours_at_unsorted(self, distances: typing.Iterable[float]) -> list[float]:
+        """
+        Same as `hours_at`, for distances in any order.
+        """
+        profile_distances, speeds, hours = self.distances, self.speeds, self.hours
+        result = []
+        for distance in distances:
+            index = max(bisect.bisect_right(profile_distances, distance) - 1, 0)
+            result.append(hours[index] + (distance - profile_distances[index]) / speeds[index])
+        return result
+
+
+class TrainRun(base.BasePydanticModel):
+    number: str
+    """
+    Train number
+    """
+
+    stops: list[Stop]
+    """
+    Stops ordered from origin to destination, including stations passed without stopping
+    """
+
+    class Config:
+        pk_fields = ["number"]
+
+    def distances(self, chainage_model: chainage.Chainage | None = None) -> list[float]:
+        """
+        Returns the distance (km) between each pair of consecutive stops.
+
+        Pass a `Chainage` to measure across breaks in the kilometrage of the lines;
+        otherwise the distance is the difference of the kilometres.
+        """
+        if chainage_model is not None:
+            return chainage_model.distances(
+                (stop.line, stop.station, following.station) for stop, following in itertools.pairwise(self.stops)
+            )
+        return [
+            abs(float(following.station.mileage[stop.line]) - float(stop.km))
+            for stop, following in itertools.pairwise(self.stops)
+        ]
+
+    def running_times(
+        self,
+        profile: SpeedProfile,
+        chainage_model: chainage.Chainage | None = None,
+    ) -> list[datetime.timedelta]:
+        """
+        Returns the running time between each pair of consecutive stops, dwell times excluded.
+        """
+        cumulative = list(itertools.accumulate(self.distances(chainage_model), initial=0.0))
+        hours = profile.hours_at(cumulative)
+        return [datetime.timedelta(hours=end - start) for start, end in itertools.pairwise(hours)]
+
+    def retimed(
+        self,
+        profile: SpeedProfile,
+        departure: datetime.datetime | None = None,
+        dwell_times: dict[enums.StopType, datetime.timedelta] | None = None,
+        chainage_model: chainage.Chainage | None = None,
+    ) -> TrainRun:
+        """
+        Returns a copy of the run with arrival and departure times computed from the speed profile.
+
+        Departs at `departure`, or at the current departure time from the first stop.
+        """
+        if dwell_times is None:
+            dwell_times = DEFAULT_DWELL_TIMES
+        if departure is None:
+            departure = self.stops[0].departure
+        if departure is None:
+            raise ValueError(f"Train {self.number} has no departure time")
+
+        stops = [self.stops[0].model_copy(update={"arrival": None, "departure": departure})]
+        current = departure
+        for stop, running_time in zip(self.stops[1:], self.running_times(profile, chainage_model)):
+            arrival = current + running_time
+            current = arrival + dwell_times.get(stop.stop_type, datetime.timedelta())
+            stops.append(stop.model_copy(update={"arrival": arrival, "departure": current}))
+        stops[-1] = stops[-1].model_copy(update={"departure": None})
+        return self.model_copy(update={"stops": stops})
+
+
+def retime_all(
+    runs: typing.Iterable[TrainRun],
+    profile: SpeedProfile,
+    dwell_times: dict[enums.StopType, datetime.timedelta] | None = None,
+    chainage_model: chainage.Chainage | None = None,
+) -> list[TrainRun]:
+    """
+    Recomputes the times of many runs after a scenario change, keeping their departure times.
+    """
+    return [run.retimed(profile, dwell_times=dwell_times, chainage_model=chainage_model) for run in runs]
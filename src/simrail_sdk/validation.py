@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import enum
+import heapq
+import itertools
+import logging
+import typing
+
+from simrail_sdk import base, stations
+
+logger = logging.getLogger(__name__)
+
+
+class Severity(enum.Enum):
+    ERROR = "error"
+    WARNING = "warning"
+
+
+class Issue(base.BasePydanticModel):
+    rule: str
+    """
+    Name of the rule which reported the issue
+    """
+
+    severity: Severity
+    """
+    How serious the issue is
+    """
+
+    message: str
+    """
+    Human-readable description of the issue
+    """
+
+    stations: list[str] = []
+    """
+    Names of the stations involved
+    """
+
+
+class Report(base.BasePydanticModel):
+    issues: list[Issue] = []
+    """
+    All issues found, ordered by rule and then as reported by the rule
+    """
+
+    rules: list[str] = []
+    """
+    Names of the rules which were run
+    """
+
+    station_count: int = 0
+    """
+    Number of stations checked
+    """
+
+    @property
+    def ok(self) -> bool:
+        """
+        If no errors were found, return True. Warnings are allowed.
+        """
+        return not any(issue.severity == Severity.ERROR for issue in self.issues)
+
+    def by_rule(self) -> dict[str, list[Issue]]:
+        """
+        Returns the issues grouped by the name of the rule reporting them.
+        """
+        grouped = {rule: [] for rule in self.rules}
+        for issue in self.issues:
+            grouped.setdefault(issue.rule, []).append(issue)
+        return grouped
+
+
+class StationRecord(typing.NamedTuple):
+    """
+    A flat, cheap to pickle view of a station used by the rules.
+    """
+
+    name: str
+    lat: float
+    lon: float
+    mileage: dict[int, float]
+    remotely_controlled_from: str | None
+    belongs_to: str | None
+
+
+class R307Range(typing.NamedTuple):
+    issuer: str
+    first: int
+    last: int
+    destination: str
+
+
+class Snapshot(typing.NamedTuple):
+    """
+    Everything the rules need to know about the catalogue.
+    Built once and shipped to each worker process.
+    """
+
+    stations: tuple[StationRecord, ...]
+    r307_ranges: tuple[R307Range, ...]
+    abbreviations: frozenset[str]
+
+    @classmethod
+    def build(
+        cls,
+        station_list: typing.Iterable[stations.Station],
+        r307_issuers: dict[stations.Station, list[list]],
+    ) -> Snapshot:
+        records = []
+        abbreviations = set()
+        for station in station_list:
+            records.append(
+                StationRecord(
+                    name=station.name,
+                    lat=float(station.lat),
+                    lon=float(station.lon),
+                    mileage={line: float(km) for line, km in station.mileage.items()},
+                    remotely_controlled_from=station.remotely_controlled_from,
+                    belongs_to=station.belongs_to.name if station.belongs_to else None,
+                )
+            )
+            if station.abbreviation:
+                abbreviations.add(station.abbreviation)
+        ranges = [
+            R307Range(issuer.name, first, last, destination.name)
+            for issuer, issued in r307_issuers.items()
+            for first, last, destination in issued
+        ]
+        records.sort(key=lambda record: record.name)
+        ranges.sort(key=lambda issued: (issued.first, issued.last, issued.issuer))
+        return cls(tuple(records), tuple(ranges), frozenset(abbreviations))
+
+
+class Rule:
+    """
+    Base class for catalogue rules.
+
+    Subclasses set a unique `name` and implement `check`,
+    yielding an `Issue` for each problem found.
+    Rules must be defined at module level so that they can be sent to worker processes.
+    """
+
+    name: str = ""
+    severity: Severity = Severity.ERROR
+
+    def check(self, snapshot: Snapshot) -> typing.Iterator[Issue]:
+        raise NotImplementedError
+
+    def issue(self, message: str, *station_names: str) -> Issue:
+        return Issue(rule=self.name, severity=self.severity, message=message, stations=list(station_names))
+
+
+class DuplicateCoordinates(Rule):
+    """
+    Different stations placed at exactly the same point.
+    Placeholder coordinates (0, 0) are reported by `PlaceholderCoordinates` instead.
+    """
+
+    name = "duplicate-coordinates"
+    severity = Severity.WARNING
+
+    def check(self, snapshot: Snapshot) -> typing.Iterator[Issue]:
+        by_point = collections.defaultdict(list)
+        for record in snapshot.stations:
+            if record.lat or record.lon:
+                by_point[(record.lat, record.lon)].append(record.name)
+        for (lat, lon), names in sorted(by_point.items()):
+            if len(names) > 1:
+                yield self.issue(f"{len(names)} stations share coordinates {lat}, {lon}", *names)
+
+
+class PlaceholderCoordinates(Rule):
+    name = "placeholder-coordinates"
+    severity = Severity.WARNING
+
+    def check(self, snapshot: Snapshot) -> typing.Iterator[Issue]:
+        for record in snapshot.stations:
+            if not record.lat and not record.lon:
+                yield self.issue("Coordinates are a (0, 0) placeholder", record.name)
+
+
+class NonMonotonicMileage(Rule):
+    """
+    Stations shared by two lines must be in the same (or exactly reversed) order on both lines.
+    """
+
+    name = "non-monotonic-mileage"
+
+    def check(self, snapshot: Snapshot) -> typing.Iterator[Issue]:
+        by_line_pair = collections.defaultdict(list)
+        for record in snapshot.stations:
+            for line_a, line_b in itertools.combinations(sorted(record.mileage), 2):
+                by_line_pair[(line_a, line_b)].append((record.mileage[line_a], record.mileage[line_b], record.name))
+
+        for (line_a, line_b), shared in sorted(by_line_pair.items()):
+            if len(shared) < 3:
+                continue
+            shared.sort()
+            direction = 0
+            for previous, current in itertools.pairwise(shared):
+                step = current[1] - previous[1]
+                if not step:
+                    continue
+                if direction and (step > 0) != (direction > 0):
+                    yield self.issue(
+                        f"Order on line {line_b} does not follow the order on line {line_a}: "
+                        f"{previous[2]} ({previous[0]} / {previous[1]}) -> {current[2]} ({current[0]} / {current[1]})",
+                        previous[2],
+                        current[2],
+                    )
+                    break
+                direction = step
+
+
+class OrphanedRemoteController(Rule):
+    name = "orphaned-remote-controller"
+
+    def check(self, snapshot: Snapshot) -> typing.Iterator[Issue]:
+        for record in snapshot.stations:
+            controller = record.remotely_controlled_from
+            if controller and controller not in snapshot.abbreviations:
+                yield self.issue(f"No station has the abbreviation {controller!r}", record.name)
+
+
+class BelongsToIntegrity(Rule):
+    """
+    `belongs_to` must point to a station in the catalogue and must not form cycles.
+    """
+
+    name = "belongs-to-integrity"
+
+    def check(self, snapshot: Snapshot) -> typing.Iterator[Issue]:
+        parents = {record.name: record.belongs_to for record in snapshot.stations}
+        resolved = set()
+        for name, parent in parents.items():
+            if parent is not None and parent not in parents:
+                yield self.issue(f"Belongs to {parent!r}, which is not in the catalogue", name)
+
+        for start in parents:
+            path = []
+            on_path = set()
+            current = start
+            while current is not None and current in parents and current not in resolved:
+                if current in on_path:
+                    cycle = path[path.index(current) :]
+                    yield self.issue(f"Cycle in belongs_to: {' -> '.join(cycle + [current])}", *cycle)
+                    break
+                path.append(current)
+                on_path.add(current)
+                current = parents[current]
+            resolved.update(path)
+
+
+class OverlappingR307Ranges(Rule):
+    """
+    Train number ranges issued for R307 must not overlap.
+    Uses a sweep over the ranges sorted by their first number.
+    """
+
+    name = "overlapping-r307-ranges"
+
+    def check(self, snapshot: Snapshot) -> typing.Iterator[Issue]:
+        active = []
+        for current in snapshot.r307_ranges:
+            if current.first > current.last:
+                yield self.issue(f"Range {current.first}-{current.last} is reversed", current.issuer)
+            while active and active[0][0] < current.first:
+                heapq.heappop(active)
+            for _, other in sorted(active, key=lambda item: item[1]):
+                yield self.issue(
+                    f"{other.first}-{other.last} ({other.issuer} -> {other.destination}) overlaps "
+                    f"{current.first}-{current.last} ({current.issuer} -> {current.destination})",
+                    other.issuer,
+                    current.issuer,
+                )
+            heapq.heappush(active, (current.last, current))
+
+
+DEFAULT_RULES: list[Rule] = [
+    DuplicateCoordinates(),
+    PlaceholderCoordinates(),
+    NonMonotonicMileage(),
+    OrphanedRemoteController(),
+    BelongsToIntegrity(),
+    OverlappingR307Ranges(),
+]
+
+
+_worker_snapshot: Snapshot | None = None
+
+
+def _init_worker(snapshot: Snapshot) -> None:
+    global _worker_snapshot
+    _worker_snapshot = snapshot
+
+
+def _run_in_worker(rule: Rule) -> list[Issue]:
+    return list(rule.check(_worker_snapshot))
+
+
+def validate(
+    station_list: typing.Iterable[stations.Station] | None = None,
+    r307_issuers: dict[stations.Station, list[list]] | None = None,
+    rules: typing.Sequence[Rule] | None = None,
+    max_workers: int | None = None,
+) -> Report:
+    """
+    Runs the rules over the catalogue and returns a report.
+
+    Defaults to the whole `station_registry`, `R307_ISSUERS` and `DEFAULT_RULES`.
+    Rules are run in a process pool, one task per rule;
+    pass `max_workers=1` to run them in the current process instead.
+    """
+    if station_list is None:
+        station_list = stations.station_registry.all()
+    if r307_issuers is None:
+        r307_issuers = stations.R307_ISSUERS
+    if rules is None:
+        rules = DEFAULT_RULES
+
+    names = [rule.name for rule in rules]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Rule names must be unique, got: {', '.join(names)}")
+
+    snapshot = Snapshot.build(station_list, r307_issuers)
+
+    if max_workers == 1 or len(rules) < 2:
+        results = [list(rule.check(snapshot)) for rule in rules]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(snapshot,)
+        ) as executor:
+            results = list(executor.map(_run_in_worker, rules))
+
+    report = Report(rules=names, station_count=len(snapshot.stations))
+    for rule, issues in zip(rules, results):
+        logger.debug("Rule %s reported %d issue(s)", rule.name, len(issues))
+        report.issues.extend(issues)
+    return report
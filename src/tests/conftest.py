@@ -0,0 +1,67 @@
+import datetime
+
+import pytest
+
+from simrail_sdk import enums, stations, timetable
+
+
+@pytest.fixture
+def copy_stations():
+    """
+    Returns a function making unregistered copies of stations, as a loader of a new game version would return them,
+    with the copies by id of the original.
+    """
+
+    def copy_stations(station_list):
+        copies = {}
+
+        def copy(station):
+            if id(station) not in copies:
+                parent = copy(station.belongs_to) if station.belongs_to is not None else None
+                copies[id(station)] = station.model_copy(update={"belongs_to": parent})
+            return copies[id(station)]
+
+        return [copy(station) for station in station_list], copies
+
+    return copy_stations
+
+
+@pytest.fixture
+def noon():
+    return datetime.datetime(2024, 1, 1, 12)
+
+
+@pytest.fixture
+def train_run(noon):
+    """
+    Returns a function building a run on line 62 between Tunel and Wolbrom, stopping at Charsznica.
+
+    `passing` stations are added in mileage order with `passing_stop_type`; every other stop after the first
+    is a passenger stop. The run is retimed with the speed profile, if any.
+    """
+
+    def train_run(
+        number="1",
+        departure=None,
+        passing=(),
+        passing_stop_type=None,
+        reverse=False,
+        profile=None,
+    ):
+        route = [stations.Tunel, stations.Charsznica, stations.Wolbrom, *passing]
+        route.sort(key=lambda station: station.mileage[62])
+        if reverse:
+            route.reverse()
+        stops = [
+            timetable.Stop(
+                station=station,
+                line=62,
+                stop_type=passing_stop_type if station in passing else enums.StopType.PH,
+            )
+            for station in route[1:]
+        ]
+        origin = timetable.Stop(station=route[0], line=62, departure=departure or noon)
+        run = timetable.TrainRun(number=number, stops=[origin, *stops])
+        return run.retimed(profile) if profile is not None else run
+
+    return train_run
@@ -0,0 +1,17 @@
+from benchmarks import suite
+
+
+def test_run_and_compare(tmp_path):
+    (result,) = suite.run(["name_lookup"], repeat=1)
+    assert result.name == "name_lookup"
+    assert 0 < result.best <= result.median
+
+    faster = suite.Result("name_lookup", result.best / 2, result.median / 2, result.calls)
+    assert suite.compare([result], {"name_lookup": result}) == []
+    (regression,) = suite.compare([result], {"name_lookup": faster})
+    assert regression.ratio == 2
+
+
+def test_baseline_covers_all_benchmarks():
+    baseline = suite.load(suite.BASELINE)
+    assert baseline.keys() == suite.BENCHMARKS.keys()
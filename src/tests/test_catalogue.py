@@ -0,0 +1,77 @@
+import decimal
+import sys
+import threading
+
+from simrail_sdk import catalogue, stations
+
+
+def _copy_r307_issuers(copies):
+    return {
+        copies[id(issuer)]: [[first, last, copies[id(destination)]] for first, last, destination in issued]
+        for issuer, issued in stations.R307_ISSUERS.items()
+    }
+
+
+def test_unchanged_stations_are_shared(copy_stations):
+    first = catalogue.Catalogue.build()
+    station_list, _ = copy_stations(first.stations)
+    second = catalogue.Catalogue.build(station_list, previous=first)
+
+    assert second.version == 2
+    assert second.shared_with(first) == len(first) == len(stations.station_registry)
+    assert second.get("Wolbrom") is first.get("Wolbrom")
+
+
+def test_changed_station_is_replaced_with_its_branch_off_points(copy_stations):
+    first = catalogue.Catalogue.build()
+    station_list, copies = copy_stations(first.stations)
+    changed = copies[id(stations.Katowice)]
+    changed.lat = decimal.Decimal("50.25")
+    second = catalogue.Catalogue.build(station_list, _copy_r307_issuers(copies), previous=first)
+
+    katowice = second.get("Katowice")
+    assert katowice is changed
+    assert second.shared_with(first) == len(first) - 1 - len(first.branch_off_points(stations.Katowice))
+    assert {station.name for station in second.branch_off_points(katowice)} == {
+        station.name for station in stations.Katowice.branch_off_points
+    }
+    assert all(station.belongs_to is katowice for station in second.branch_off_points(katowice))
+    destinations = {destination.name: destination for _, _, destination in second.r307_issuers[katowice]}
+    assert all(second.get(name) is destination for name, destination in destinations.items())
+
+
+def test_callers_stations_are_not_changed():
+    # Equal strings built at run time are different objects, only one of them interned
+    interned = sys.intern("".join(["Wolbrom", " Zachód"]))
+    name = "".join(["Wolbrom", " Zachód"])
+    station = stations.Station.model_construct(**{**stations.Wolbrom.__dict__, "name": name})
+    built = catalogue.Catalogue.build([station], {})
+
+    assert station.name is name
+    (copy,) = built.stations
+    assert copy is not station
+    assert copy.name is interned
+
+
+def test_readers_see_complete_versions(copy_stations):
+    versions = catalogue.VersionedCatalogue()
+    station_list, _ = copy_stations(versions.current.stations)
+    seen = []
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            current = versions.current
+            seen.append((current.version, len(current.registry)))
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    futures = [versions.publish_in_background(station_list, stations.R307_ISSUERS) for _ in range(3)]
+    published = [future.result() for future in futures]
+    stop.set()
+    reader.join()
+    versions.close()
+
+    assert [catalogue.version for catalogue in published] == [2, 3, 4]
+    assert versions.current is published[-1]
+    assert {size for _, size in seen} == {len(stations.station_registry)}
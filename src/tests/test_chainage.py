@@ -0,0 +1,75 @@
+import decimal
+
+import pytest
+
+from simrail_sdk import chainage, enums, stations, timetable
+
+
+@pytest.fixture(scope="module")
+def model():
+    return chainage.Chainage()
+
+
+def test_break_on_line_160(model):
+    # Same as the distances on line 154
+    assert model.distance(160, stations.Lazy, stations.LazyLC) == pytest.approx(2.686)
+    assert model.distance(160, stations.LazyLA, stations.Lazy) == pytest.approx(6.147)
+    assert model.distance(160, stations.LazyLA, stations.LazyLC) == pytest.approx(6.147 + 2.686)
+    assert model.distance(160, stations.Zawiercie, stations.Lazy) == pytest.approx(283.654 - 274.227)
+
+
+def test_negative_mileage(model):
+    # Across km 0 of line 133, not the difference of the absolute kilometres
+    assert model.distance(133, stations.DabrowaGorniczaZabkowiceDZA, stations.DabrowaGorniczaZabkowiceGTB) == (
+        pytest.approx(1.114 + 1.0)
+    )
+    assert model.distance(133, stations.DabrowaGorniczaZabkowiceDzaR4_7, stations.DabrowaGorniczaZabkowice) == (
+        pytest.approx(1.224)
+    )
+    assert model.true_km(stations.DabrowaGorniczaZabkowiceDZA, 133) == pytest.approx(-1.114)
+
+
+def test_distance_across_break(model):
+    # Km 274.227 to 283.654 before the break, then 280.654 to 283.340 after it
+    expected = (283.654 - 274.227) + (283.340 - 280.654)
+    assert model.distance(160, stations.Zawiercie, stations.LazyLC) == pytest.approx(expected)
+    assert chainage.Chainage(breaks=()).distance(160, stations.Zawiercie, stations.LazyLC) != pytest.approx(expected)
+
+
+def test_segments():
+    line = chainage.LineChainage(
+        5,
+        [
+            chainage.ChainageBreak(5, decimal.Decimal(10), decimal.Decimal(5)),
+            chainage.ChainageBreak(5, decimal.Decimal(20), decimal.Decimal(30)),
+        ],
+    )
+    assert [line.candidates(km) for km in (0, 7, 12, 25, 35)] == [[0], [0, 1], [1], [], [2]]
+    assert line.true_km(12) == 17
+    assert line.true_km(7, segment=1) == 12
+    assert line.true_km(35) == 30
+    with pytest.raises(ValueError, match="pass the segment"):
+        line.true_km(7)
+
+
+def test_batch_distances(model):
+    legs = [(1, stations.Zawiercie, stations.LazyLA), (160, stations.Lazy, stations.LazyLC)]
+    assert model.distances(legs) == [model.distance(*leg) for leg in legs]
+    assert model.distances_km(160, [(278.507, 277.507), (290, 284)]) == pytest.approx([1, 6])
+    with pytest.raises(ValueError, match="pass the segment"):
+        model.distances_km(160, [(283.654, 277.507)])
+    with pytest.raises(ValueError, match="not on line 4"):
+        model.distances([(4, stations.Lazy, stations.LazyLC)])
+
+
+def test_train_run_distances(model):
+    run = timetable.TrainRun(
+        number="1",
+        stops=[
+            timetable.Stop(station=stations.LazyLA, line=160, stop_type=enums.StopType.PT),
+            timetable.Stop(station=stations.Lazy, line=160),
+            timetable.Stop(station=stations.LazyLC, line=160),
+        ],
+    )
+    assert run.distances() == pytest.approx([6.147, 0.314])
+    assert run.distances(model) == pytest.approx([6.147, 2.686])
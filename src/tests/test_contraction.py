@@ -0,0 +1,117 @@
+import math
+import os
+import pathlib
+import random
+import subprocess
+import sys
+
+import pytest
+
+from simrail_sdk import contraction, routing, stations, synthetic
+
+
+@pytest.fixture(scope="module")
+def network():
+    return routing.Network()
+
+
+@pytest.fixture(scope="module")
+def hierarchy(network):
+    return contraction.ContractionHierarchy.build(network)
+
+
+def _pairs(network, count=200):
+    rng = random.Random(0)
+    return [(rng.choice(network.stations), rng.choice(network.stations)) for _ in range(count)]
+
+
+def test_same_distances_as_dijkstra(network, hierarchy):
+    for origin, destination in _pairs(network):
+        assert hierarchy.distance(origin, destination) == pytest.approx(network.distance(origin, destination))
+    assert hierarchy.distance(stations.KrakowGlowny, stations.KrakowGlowny) == 0
+
+
+def test_route(network, hierarchy):
+    route = hierarchy.route(stations.WarszawaZachodnia, stations.KrakowGlowny)
+    shortest = network.shortest_route(stations.WarszawaZachodnia, stations.KrakowGlowny)
+    assert route.length == pytest.approx(shortest.length)
+    assert route.stations[0] is stations.WarszawaZachodnia and route.stations[-1] is stations.KrakowGlowny
+    assert len(route.lines) == len(route.stations) - 1
+    assert None not in route.lines and -1 not in route.lines
+    # Shortcuts are unpacked into consecutive stations of the network
+    for line, a, b in zip(route.lines, route.stations, route.stations[1:]):
+        edges = network.adjacency[network.node(a)]
+        assert any(neighbour == network.node(b) and on == line for neighbour, on, _ in edges)
+
+
+def test_table(network, hierarchy):
+    origins, destinations = zip(*_pairs(network, 30))
+    table = hierarchy.table(origins, destinations)
+    for origin, row in zip(origins, table):
+        for destination, distance in zip(destinations, row):
+            expected = network.distance(origin, destination)
+            assert distance == expected if math.isinf(expected) else distance == pytest.approx(expected)
+
+
+def test_save_and_load(network, hierarchy, tmp_path):
+    path = tmp_path / "hierarchy.ch"
+    hierarchy.save(path)
+    loaded = contraction.ContractionHierarchy.load(path, network)
+    for name in ("offsets", "targets", "weights", "middles", "lines"):
+        assert getattr(loaded, name) == getattr(hierarchy, name)
+
+    other = routing.Network(synthetic.generate(100).station_list)
+    with pytest.raises(ValueError, match="different network"):
+        contraction.ContractionHierarchy.load(path, other)
+    (tmp_path / "other.ch").write_bytes(b"not a hierarchy at all, but long enough")
+    with pytest.raises(ValueError, match="not a contraction hierarchy"):
+        contraction.ContractionHierarchy.load(tmp_path / "other.ch", network)
+    (tmp_path / "short.ch").write_bytes(b"SRCH")
+    with pytest.raises(ValueError, match="not a contraction hierarchy"):
+        contraction.ContractionHierarchy.load(tmp_path / "short.ch", network)
+
+
+def test_truncated_file(network, hierarchy, tmp_path):
+    path = tmp_path / "hierarchy.ch"
+    hierarchy.save(path)
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError, match="truncated or corrupt"):
+        contraction.ContractionHierarchy.load(path, network)
+
+
+def test_open_caches_the_file(network, tmp_path):
+    first = contraction.ContractionHierarchy.open(network, tmp_path)
+    (path,) = tmp_path.iterdir()
+    modified = path.stat().st_mtime_ns
+    second = contraction.ContractionHierarchy.open(network, tmp_path)
+    assert path.stat().st_mtime_ns == modified
+    assert second.targets == first.targets
+
+
+def test_open_reuses_the_file_of_other_processes(tmp_path):
+    # Each interpreter hashes strings differently, and so iterates the registry in a different order
+    code = f"""
+from simrail_sdk import contraction, routing
+network = routing.Network()
+print(contraction.network_hash(network).hex())
+contraction.ContractionHierarchy.open(network, {str(tmp_path)!r})
+"""
+    source = pathlib.Path(contraction.__file__).parents[1]
+
+    def run(hash_seed):
+        env = {**os.environ, "PYTHONHASHSEED": str(hash_seed), "PYTHONPATH": str(source)}
+        return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, env=env).stdout
+
+    first = run(1)
+    (path,) = tmp_path.iterdir()
+    modified = path.stat().st_mtime_ns
+    assert run(2) == first
+    assert list(tmp_path.iterdir()) == [path]
+    assert path.stat().st_mtime_ns == modified
+
+
+def test_synthetic_network():
+    network = routing.Network(synthetic.generate(3_000, seed=4).station_list)
+    hierarchy = contraction.ContractionHierarchy.build(network)
+    for origin, destination in _pairs(network, 50):
+        assert hierarchy.distance(origin, destination) == pytest.approx(network.distance(origin, destination))
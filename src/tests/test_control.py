@@ -0,0 +1,30 @@
+from simrail_sdk import control, stations
+
+
+def test_control_areas():
+    index = control.ControlIndex()
+    area = index.areas["Wb"]
+    assert area.controller == stations.Wolbrom
+    assert area.remotely_controlled == [stations.GajowkaAPO, stations.ZarzeczeAPO]
+    assert area.workload == 3
+
+
+def test_lookups_in_both_directions():
+    index = control.ControlIndex()
+    assert index.controller_of(stations.ZarzeczeAPO) == stations.Wolbrom
+    assert index.controller_of(stations.Wolbrom) is None
+    assert index.area_of(stations.Wolbrom) is index.area_of(stations.GajowkaAPO)
+    assert index.area_of(stations.Katowice) is None
+
+
+def test_optional_local_control():
+    controller = stations.Station.model_construct(name="Controller", abbreviation="Ct")
+    controlled = stations.Station.model_construct(
+        name="Controlled",
+        abbreviation=None,
+        remotely_controlled_from="Ct",
+        remote_control_with_optional_local_control=True,
+    )
+    index = control.ControlIndex([controller, controlled])
+    assert index.areas["Ct"].with_optional_local_control == [controlled]
+    assert index.workloads() == {"Ct": 2}
@@ -0,0 +1,71 @@
+import asyncio
+import datetime
+
+import pytest
+
+from simrail_sdk import delays, stations, timetable
+
+
+def test_running_statistics():
+    statistics = delays.RunningStatistics()
+    for value in [60, 120, 180]:
+        statistics.add(value)
+    assert (statistics.count, statistics.mean, statistics.minimum, statistics.maximum) == (3, 120, 60, 180)
+    assert statistics.stdev == pytest.approx(60)
+
+
+def test_stream(train_run, noon):
+    run = train_run(profile=timetable.SpeedProfile.constant(60))
+    charsznica = run.stops[1]
+    events = [
+        delays.StationEvent("1", stations.Tunel, noon + datetime.timedelta(minutes=2), delays.EventKind.DEPARTURE),
+        delays.PositionEvent("1", 62, 5.0, noon + datetime.timedelta(minutes=7)),
+        delays.StationEvent("1", stations.Charsznica, charsznica.arrival + datetime.timedelta(minutes=1)),
+        delays.StationEvent("unknown", stations.Charsznica, noon),
+        delays.StationEvent("1", stations.Wolbrom, run.stops[2].arrival),
+    ]
+
+    async def produce():
+        for event in events:
+            yield event
+
+    async def consume(tracker):
+        return [update async for update in tracker.stream(produce())]
+
+    tracker = delays.DelayTracker([run])
+    updates = asyncio.run(consume(tracker))
+    assert [update.delay.total_seconds() for update in updates] == pytest.approx([120, 165, 60, 0])
+    assert tracker.line_statistics[62].count == 4
+    assert tracker.station_statistics["Charsznica"].mean == 60
+    assert tracker.delay_of("1") is None
+
+
+def test_events_out_of_order(train_run, noon):
+    run = train_run(profile=timetable.SpeedProfile.constant(60))
+    tracker = delays.DelayTracker([run])
+    departed = delays.StationEvent("1", stations.Charsznica, run.stops[1].departure, delays.EventKind.DEPARTURE)
+    assert tracker.process(departed).delay.total_seconds() == 0
+    assert tracker._planned["1"].cursor == 1
+    # Reported late, from the first leg: matched directly, without scanning
+    late = tracker.process(delays.PositionEvent("1", 62, 2.75, noon + datetime.timedelta(minutes=3)))
+    assert late.delay.total_seconds() == pytest.approx(60)
+    assert tracker.process(delays.PositionEvent("1", 63, 2.75, noon)) is None
+
+
+def test_late_event_keeps_the_cursor(train_run, noon):
+    run = train_run(profile=timetable.SpeedProfile.constant(60))
+    tracker = delays.DelayTracker([run])
+    planned = tracker._planned["1"]
+    departed = delays.StationEvent("1", stations.Charsznica, run.stops[1].departure, delays.EventKind.DEPARTURE)
+    tracker.process(departed)
+    assert planned.cursor == 1
+
+    tracker.process(delays.StationEvent("1", stations.Tunel, noon, delays.EventKind.DEPARTURE))
+    tracker.process(delays.PositionEvent("1", 62, 2.75, noon + datetime.timedelta(minutes=3)))
+    assert planned.cursor == 1
+    # The current position is found at the cursor again
+    current = planned.planned_at(62, 10.0)
+    assert planned.cursor == 1
+    assert planned._leg_at(62, 10.0) == planned.cursor
+    update = tracker.process(delays.PositionEvent("1", 62, 10.0, current + datetime.timedelta(minutes=2)))
+    assert update.delay.total_seconds() == pytest.approx(120)
@@ -0,0 +1,64 @@
+import decimal
+
+import pytest
+
+from simrail_sdk import catalogue, diff, enums, sqlite, stations
+
+
+def test_diff(copy_stations):
+    old = catalogue.Catalogue.build()
+    station_list, copies = copy_stations(old.stations)
+    station_list.remove(copies[id(stations.Wolbrom)])
+    station_list.append(stations.Station.model_construct(**{**stations.Wolbrom.__dict__, "name": "Wolbrom Nowy"}))
+    copies[id(stations.Katowice)].lat = decimal.Decimal("50.25")
+    copies[id(stations.Katowice)].radio_channels = [enums.RadioChannel.R1]
+    r307_issuers = {
+        copies[id(issuer)]: [[first, last, copies[id(destination)]] for first, last, destination in issued]
+        for issuer, issued in stations.R307_ISSUERS.items()
+    }
+    issuer = copies[id(stations.Czestochowa)]
+    r307_issuers[issuer] = [[40101, 40149, copies[id(stations.Zawiercie)]], [1, 9, issuer]]
+    new = catalogue.Catalogue.build(station_list, r307_issuers, previous=old)
+
+    result = diff.diff(old, new)
+    assert result.added == ["Wolbrom Nowy"]
+    assert result.removed == ["Wolbrom"]
+    assert result.changed == [
+        diff.StationChange(
+            "Katowice",
+            (
+                diff.FieldChange("lat", stations.Katowice.lat, decimal.Decimal("50.25")),
+                diff.FieldChange("radio_channels", stations.Katowice.radio_channels, [enums.RadioChannel.R1]),
+            ),
+        )
+    ]
+    assert result.r307_changes == [
+        diff.R307Change("Częstochowa", 1, 9, None, "Częstochowa"),
+        diff.R307Change("Częstochowa", 40101, 40149, "Katowice", "Zawiercie"),
+        diff.R307Change("Częstochowa", 40601, 40649, "Katowice", None),
+    ]
+    assert diff.diff(new, new).empty
+
+
+def test_duplicate_r307_ranges():
+    issued = [[40101, 40149, stations.Zawiercie], [40101, 40149, stations.Katowice]]
+    with pytest.raises(ValueError, match="Częstochowa issues the train numbers 40101-40149 more than once"):
+        diff.r307_changes(stations.R307_ISSUERS, {stations.Czestochowa: issued})
+
+
+def test_duplicate_names_have_their_own_keys():
+    keys = catalogue.Catalogue.build().by_key
+    assert len(keys) == len(stations.station_registry)
+    assert "Katowice Janów" not in keys
+    assert {"Katowice Janów [171]", "Katowice Janów [657]"} <= keys.keys()
+
+
+def test_open_versions(tmp_path):
+    paths = {"1.0": tmp_path / "1.0.sqlite3", "1.1": tmp_path / "1.1.sqlite3"}
+    for path in paths.values():
+        sqlite.write(path)
+    versions = catalogue.open_versions(paths)
+
+    assert [version.label for version in versions.values()] == ["1.0", "1.1"]
+    assert versions["1.1"].shared_with(versions["1.0"]) == len(stations.station_registry)
+    assert diff.diff(versions["1.0"], versions["1.1"]).empty
@@ -0,0 +1,44 @@
+import pytest
+
+from simrail_sdk import documents, stations, timetable
+
+
+@pytest.fixture
+def run(train_run):
+    def run(number: str) -> timetable.TrainRun:
+        return train_run(number, passing=[stations.TunelR13], profile=timetable.SpeedProfile.constant(60))
+
+    return run
+
+
+def test_render(run):
+    html = documents.render(run("14101"))
+    assert "<h1>14101</h1>" in html
+    assert "<th>Stacja</th>" in html
+    assert "Charsznica" in html
+    assert "Tunel R13" not in html  # skippable
+    assert '<td class="km">22.296</td>' in html
+
+
+def test_station_fragment_is_cached(run):
+    documents._station_fragment.cache_clear()
+    documents.render(run("1"))
+    documents.render(run("2"))
+    assert documents._station_fragment.cache_info().hits == 3
+
+
+def test_station_fragment_follows_short_name_replacements(run, monkeypatch):
+    assert "Charsznica</td>" in documents.render(run("1"))
+    monkeypatch.setitem(stations.DEFAULT_SHORT_NAME_REPLACEMENTS, "Charsznica", "Charsz.")
+    html = documents.render(run("1"))
+    assert "Charsz.</td>" in html
+    assert "Charsznica</td>" not in html
+
+
+def test_render_many(run):
+    runs = [run(str(number)) for number in range(4)]
+    assert documents.render_many(runs, max_workers=2) == [documents.render(run) for run in runs]
+
+
+def test_render_in_english(run):
+    assert "<th>Station</th>" in documents.render(run("1"), locale="en")
@@ -0,0 +1,30 @@
+import datetime
+
+import pytest
+
+from simrail_sdk import eta, stations
+
+
+@pytest.fixture
+def engine(train_run) -> eta.EtaEngine:
+    return eta.EtaEngine([train_run()], default_speed=60)
+
+
+def test_predict(engine, noon):
+    etas = engine.predict(eta.TrainState("1", 62, 4.793, 120, noon))
+    assert [prediction.station for prediction in etas] == [stations.Charsznica, stations.Wolbrom]
+    assert etas[0].eta == noon + datetime.timedelta(minutes=1.5)
+    remaining = float(stations.Wolbrom.mileage[62] - stations.Charsznica.mileage[62])
+    assert (etas[1].eta - etas[0].eta).total_seconds() == pytest.approx(60 + remaining * 60)
+
+
+def test_learns_segment_speeds(engine, noon):
+    engine.predict(eta.TrainState("1", 62, 1.0, 0, noon))
+    etas = engine.predict(eta.TrainState("1", 62, 3.0, 0, noon + datetime.timedelta(minutes=1)))
+    assert engine.segment_speeds[("Tunel", "Charsznica")].mean == pytest.approx(120)
+    expected = datetime.timedelta(minutes=1 + (float(stations.Charsznica.mileage[62]) - 3.0) / 2)
+    assert etas[0].eta - noon == pytest.approx(expected, abs=datetime.timedelta(seconds=1))
+
+
+def test_unknown_train(engine, noon):
+    assert engine.predict_all([eta.TrainState("2", 62, 1.0, 100, noon)]) == {"2": []}
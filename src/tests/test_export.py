@@ -0,0 +1,54 @@
+import gzip
+import json
+
+from simrail_sdk import export, stations
+
+
+def test_json_export():
+    exported = export.CatalogueExport(precision=2).json
+    document = json.loads(exported.body)
+    tunel = next(record for record in document["stations"] if record["name"] == "Tunel")
+    assert tunel == {
+        "id": "Tunel",
+        "name": "Tunel",
+        "lat": 50.43,
+        "lon": 19.99,
+        "mileage": {"8": 267.778, "62": 0.75},
+        "radio_channels": ["R4"],
+        "station_types": ["st"],
+    }
+    assert document["branch_off_points"]["Tunel"] == ["Tunel R13"]
+    assert document["lines"]["62"][:2] == ["Tunel", "Tunel R13"]
+    kozlow = {"issuer": "Kozłów", "first": 412000, "last": 412048, "destination": "Koluszki"}
+    assert kozlow in document["r307_issuers"]
+
+
+def test_geojson_export():
+    document = json.loads(export.CatalogueExport().geojson.body)
+    features = {feature["id"]: feature for feature in document["features"]}
+    assert features["Wolbrom"]["geometry"] == {"type": "Point", "coordinates": [19.77229, 50.375983]}
+    assert features["Wolbrom"]["properties"]["abbreviation"] == "Wb"
+    assert features["Tunel R13"]["geometry"] is None
+    assert len(document["features"]) == len(stations.station_registry)
+
+
+def test_stations_sharing_a_name():
+    document = json.loads(export.CatalogueExport().geojson.body)
+    ids = [feature["id"] for feature in document["features"]]
+    assert len(set(ids)) == len(ids)
+    assert {"Katowice Janów [171]", "Katowice Janów [657]"} <= set(ids)
+
+    document = json.loads(export.CatalogueExport().json.body)
+    ids = {record["id"] for record in document["stations"]}
+    assert len(ids) == len(document["stations"])
+    assert "Katowice Janów [171]" in document["lines"]["171"]
+    for record in document["stations"]:
+        assert record.get("belongs_to", record["id"]) in ids
+
+
+def test_gzip_and_etag():
+    first, second = export.CatalogueExport().json, export.CatalogueExport().json
+    assert gzip.decompress(first.gzipped) == first.body
+    assert first.gzipped == second.gzipped
+    assert first.etag == second.etag
+    assert first.etag != export.CatalogueExport(precision=2).json.etag
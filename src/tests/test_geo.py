@@ -0,0 +1,63 @@
+import math
+import types
+
+import pytest
+
+from simrail_sdk import geo, stations
+
+
+def test_haversine():
+    assert geo.haversine(50, 19, 50, 19) == 0
+    # One degree of latitude
+    assert geo.haversine(50, 19, 51, 19) == pytest.approx(111.2, abs=0.1)
+    assert geo.distance(stations.Wolbrom, stations.Katowice) == pytest.approx(55.27, abs=0.01)
+
+
+def test_distance_matrix(tmp_path):
+    with geo.DistanceMatrix.open(directory=tmp_path) as matrix:
+        assert len(matrix) == len(stations.station_registry)
+        assert matrix.distance(stations.Wolbrom, stations.Katowice) == pytest.approx(
+            geo.distance(stations.Wolbrom, stations.Katowice), rel=1e-6
+        )
+        row = matrix.row(stations.Katowice)
+        assert row[matrix.index(stations.Wolbrom)] == matrix.distance(stations.Katowice, stations.Wolbrom)
+        row.release()
+        nearest = matrix.nearest(stations.Wolbrom, 3)
+        assert [distance for distance, _ in nearest] == sorted(distance for distance, _ in nearest)
+        assert stations.Wolbrom not in [station for _, station in nearest]
+    (path,) = tmp_path.iterdir()
+    assert path.name == f"distances-{geo.content_hash(stations.station_registry.all())}.f32"
+
+
+def test_placeholder_coordinates_are_nan(tmp_path):
+    placeholder = next(station for station in stations.station_registry if not (station.lat or station.lon))
+    with geo.DistanceMatrix.open([placeholder, stations.Wolbrom], directory=tmp_path) as matrix:
+        assert math.isnan(matrix.distance(placeholder, stations.Wolbrom))
+        assert matrix.distance(stations.Wolbrom, stations.Wolbrom) == 0
+
+
+def test_reopened_matrix_is_not_recomputed(tmp_path, monkeypatch):
+    geo.DistanceMatrix.open(directory=tmp_path).close()
+    monkeypatch.setattr(geo, "write", lambda *args: pytest.fail("recomputed"))
+    with geo.DistanceMatrix.open(directory=tmp_path) as matrix:
+        assert matrix.distance(stations.Wolbrom, stations.Wolbrom) == 0
+
+
+def test_mismatched_file(tmp_path):
+    path = tmp_path / "matrix.f32"
+    geo.write(path, [stations.Wolbrom])
+    with pytest.raises(ValueError, match="not a distance matrix of 2 stations"):
+        geo.DistanceMatrix(path, [stations.Wolbrom, stations.Katowice])
+    path.write_bytes(path.read_bytes()[:-2])
+    with pytest.raises(ValueError, match="not a distance matrix of 1 stations"):
+        geo.DistanceMatrix(path, [stations.Wolbrom])
+
+
+def test_byteswapped_round_trip(tmp_path, monkeypatch):
+    # What a big-endian machine writes, it reads back
+    monkeypatch.setattr(geo, "sys", types.SimpleNamespace(byteorder="big"))
+    station_list = [stations.Wolbrom, stations.Katowice]
+    with geo.DistanceMatrix.open(station_list, tmp_path) as matrix:
+        assert matrix.distance(stations.Wolbrom, stations.Katowice) == pytest.approx(
+            geo.distance(stations.Wolbrom, stations.Katowice), rel=1e-6
+        )
@@ -0,0 +1,46 @@
+import datetime
+
+import pytest
+
+from simrail_sdk import enums, headway, stations, timetable
+
+
+@pytest.fixture
+def run(train_run):
+    def run(number: str, departure: datetime.datetime, reverse: bool = False) -> timetable.TrainRun:
+        return train_run(
+            number,
+            departure,
+            passing=[stations.GajowkaAPO],
+            passing_stop_type=enums.StopType.PH,
+            reverse=reverse,
+            profile=timetable.SpeedProfile.constant(60),
+        )
+
+    return run
+
+
+def test_no_conflicts_when_far_apart(run, noon):
+    checker = headway.HeadwayChecker()
+    checker.add_many([run("1", noon), run("2", noon + datetime.timedelta(hours=1)), run("3", noon, reverse=True)])
+    assert checker.conflicts() == []
+
+
+def test_headway_and_occupancy_conflicts(run, noon):
+    checker = headway.HeadwayChecker()
+    checker.add_many([run("1", noon), run("2", noon + datetime.timedelta(minutes=2))])
+    conflicts = checker.conflicts()
+    headways = {conflict.location for conflict in conflicts if conflict.kind == headway.ConflictKind.HEADWAY}
+    occupied = {str(conflict.location) for conflict in conflicts if conflict.kind == headway.ConflictKind.OCCUPANCY}
+    assert stations.Tunel in headways
+    assert occupied == {"62: Tunel - Charsznica", "62: Charsznica - Wolbrom"}
+    assert all(conflict.trains == ("1", "2") for conflict in conflicts)
+
+
+def test_incremental_update(run, noon):
+    checker = headway.HeadwayChecker()
+    checker.add_many([run("1", noon), run("2", noon + datetime.timedelta(hours=1))])
+    assert checker.update(run("2", noon + datetime.timedelta(minutes=1)))
+    assert checker.update(run("2", noon + datetime.timedelta(hours=2))) == []
+    assert checker.conflicts() == []
+    assert len(checker) == 2
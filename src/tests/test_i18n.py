@@ -0,0 +1,21 @@
+from simrail_sdk import enums, i18n
+
+
+def test_label():
+    assert i18n.label(enums.StationType.BLOCK_POST) == "Posterunek odstępowy"
+    assert i18n.label(enums.StopType.PH, "pl") == "Postój handlowy"
+    assert i18n.label(enums.RadioChannel.R4, "pl") == "Kanał radiowy R4"
+
+
+def test_fallback_to_message_ids():
+    assert i18n.label(enums.StationType.BLOCK_POST, "en") == "Block post"
+    assert i18n.gettext("Not in the catalog") == "Not in the catalog"
+
+
+def test_every_member_has_a_label():
+    members = [*enums.StationType, *enums.RadioChannel, *enums.StopType]
+    assert set(i18n.labels("pl")) == set(members)
+
+
+def test_lookup_table_built_once():
+    assert i18n.labels("pl") is i18n.labels("pl")
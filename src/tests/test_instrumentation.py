@@ -0,0 +1,54 @@
+import logging
+
+from simrail_sdk import instrumentation, stations
+
+
+def test_disabled_by_default():
+    assert "filter" not in vars(stations.station_registry)
+    assert "printable_name" not in vars(stations.Station)
+
+
+def test_enabled(tmp_path):
+    sink = instrumentation.MemorySink()
+    path = tmp_path / "simrail_sdk.prom"
+    with instrumentation.Instrumentation([sink, instrumentation.PrometheusFileSink(path)]) as instrumented:
+        stations.Wolbrom.printable_name
+        stations.Wolbrom.printable_name
+        stations.GrodziskMazowiecki.is_junction
+        stations.station_registry.filter(name="Wolbrom")
+        snapshot = instrumented.flush()
+    assert not instrumented.enabled
+    test_disabled_by_default()
+
+    assert sink.last is snapshot
+    assert snapshot.histograms[("Station.printable_name", "")].calls == 2
+    assert snapshot.histograms[("Station.branch_off_points", "")].calls == 1
+    assert snapshot.histograms[("station_registry.filter", "belongs_to")].calls == 1
+    assert snapshot.histograms[("station_registry.filter", "name")].calls == 1
+    assert snapshot.caches["printable_name"].hits >= 1
+
+    text = path.read_text()
+    assert 'simrail_sdk_call_duration_seconds_count{function="Station_printable_name",fields=""} 2' in text
+    assert (
+        'simrail_sdk_call_duration_seconds_bucket{function="station_registry_filter",fields="name",le="+Inf"} 1'
+        in text
+    )
+    assert 'simrail_sdk_cache_hits_total{cache="printable_name"}' in text
+
+
+def test_logging_sink(caplog):
+    with caplog.at_level(logging.INFO, logger="simrail_sdk.instrumentation"):
+        with instrumentation.Instrumentation([instrumentation.LoggingSink()]) as instrumented:
+            stations.Wolbrom.printable_name
+            instrumented.flush()
+    assert "Station.printable_name: 1 calls" in caplog.text
+    assert "printable_name cache:" in caplog.text
+
+
+def test_histogram_buckets():
+    histogram = instrumentation.Histogram((0.001, 0.01))
+    for seconds in (0.0005, 0.001, 0.005, 0.5):
+        histogram.observe(seconds)
+    snapshot = histogram.snapshot()
+    assert snapshot.counts == (2, 1, 1)
+    assert snapshot.cumulative() == [(0.001, 2), (0.01, 3), (float("inf"), 4)]
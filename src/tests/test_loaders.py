@@ -0,0 +1,100 @@
+import decimal
+
+import pytest
+
+from simrail_sdk import enums, loaders, stations
+
+CSV = """name,abbreviation,lat,lon,mileage,radio_channels,station_types,belongs_to,shp
+Nowa Wieś R1,,50.1,19.2,62:10.500,R1,podg,Nowa Wieś,
+Nowa Wieś,NW,50.1,19.25,62:11.000;8:3.200,R1;R2,,,false
+"""
+
+YAML = """
+name: Stara Wieś
+lat: 50.2
+lon: 19.3
+mileage: {62: 12.25}
+radio_channels: [R2]
+belongs_to: Wolbrom
+---
+name: Stara Wieś APO
+lat: 50.2
+lon: 19.31
+mileage: {62: 12.5}
+radio_channels: []
+station_types: [po]
+skippable: true
+"""
+
+
+@pytest.fixture
+def registry():
+    registry = stations.new_registry("test", check_type=False)
+    registry.register(stations.Wolbrom)
+    return registry
+
+
+def test_load_csv(tmp_path, registry):
+    path = tmp_path / "stations.csv"
+    path.write_text(CSV, encoding="utf-8")
+    loaded = loaders.load(loaders.CsvSource(path), registry)
+
+    branch_off_point, station = loaded
+    assert branch_off_point.belongs_to is station
+    assert station.mileage == {62: decimal.Decimal("11.000"), 8: decimal.Decimal("3.200")}
+    assert station.radio_channels == [enums.RadioChannel.R1, enums.RadioChannel.R2]
+    assert station.station_types == [enums.StationType.STATION]
+    assert station.shp is False
+    assert branch_off_point.shp is True
+    assert registry.filter(abbreviation="NW") == {station}
+    assert len(registry) == 3
+
+
+def test_stations_share_no_mutable_fields(tmp_path, registry):
+    path = tmp_path / "stations.csv"
+    path.write_text(CSV.replace("R1;R2", ""), encoding="utf-8")
+    branch_off_point, station = loaders.load(loaders.CsvSource(path), registry)
+
+    station.station_types.append(enums.StationType.HALT)
+    station.radio_channels.append(enums.RadioChannel.R3)
+    assert branch_off_point.station_types == [enums.StationType.JUNCTION]
+    assert branch_off_point.radio_channels == [enums.RadioChannel.R1]
+    assert station.model_fields_set is not branch_off_point.model_fields_set
+
+    _, reloaded = loaders.load(loaders.CsvSource(path), stations.new_registry("other", check_type=False))
+    assert reloaded.station_types == [enums.StationType.STATION]
+    assert reloaded.radio_channels == []
+
+
+def test_load_yaml(tmp_path, registry):
+    pytest.importorskip("yaml")
+    path = tmp_path / "stations.yaml"
+    path.write_text(YAML, encoding="utf-8")
+    station, halt = loaders.load(loaders.YamlSource(path), registry)
+
+    assert station.belongs_to is stations.Wolbrom
+    assert station.lat == decimal.Decimal("50.2")
+    assert halt.station_types == [enums.StationType.HALT]
+    assert halt.skippable is True
+
+
+def test_failed_load_leaves_registry_untouched(tmp_path, registry):
+    path = tmp_path / "stations.csv"
+    path.write_text(CSV.replace(",Nowa Wieś,", ",Nowhere,"), encoding="utf-8")
+    with pytest.raises(loaders.LoaderError, match="Nowhere"):
+        loaders.load(loaders.CsvSource(path), registry)
+    assert len(registry) == 1
+
+
+def test_invalid_row(tmp_path, registry):
+    path = tmp_path / "stations.csv"
+    path.write_text(CSV.replace("R1;R2", "R99"), encoding="utf-8")
+    with pytest.raises(loaders.LoaderError, match="Row 2"):
+        loaders.load(loaders.CsvSource(path), registry)
+
+
+def test_duplicate_name(tmp_path, registry):
+    path = tmp_path / "stations.csv"
+    path.write_text(CSV.replace("Nowa Wieś R1", "Wolbrom"), encoding="utf-8")
+    with pytest.raises(loaders.LoaderError, match="already exists"):
+        loaders.load(loaders.CsvSource(path), registry)
@@ -0,0 +1,29 @@
+from simrail_sdk import names, stations
+
+
+def test_fits_without_changes():
+    assert names.fit(stations.SosnowiecGlowny, 30) == "Sosnowiec Główny"
+
+
+def test_replacements_applied_progressively():
+    assert names.fit(stations.SosnowiecGlowny, 15) == "Sosn. Główny"
+    assert names.fit(stations.SosnowiecGlowny, 10) == "Sosn. Gł."
+    assert names.fit(stations.DabrowaGorniczaZabkowiceDZA, 20) == "Dąbr. G. Ząbk. DZA"
+
+
+def test_truncates_when_nothing_fits():
+    name = names.fit(stations.DabrowaGorniczaZabkowiceDZA, 8)
+    assert len(name) <= 8
+    assert name.endswith(".")
+
+
+def test_points():
+    measure = names.Points(font_size=10, default_width=0.5)
+    assert measure("abcd") == 20
+    assert names.fit(stations.SosnowiecGlowny, 55, measure) == "Sosn. Gł."
+    assert names.fit(stations.SosnowiecGlowny, 55, names.Points(font_size=10, default_width=0.5)) == "Sosn. Gł."
+    assert names.fit.cache_info().hits >= 1
+
+
+def test_printable_name_replacements():
+    assert stations.WarszawaZachodnia.printable_name == "Wwa Zachodnia"
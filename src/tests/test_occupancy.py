@@ -0,0 +1,43 @@
+from simrail_sdk import occupancy, stations
+
+
+def _tracker() -> occupancy.OccupancyTracker:
+    tracker = occupancy.OccupancyTracker()
+    tracker.update_many(
+        [
+            occupancy.TrainPosition("pl1", "A", 62, 10.0),
+            occupancy.TrainPosition("pl1", "B", 62, 15.0),
+            occupancy.TrainPosition("pl1", "C", 62, 20.0),
+            occupancy.TrainPosition("pl2", "D", 62, 20.0),
+        ]
+    )
+    return tracker
+
+
+def test_blocks_split_at_block_posts():
+    tracker = occupancy.OccupancyTracker()
+    block = tracker.block_table.block_at(62, 15.0)
+    assert (block.start, block.end) == (stations.GajowkaAPO, stations.Wolbrom)
+
+
+def test_conflicts():
+    tracker = _tracker()
+    conflicts = tracker.conflicts()
+    assert [(conflict.server, conflict.trains) for conflict in conflicts] == [("pl1", ("B", "C"))]
+    assert conflicts[0].block.start == stations.GajowkaAPO
+
+
+def test_incremental_update():
+    tracker = _tracker()
+    tracker.update(occupancy.TrainPosition("pl1", "B", 62, 13.0, rear_km=12.0))
+    assert [conflict.trains for conflict in tracker.conflicts("pl1")] == [("A", "B")]
+    tracker.remove("pl1", "A")
+    assert tracker.conflicts() == []
+    assert len(tracker) == 3
+
+
+def test_occupied_sections():
+    tracker = _tracker()
+    [(section, trains)] = tracker.occupied_sections("pl1").items()
+    assert (section.start, section.end) == (stations.Charsznica, stations.Wolbrom)
+    assert trains == {"A", "B", "C"}
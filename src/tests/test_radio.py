@@ -0,0 +1,44 @@
+from simrail_sdk import enums, radio, stations
+
+
+def test_channel_at():
+    channel_map = radio.RadioChannelMap()
+    assert channel_map.channel_at(62, stations.GajowkaAPO.mileage[62]) == enums.RadioChannel.R4
+    assert channel_map.channel_at(62, 80) == enums.RadioChannel.R5
+    assert channel_map.channel_at(62, 76) is None
+
+
+def test_channel_changes_along_route():
+    channel_map = radio.RadioChannelMap()
+    route = [
+        radio.RouteLeg.between(1, stations.Katowice, stations.Zawiercie),
+        radio.RouteLeg.between(4, stations.Zawiercie, stations.Knapowka),
+    ]
+    changes = channel_map.channel_changes(route)
+    assert [change.channel for change in changes] == [enums.RadioChannel.R2, enums.RadioChannel.R1]
+    assert changes[0].station == stations.Katowice
+    assert changes[1].line == 4
+
+
+def test_channel_changes_against_mileage():
+    channel_map = radio.RadioChannelMap()
+    route = [radio.RouteLeg.between(62, stations.SosnowiecGlowny, stations.Tunel)]
+    assert [(change.channel, change.station) for change in channel_map.channel_changes(route)] == [
+        (enums.RadioChannel.R2, stations.SosnowiecGlowny),
+        (enums.RadioChannel.R5, stations.SosnowiecPoludniowy),
+        (enums.RadioChannel.R4, stations.SosnowiecKazimierz),
+    ]
+    assert channel_map.channel_changes(route) is channel_map.channel_changes(route)
+
+
+def test_route_starting_inside_an_interval():
+    channel_map = radio.RadioChannelMap()
+    # R4 is used from Tunel (km 0.75), which is behind a train leaving Charsznica
+    route = [radio.RouteLeg.between(62, stations.Charsznica, stations.Wolbrom)]
+    assert channel_map.channel_changes(route) == (
+        radio.ChannelChange(62, float(stations.Charsznica.mileage[62]), enums.RadioChannel.R4, None),
+    )
+    route = [radio.RouteLeg.between(62, stations.Wolbrom, stations.Charsznica)]
+    assert channel_map.channel_changes(route) == (
+        radio.ChannelChange(62, float(stations.Wolbrom.mileage[62]), enums.RadioChannel.R4, None),
+    )
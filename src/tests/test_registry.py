@@ -0,0 +1,80 @@
+import decimal
+import threading
+
+from simrail_sdk import stations
+
+
+def _station(number):
+    return stations.Station.model_construct(
+        name=f"Station {number}",
+        abbreviation=f"S{number % 50}",
+        lat=decimal.Decimal("50"),
+        lon=decimal.Decimal("19"),
+        mileage={1: decimal.Decimal(number)},
+        radio_channels=[],
+        remotely_controlled_from=f"S{number % 7}" if number % 3 else None,
+    )
+
+
+def test_register_many():
+    registry = stations.new_registry("test", check_type=False)
+    registry.register_many([_station(number) for number in range(10)])
+    registry.register(_station(3))
+
+    assert len(registry) == 10
+    assert registry.filter(name="Station 3") == {_station(3)}
+    assert len(registry.filter(remotely_controlled_from=None)) == 4
+    assert registry.filter(abbreviation="S99") == set()
+
+
+def test_single_registrations_are_published_together():
+    registry = stations.new_registry("test", check_type=False)
+    before = registry.snapshot
+    for number in range(100):
+        registry.register(_station(number))
+    assert registry.snapshot is not before
+    published = registry.snapshot
+    assert registry.snapshot is published
+    assert len(published.members) == 100
+    assert registry.filter(abbreviation="S1") == {_station(1), _station(51)}
+
+
+def test_concurrent_registration():
+    registry = stations.new_registry("test", check_type=False)
+    station_list = [_station(number) for number in range(2000)]
+    done = threading.Event()
+    errors = []
+
+    def write():
+        for start in range(0, len(station_list), 10):
+            registry.register(station_list[start])
+            registry.register_many(station_list[start + 1 : start + 10])
+        done.set()
+
+    def read():
+        size = 0
+        try:
+            while not done.is_set():
+                snapshot = registry.snapshot
+                assert len(snapshot.members) >= size
+                size = len(snapshot.members)
+                assert sum(len(members) for members in snapshot.indexes["name"].values()) == size
+                assert sum(len(members) for members in snapshot.indexes["abbreviation"].values()) == size
+                for member in registry:
+                    assert registry.filter(name=member.name) == {member}
+                    break
+                registry.filter(abbreviation="S1")
+                registry.filter(mileage={1: decimal.Decimal(5)})
+        except Exception as error:  # noqa: BLE001 - reported by the main thread
+            errors.append(error)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    writer = threading.Thread(target=write)
+    for thread in [*readers, writer]:
+        thread.start()
+    for thread in [writer, *readers]:
+        thread.join()
+
+    assert errors == []
+    assert len(registry) == len(station_list)
+    assert len(registry.filter(abbreviation="S1")) == 40
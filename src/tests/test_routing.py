@@ -0,0 +1,100 @@
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+from simrail_sdk import chainage, routing, sections, stations, synthetic
+
+
+@pytest.fixture(scope="module")
+def network():
+    return routing.Network()
+
+
+def _check(network, route):
+    model = chainage.Chainage()
+    assert len(set(map(id, route.stations))) == len(route.stations)
+    legs = [(line, a, b) for line, a, b in zip(route.lines, route.stations, route.stations[1:])]
+    # Branch off points are merged into their stations, so legs are measured between the stations on the line
+    assert route.length == pytest.approx(
+        sum(
+            min(
+                model.distance(line, x, y)
+                for x in [a, *a.branch_off_points]
+                for y in [b, *b.branch_off_points]
+                if line in x.mileage and line in y.mileage
+            )
+            for line, a, b in legs
+        )
+    )
+
+
+def test_k_shortest_routes(network):
+    routes = network.k_shortest_routes(stations.WarszawaZachodnia, stations.KrakowGlowny, k=5)
+    assert len(routes) == 5
+    assert routes[0] == network.shortest_route(stations.WarszawaZachodnia, stations.KrakowGlowny)
+    assert all(a.length <= b.length + 1e-9 for a, b in zip(routes, routes[1:]))
+    assert len({(tuple(map(id, route.stations)), route.lines) for route in routes}) == 5
+    for route in routes:
+        assert route.stations[0] is stations.WarszawaZachodnia
+        assert route.stations[-1] is stations.KrakowGlowny
+        _check(network, route)
+
+
+def test_closed_sections(network):
+    shortest = network.shortest_route(stations.WarszawaZachodnia, stations.KrakowGlowny)
+    assert stations.Sprowa in shortest.stations
+
+    closed = [section for section in sections.LineSectionTable().sections[64] if section.start is stations.Kozlow]
+    assert len(closed) == 1
+    routes = network.k_shortest_routes(stations.WarszawaZachodnia, stations.KrakowGlowny, k=3, closed=closed)
+    assert len(routes) == 3
+    assert routes[0].length > shortest.length
+    for route in routes:
+        assert all(
+            not (line == 64 and {a.name, b.name} == {"Sprowa", "Kozłów"})
+            for line, a, b in zip(route.lines, route.stations, route.stations[1:])
+        )
+        _check(network, route)
+
+    # The shortest-path tree to the destination is computed once per set of closures
+    assert len(network._trees) == 2
+
+
+def test_unreachable(network):
+    # Warszawa Centralna is only reachable along line 2
+    closed = [(2, stations.WarszawaCentralna, stations.WarszawaZachodnia)]
+    assert network.k_shortest_routes(stations.WarszawaCentralna, stations.KrakowGlowny, closed=closed) == []
+    with pytest.raises(ValueError, match="not in the network"):
+        routing.Network([stations.KrakowGlowny]).shortest_route(stations.KrakowGlowny, stations.Sprowa)
+
+
+def test_synthetic_network():
+    generated = synthetic.generate(5_000, seed=2)
+    network = routing.Network(generated.station_list)
+    origin, destination = generated.lines[1][0], generated.lines[max(generated.lines)][-1]
+    routes = network.k_shortest_routes(origin, destination, k=3)
+    # Lines branch off earlier lines, so the network is a tree: there's a single loopless route
+    assert len(routes) == 1
+    assert routes[0].stations[0] is origin and routes[0].stations[-1] is destination
+
+
+def _in_process(code, hash_seed):
+    # A new interpreter with its own string hashing, and so its own iteration order of the registry
+    source = pathlib.Path(routing.__file__).parents[1]
+    env = {**os.environ, "PYTHONHASHSEED": str(hash_seed), "PYTHONPATH": str(source)}
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, env=env).stdout
+
+
+def test_same_network_in_every_process():
+    code = """
+from simrail_sdk import routing, stations
+network = routing.Network()
+print([(station.name, sorted(station.mileage)) for station in network.stations])
+print(network.adjacency)
+for route in network.k_shortest_routes(stations.KatowiceZawodzie, stations.KrakowGlowny, k=5):
+    print([station.name for station in route.stations], route.lines)
+"""
+    assert _in_process(code, 1) == _in_process(code, 2)
@@ -0,0 +1,25 @@
+from simrail_sdk import sections, stations
+
+
+def test_sections_between_boundaries():
+    table = sections.LineSectionTable()
+    section = table.section_at(62, 14)
+    assert section.start == stations.Charsznica
+    assert section.end == stations.Wolbrom
+    assert section.intermediate == [stations.Gajowka, stations.GajowkaAPO, stations.Jezowka]
+    assert section.block_posts == [stations.GajowkaAPO]
+
+
+def test_section_at_boundary():
+    table = sections.LineSectionTable()
+    assert table.section_at(62, stations.Wolbrom.mileage[62]).start == stations.Wolbrom
+    assert table.section_at(62, -1) is None
+    assert table.section_at(99999, 0) is None
+
+
+def test_sections_of():
+    table = sections.LineSectionTable()
+    assert [section.end for section in table.sections_of(stations.Wolbrom)] == [
+        stations.Wolbrom,
+        stations.JaroszowiecOlkuski,
+    ]
@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+
+from simrail_sdk import sqlite, stations
+
+
+@pytest.fixture(scope="module")
+def connection(tmp_path_factory):
+    path = tmp_path_factory.mktemp("sqlite") / "catalogue.sqlite3"
+    sqlite.write(path)
+    connection = sqlite3.connect(path)
+    yield connection
+    connection.close()
+
+
+def test_round_trip(connection):
+    station_list, r307_issuers = sqlite.load(connection)
+    loaded = {(station.name, tuple(station.mileage)): station for station in station_list}
+    assert len(loaded) == len(stations.station_registry)
+    for station in stations.station_registry:
+        assert loaded[(station.name, tuple(sorted(station.mileage)))].model_dump() == station.model_dump()
+    assert sum(len(issued) for issued in r307_issuers.values()) == sum(
+        len(issued) for issued in stations.R307_ISSUERS.values()
+    )
+
+
+def test_loaded_stations_are_not_registered(connection):
+    size = len(stations.station_registry)
+    sqlite.load(connection)
+    assert len(stations.station_registry) == size
+
+
+def test_search(connection):
+    assert sqlite.search(connection, "gajowka") == ["Gajówka", "Gajówka APO"]
+
+
+def test_search_punctuation(connection):
+    # Abbreviations and hyphens are part of the words, not FTS5 query syntax
+    assert "Dąbrowa Górnicza Pogoria" in sqlite.search(connection, "Dąbr. G. Pogoria")
+    assert "Dąbrowa Górnicza" in sqlite.search(connection, "Dąbrowa Górn.")
+    assert "Warszawa Gł.Tow. WOA" in sqlite.search(connection, "Warszawa Gł.")
+    assert sqlite.search(connection, "Katowice-Janów") == ["Katowice Janów", "Katowice Janów"]
+    assert sqlite.search(connection, 'Wwa "Zach.') == []
+    assert sqlite.search(connection, " ") == []
+
+
+def test_within(connection):
+    assert sqlite.within(connection, 50.36, 50.38, 19.6, 19.8) == ["Wolbrom", "Zarzecze", "Zarzecze APO"]
+
+
+def test_branch_off_points(connection):
+    [(name,)] = connection.execute(
+        "SELECT branch.name FROM branch_off_points "
+        "JOIN stations AS station ON station.id = station_id "
+        "JOIN stations AS branch ON branch.id = branch_off_point_id "
+        "WHERE station.name = 'Tunel'"
+    )
+    assert name == "Tunel R13"
@@ -5,6 +5,13 @@ def test_printable_name():
     assert stations.GrodziskMazowiecki.printable_name == "Grodz Maz"
 
 
+def test_customized_short_name_replacements(monkeypatch):
+    assert stations.WarszawaZachodnia.printable_name == "Wwa Zachodnia"
+    monkeypatch.setitem(stations.DEFAULT_SHORT_NAME_REPLACEMENTS, "Zachodnia", "Zach.")
+    assert stations.WarszawaZachodnia.printable_name == "Wwa Zach."
+    assert stations.short_name_cache_info().misses >= 2
+
+
 def test_branch_off_points():
     assert stations.GrodziskMazowiecki.branch_off_points == {
         stations.GrodziskMazowieckiR58,
@@ -27,3 +34,27 @@ def test_is_traffic_post():
     assert stations.GrodziskMazowiecki.is_traffic_post  # st
     assert stations.Knapowka.is_traffic_post  # podg
     assert not stations.SosnowiecPorabka.is_traffic_post  # po
+
+
+def test_remote_controller():
+    assert stations.GajowkaAPO.remote_controller == stations.Wolbrom
+    assert stations.Wolbrom.remote_controller is None
+
+
+def test_remotely_controlled_stations():
+    assert stations.Wolbrom.remotely_controlled_stations == {stations.GajowkaAPO, stations.ZarzeczeAPO}
+    assert stations.GajowkaAPO.remotely_controlled_stations == set()
+
+
+def test_station_keys():
+    janow = [station for station in stations.station_registry.all() if station.name == "Katowice Janów"]
+    keys = stations.station_keys([stations.Tunel, *janow])
+    assert keys[id(stations.Tunel)] == "Tunel"
+    assert sorted(keys[id(station)] for station in janow) == ["Katowice Janów [171]", "Katowice Janów [657]"]
+
+    # Same name and lines: the mileage tells the stations apart
+    moved = janow[0].model_copy(update={"mileage": {line: km + 1 for line, km in janow[0].mileage.items()}})
+    keys = stations.station_keys([janow[0], moved])
+    assert len(set(keys.values())) == 2
+    ((line, km),) = janow[0].mileage.items()
+    assert keys[id(janow[0])] == f"Katowice Janów [{line}:{km}]"
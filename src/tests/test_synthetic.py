@@ -0,0 +1,52 @@
+import collections
+
+import pytest
+
+from simrail_sdk import sections, stations, synthetic, validation
+
+
+@pytest.fixture(scope="module")
+def network():
+    return synthetic.generate(3000, seed=7)
+
+
+def test_size_and_seed(network):
+    assert len(network.station_list) in (3000, 3001)
+    again = synthetic.generate(3000, seed=7)
+    assert [station.name for station in again.station_list] == [station.name for station in network.station_list]
+    assert len(stations.station_registry) < 3000
+
+
+def test_passes_validation(network):
+    report = validation.validate(network.station_list, network.r307_issuers, max_workers=1)
+    assert report.ok
+    assert report.issues == []
+
+
+def test_mileage_is_monotonic(network):
+    for line, on_line in network.lines.items():
+        mileage = [station.mileage[line] for station in on_line]
+        assert mileage == sorted(mileage)
+        assert len(set(mileage)) == len(mileage)
+
+
+def test_registry_indexes(network):
+    registry = stations.new_registry("synthetic", check_type=False)
+    registry.register_many(network.station_list)
+    for field in ("name", "abbreviation", "remotely_controlled_from"):
+        expected = collections.defaultdict(set)
+        for station in network.station_list:
+            expected[getattr(station, field)].add(station.name)
+        for value, names in expected.items():
+            assert {station.name for station in registry.filter(**{field: value})} == names
+
+
+def test_line_sections(network):
+    table = sections.LineSectionTable(network.station_list)
+    assert len(table.sections) == len(network.lines)
+    for line, line_sections in table.sections.items():
+        for station in network.lines[line]:
+            km = station.mileage[line]
+            if line_sections[0].start_km <= km <= line_sections[-1].end_km:
+                section = table.section_at(line, km)
+                assert section.start_km <= km <= section.end_km
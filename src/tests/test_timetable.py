@@ -0,0 +1,32 @@
+import datetime
+
+import pytest
+
+from simrail_sdk import enums, stations, timetable
+
+
+@pytest.fixture
+def run(train_run):
+    return train_run("14101", passing=[stations.GajowkaAPO])
+
+
+def test_stop_km(run):
+    assert run.stops[2].km == stations.GajowkaAPO.mileage[62]
+
+
+def test_speed_profile():
+    profile = timetable.SpeedProfile([(0, 60), (10, 120)])
+    assert profile.hours_at([0, 6, 10, 22]) == pytest.approx([0, 0.1, 1 / 6, 1 / 6 + 0.1])
+    assert profile.hours_at_unsorted([22, 6]) == pytest.approx([1 / 6 + 0.1, 0.1])
+    with pytest.raises(ValueError):
+        timetable.SpeedProfile([(5, 60)])
+
+
+def test_retimed(run, noon):
+    run = run.retimed(timetable.SpeedProfile.constant(60))
+    distance = float(stations.Charsznica.mileage[62] - stations.Tunel.mileage[62])
+    charsznica = run.stops[1]
+    assert charsznica.arrival == noon + datetime.timedelta(minutes=distance)
+    assert charsznica.dwell_time == timetable.DEFAULT_DWELL_TIMES[enums.StopType.PH]
+    assert run.stops[2].dwell_time == datetime.timedelta()
+    assert run.stops[-1].departure is None
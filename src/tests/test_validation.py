@@ -0,0 +1,42 @@
+from simrail_sdk import stations, validation
+
+
+def _issues(rule: str) -> list[validation.Issue]:
+    return validation.validate(max_workers=1).by_rule()[rule]
+
+
+def test_duplicate_coordinates():
+    names = [set(issue.stations) for issue in _issues("duplicate-coordinates")]
+    assert {"Łazy", "Łazy Łc", "Łazy Ła"} in names
+
+
+def test_non_monotonic_mileage():
+    stations_involved = {name for issue in _issues("non-monotonic-mileage") for name in issue.stations}
+    assert {"Łazy", "Łazy Łc"} <= stations_involved
+
+
+def test_overlapping_r307_ranges():
+    pairs = [set(issue.stations) for issue in _issues("overlapping-r307-ranges")]
+    assert {"Jaworzno Szczakowa", "Kozłów"} in pairs
+
+
+def test_belongs_to_cycle():
+    snapshot = validation.Snapshot(
+        stations=(
+            validation.StationRecord("A", 1, 1, {}, None, "B"),
+            validation.StationRecord("B", 2, 2, {}, None, "A"),
+            validation.StationRecord("C", 3, 3, {}, None, "D"),
+        ),
+        r307_ranges=(),
+        abbreviations=frozenset(),
+    )
+    issues = list(validation.BelongsToIntegrity().check(snapshot))
+    assert len(issues) == 2
+    assert {"A", "B"} in [set(issue.stations) for issue in issues]
+
+
+def test_process_pool_matches_in_process():
+    in_process = validation.validate(max_workers=1)
+    pooled = validation.validate(max_workers=2)
+    assert pooled == in_process
+    assert pooled.station_count == len(stations.station_registry)